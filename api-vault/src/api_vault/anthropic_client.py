@@ -13,17 +13,23 @@ import hashlib
 import json
 import logging
 import os
+import threading
 import time
+from collections.abc import Generator
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import anthropic
 from anthropic import APIError, RateLimitError
 
 from api_vault.schemas import CacheEntry
 
+if TYPE_CHECKING:
+    from anthropic import Stream
+    from anthropic.types import RawMessageStreamEvent
+
 logger = logging.getLogger(__name__)
 
 
@@ -85,6 +91,22 @@ def compute_request_hash(
     return hashlib.sha256(canonical.encode()).hexdigest()
 
 
+def _with_additional_context(user_prompt: str, excerpts: str | None) -> str:
+    """
+    Append artifact excerpts to a user prompt the way they are hashed.
+
+    Args:
+        user_prompt: User prompt for the artifact
+        excerpts: Artifact-specific excerpts, if any
+
+    Returns:
+        User prompt with an "Additional Context" section appended
+    """
+    if not excerpts:
+        return user_prompt
+    return f"{user_prompt}\n\n## Additional Context\n\n{excerpts}"
+
+
 class CacheManager:
     """Manages caching of API responses."""
 
@@ -112,15 +134,13 @@ class CacheManager:
         Returns:
             CacheEntry or None
         """
-        path = self._cache_path(request_hash)
-        if not path.exists():
-            return None
-
         try:
-            with open(path) as f:
-                data = json.load(f)
-            return CacheEntry.model_validate(data)
-        except (json.JSONDecodeError, ValueError, OSError) as e:
+            # Parsed straight into the schema by pydantic-core, with no
+            # intermediate dict
+            return CacheEntry.model_validate_json(self._cache_path(request_hash).read_bytes())
+        except FileNotFoundError:
+            return None
+        except (ValueError, OSError) as e:
             logger.warning(f"Failed to load cache entry: {e}")
             return None
 
@@ -183,12 +203,13 @@ class AnthropicClient:
         self.model = model or self.DEFAULT_MODEL
         self.cache_manager = CacheManager(cache_dir) if cache_dir else None
 
-        # Usage tracking
+        # Usage tracking; guarded so the runner can generate concurrently
         self.total_input_tokens = 0
         self.total_output_tokens = 0
         self.total_cache_creation_tokens = 0
         self.total_cache_read_tokens = 0
         self.request_count = 0
+        self._usage_lock = threading.Lock()
 
     def _retry_with_backoff(
         self,
@@ -308,13 +329,14 @@ class AnthropicClient:
             # Update usage tracking
             input_tokens = response.usage.input_tokens
             output_tokens = response.usage.output_tokens
-            self.total_input_tokens += input_tokens
-            self.total_output_tokens += output_tokens
-            self.request_count += 1
+            with self._usage_lock:
+                self.total_input_tokens += input_tokens
+                self.total_output_tokens += output_tokens
+                self.request_count += 1
 
             # Cache the response
             if use_cache and self.cache_manager:
-                cache_entry = CacheEntry(
+                cache_entry = CacheEntry.model_construct(
                     request_hash=request_hash,
                     created_at=datetime.utcnow(),
                     model=self.model,
@@ -363,12 +385,16 @@ class AnthropicClient:
         max_tokens: int = 4096,
         temperature: float = 0.0,
         use_local_cache: bool = True,
+        cached_artifact_excerpts: str | None = None,
     ) -> GenerationResult:
         """
         Generate a completion using Anthropic's prompt caching for the context.
 
         The cached_context is marked with cache_control to be cached server-side.
         Subsequent requests with the same prefix get 90% discount on those tokens.
+        Artifact excerpts get a second cache breakpoint directly after it,
+        ahead of the per-artifact system prompt, so jobs that share the same
+        excerpts also share that cached prefix.
 
         Args:
             cached_context: Repository context to cache (file tree, signals, excerpts)
@@ -377,32 +403,21 @@ class AnthropicClient:
             max_tokens: Maximum output tokens
             temperature: Sampling temperature
             use_local_cache: Whether to use local file cache
+            cached_artifact_excerpts: Artifact-specific file excerpts to cache
 
         Returns:
             GenerationResult with response and metadata
         """
         start_time = time.time()
-
-        # Build the full system content with cache_control on the context
-        full_system = f"{cached_context}\n\n{system_prompt}"
-        request_hash = compute_request_hash(
-            self.model, full_system, user_prompt, max_tokens
+        request_hash, system_blocks = self._build_cached_context_request(
+            cached_context, system_prompt, user_prompt, max_tokens, cached_artifact_excerpts
         )
 
         # Check local file cache
-        if use_local_cache and self.cache_manager:
-            cached = self.cache_manager.get(request_hash)
-            if cached:
-                logger.info(f"Local cache hit for request {request_hash[:8]}")
-                return GenerationResult(
-                    text=cached.response_text,
-                    input_tokens=cached.input_tokens,
-                    output_tokens=cached.output_tokens,
-                    model=cached.model,
-                    cached=True,
-                    request_hash=request_hash,
-                    generation_time_seconds=0.0,
-                )
+        if use_local_cache:
+            local_result = self._get_local_result(request_hash)
+            if local_result:
+                return local_result
 
         # Make API request with cache_control on the context portion
         def make_request():
@@ -410,17 +425,7 @@ class AnthropicClient:
                 model=self.model,
                 max_tokens=max_tokens,
                 temperature=temperature,
-                system=[
-                    {
-                        "type": "text",
-                        "text": cached_context,
-                        "cache_control": {"type": "ephemeral"}
-                    },
-                    {
-                        "type": "text",
-                        "text": system_prompt,
-                    }
-                ],
+                system=system_blocks,
                 messages=[{"role": "user", "content": user_prompt}],
             )
 
@@ -435,54 +440,116 @@ class AnthropicClient:
                     if hasattr(block, "text"):
                         text += block.text
 
-            # Extract usage including cache stats
-            input_tokens = response.usage.input_tokens
-            output_tokens = response.usage.output_tokens
-            cache_creation = getattr(response.usage, "cache_creation_input_tokens", 0) or 0
-            cache_read = getattr(response.usage, "cache_read_input_tokens", 0) or 0
-
-            # Update usage tracking
-            self.total_input_tokens += input_tokens
-            self.total_output_tokens += output_tokens
-            self.total_cache_creation_tokens += cache_creation
-            self.total_cache_read_tokens += cache_read
-            self.request_count += 1
-
-            # Cache the response locally
-            if use_local_cache and self.cache_manager:
-                cache_entry = CacheEntry(
-                    request_hash=request_hash,
-                    created_at=datetime.utcnow(),
-                    model=self.model,
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    response_text=text,
-                    prompt_template_id="",
-                    context_hash="",
-                )
-                self.cache_manager.set(cache_entry)
-
-            cache_status = ""
-            if cache_read > 0:
-                cache_status = f", {cache_read} from Anthropic cache"
-            elif cache_creation > 0:
-                cache_status = f", {cache_creation} written to Anthropic cache"
-
-            logger.info(
-                f"Generated response: {input_tokens} in, {output_tokens} out, "
-                f"{generation_time:.2f}s{cache_status}"
+            return self._finish_cached_context_result(
+                request_hash,
+                text,
+                response.usage,
+                generation_time,
+                use_local_cache,
             )
 
+        except Exception as e:
+            generation_time = time.time() - start_time
+            logger.error(f"Generation failed: {e}")
             return GenerationResult(
-                text=text,
-                input_tokens=input_tokens,
-                output_tokens=output_tokens,
+                text="",
+                input_tokens=0,
+                output_tokens=0,
                 model=self.model,
                 cached=False,
                 request_hash=request_hash,
                 generation_time_seconds=generation_time,
-                cache_creation_input_tokens=cache_creation,
-                cache_read_input_tokens=cache_read,
+                error=str(e),
+            )
+
+    def stream_with_cached_context(
+        self,
+        cached_context: str,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int = 4096,
+        temperature: float = 0.0,
+        use_local_cache: bool = True,
+        cached_artifact_excerpts: str | None = None,
+    ) -> Generator[str, None, GenerationResult]:
+        """
+        Stream a completion using Anthropic's prompt caching for the context.
+
+        Takes the same arguments and sends the same request as
+        generate_with_cached_context, but yields the response text as it
+        arrives. The GenerationResult is the generator's return value; its
+        text is only filled in when the response is stored in the local
+        cache, which needs the whole text anyway.
+
+        Args:
+            cached_context: Repository context to cache (file tree, signals, excerpts)
+            system_prompt: Additional system instructions (not cached)
+            user_prompt: User prompt for this specific artifact
+            max_tokens: Maximum output tokens
+            temperature: Sampling temperature
+            use_local_cache: Whether to use local file cache
+            cached_artifact_excerpts: Artifact-specific file excerpts to cache
+
+        Yields:
+            Chunks of response text
+
+        Returns:
+            GenerationResult with metadata; error is set if the stream failed
+        """
+        start_time = time.time()
+        request_hash, system_blocks = self._build_cached_context_request(
+            cached_context, system_prompt, user_prompt, max_tokens, cached_artifact_excerpts
+        )
+
+        # Check local file cache
+        if use_local_cache:
+            local_result = self._get_local_result(request_hash)
+            if local_result:
+                yield local_result.text
+                return local_result
+
+        request: dict[str, Any] = {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "system": system_blocks,
+            "messages": [{"role": "user", "content": user_prompt}],
+        }
+
+        # Only the request is retried; once text has been yielded a retry
+        # would repeat it
+        def make_request() -> "Stream[RawMessageStreamEvent]":
+            events: Stream[RawMessageStreamEvent] = self.client.messages.create(
+                **request, stream=True
+            )
+            return events
+
+        keep_text = use_local_cache and self.cache_manager is not None
+        parts: list[str] = []
+        try:
+            events = self._retry_with_backoff(make_request)
+            usage = None
+            output_tokens = 0
+            for event in events:
+                if event.type == "message_start":
+                    usage = event.message.usage
+                elif event.type == "content_block_delta" and event.delta.type == "text_delta":
+                    if keep_text:
+                        parts.append(event.delta.text)
+                    yield event.delta.text
+                elif event.type == "message_delta":
+                    output_tokens = event.usage.output_tokens
+            generation_time = time.time() - start_time
+
+            if usage is None:
+                raise RuntimeError("Stream ended before a message started")
+            usage.output_tokens = output_tokens
+            return self._finish_cached_context_result(
+                request_hash,
+                "".join(parts),
+                usage,
+                generation_time,
+                use_local_cache,
             )
 
         except Exception as e:
@@ -499,6 +566,153 @@ class AnthropicClient:
                 error=str(e),
             )
 
+    def _build_cached_context_request(
+        self,
+        cached_context: str,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int,
+        cached_artifact_excerpts: str | None,
+    ) -> tuple[str, list[dict[str, Any]]]:
+        """
+        Build the request hash and system blocks for a cached-context request.
+
+        Args:
+            cached_context: Repository context to cache
+            system_prompt: Additional system instructions
+            user_prompt: User prompt for this specific artifact
+            max_tokens: Maximum output tokens
+            cached_artifact_excerpts: Artifact-specific file excerpts to cache
+
+        Returns:
+            Tuple of (request_hash, system_blocks)
+        """
+        # Build the full system content with cache_control on the context.
+        # The request hash covers excerpts as if appended to the user prompt.
+        full_system = f"{cached_context}\n\n{system_prompt}"
+        request_hash = compute_request_hash(
+            self.model,
+            full_system,
+            _with_additional_context(user_prompt, cached_artifact_excerpts),
+            max_tokens,
+        )
+
+        system_blocks: list[dict[str, Any]] = [
+            {
+                "type": "text",
+                "text": cached_context,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+        if cached_artifact_excerpts:
+            system_blocks.append(
+                {
+                    "type": "text",
+                    "text": f"## Additional Context\n\n{cached_artifact_excerpts}",
+                    "cache_control": {"type": "ephemeral"},
+                }
+            )
+        system_blocks.append({"type": "text", "text": system_prompt})
+        return request_hash, system_blocks
+
+    def _get_local_result(self, request_hash: str) -> GenerationResult | None:
+        """
+        Look up a response in the local file cache.
+
+        Args:
+            request_hash: Hash of the request
+
+        Returns:
+            Cached GenerationResult, or None if missing or caching is off
+        """
+        if not self.cache_manager:
+            return None
+        cached = self.cache_manager.get(request_hash)
+        if not cached:
+            return None
+        logger.info(f"Local cache hit for request {request_hash[:8]}")
+        return GenerationResult(
+            text=cached.response_text,
+            input_tokens=cached.input_tokens,
+            output_tokens=cached.output_tokens,
+            model=cached.model,
+            cached=True,
+            request_hash=request_hash,
+            generation_time_seconds=0.0,
+        )
+
+    def _finish_cached_context_result(
+        self,
+        request_hash: str,
+        text: str,
+        usage: Any,
+        generation_time: float,
+        use_local_cache: bool,
+    ) -> GenerationResult:
+        """
+        Record usage, store the response locally and build its result.
+
+        Args:
+            request_hash: Hash of the request
+            text: Response text
+            usage: Usage reported by the API
+            generation_time: Seconds spent generating
+            use_local_cache: Whether to store the response in the local cache
+
+        Returns:
+            GenerationResult with response and metadata
+        """
+        # Extract usage including cache stats
+        input_tokens = usage.input_tokens
+        output_tokens = usage.output_tokens
+        cache_creation = getattr(usage, "cache_creation_input_tokens", 0) or 0
+        cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+
+        # Update usage tracking
+        with self._usage_lock:
+            self.total_input_tokens += input_tokens
+            self.total_output_tokens += output_tokens
+            self.total_cache_creation_tokens += cache_creation
+            self.total_cache_read_tokens += cache_read
+            self.request_count += 1
+
+        # Cache the response locally
+        if use_local_cache and self.cache_manager:
+            cache_entry = CacheEntry.model_construct(
+                request_hash=request_hash,
+                created_at=datetime.utcnow(),
+                model=self.model,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                response_text=text,
+                prompt_template_id="",
+                context_hash="",
+            )
+            self.cache_manager.set(cache_entry)
+
+        cache_status = ""
+        if cache_read > 0:
+            cache_status = f", {cache_read} from Anthropic cache"
+        elif cache_creation > 0:
+            cache_status = f", {cache_creation} written to Anthropic cache"
+
+        logger.info(
+            f"Generated response: {input_tokens} in, {output_tokens} out, "
+            f"{generation_time:.2f}s{cache_status}"
+        )
+
+        return GenerationResult(
+            text=text,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            model=self.model,
+            cached=False,
+            request_hash=request_hash,
+            generation_time_seconds=generation_time,
+            cache_creation_input_tokens=cache_creation,
+            cache_read_input_tokens=cache_read,
+        )
+
     def get_usage_summary(self) -> dict[str, Any]:
         """
         Get summary of API usage.
@@ -534,6 +748,9 @@ class MockAnthropicClient:
     Mock client for testing without API calls.
     """
 
+    # Size of the text chunks yielded by stream_with_cached_context
+    STREAM_CHUNK_CHARS = 16
+
     def __init__(
         self,
         responses: dict[str, str] | None = None,
@@ -557,6 +774,8 @@ class MockAnthropicClient:
         self.request_count = 0
         self.requests: list[dict[str, Any]] = []
         self._cached_context: str | None = None  # Track cached context for simulation
+        self._cached_excerpts: set[tuple[str, str]] = set()
+        self._usage_lock = threading.Lock()
 
     def generate(
         self,
@@ -589,9 +808,10 @@ class MockAnthropicClient:
         input_tokens = len(system_prompt + user_prompt) // 4
         output_tokens = len(text) // 4
 
-        self.total_input_tokens += input_tokens
-        self.total_output_tokens += output_tokens
-        self.request_count += 1
+        with self._usage_lock:
+            self.total_input_tokens += input_tokens
+            self.total_output_tokens += output_tokens
+            self.request_count += 1
 
         return GenerationResult(
             text=text,
@@ -611,11 +831,15 @@ class MockAnthropicClient:
         max_tokens: int = 4096,
         temperature: float = 0.0,
         use_local_cache: bool = True,
+        cached_artifact_excerpts: str | None = None,
     ) -> GenerationResult:
         """Generate mock response with simulated Anthropic prompt caching."""
         full_system = f"{cached_context}\n\n{system_prompt}"
         request_hash = compute_request_hash(
-            self.model, full_system, user_prompt, max_tokens
+            self.model,
+            full_system,
+            _with_additional_context(user_prompt, cached_artifact_excerpts),
+            max_tokens,
         )
 
         # Store request for verification
@@ -623,6 +847,7 @@ class MockAnthropicClient:
             "cached_context": cached_context[:100] + "...",  # Truncate for readability
             "system": system_prompt,
             "user": user_prompt,
+            "artifact_excerpts": cached_artifact_excerpts,
             "max_tokens": max_tokens,
             "hash": request_hash,
             "uses_prompt_caching": True,
@@ -638,26 +863,38 @@ class MockAnthropicClient:
         context_tokens = len(cached_context) // 4
         system_tokens = len(system_prompt) // 4
         user_tokens = len(user_prompt) // 4
+        excerpt_tokens = len(cached_artifact_excerpts or "") // 4
         output_tokens = len(text) // 4
 
-        # Simulate Anthropic cache behavior
-        cache_creation = 0
-        cache_read = 0
-        if self._cached_context == cached_context:
-            # Cache hit - context tokens are read from cache (90% discount)
-            cache_read = context_tokens
-        else:
-            # Cache miss - context is written to cache
-            cache_creation = context_tokens
-            self._cached_context = cached_context
-
-        input_tokens = context_tokens + system_tokens + user_tokens
-
-        self.total_input_tokens += input_tokens
-        self.total_output_tokens += output_tokens
-        self.total_cache_creation_tokens += cache_creation
-        self.total_cache_read_tokens += cache_read
-        self.request_count += 1
+        input_tokens = context_tokens + excerpt_tokens + system_tokens + user_tokens
+
+        with self._usage_lock:
+            # Simulate Anthropic cache behavior
+            cache_creation = 0
+            cache_read = 0
+            if self._cached_context == cached_context:
+                # Cache hit - context tokens are read from cache (90% discount)
+                cache_read = context_tokens
+            else:
+                # Cache miss - context is written to cache
+                cache_creation = context_tokens
+                self._cached_context = cached_context
+                self._cached_excerpts.clear()
+
+            # Excerpts sit behind the context, so they only hit with it
+            if cached_artifact_excerpts:
+                excerpt_key = (cached_context, cached_artifact_excerpts)
+                if excerpt_key in self._cached_excerpts:
+                    cache_read += excerpt_tokens
+                else:
+                    cache_creation += excerpt_tokens
+                    self._cached_excerpts.add(excerpt_key)
+
+            self.total_input_tokens += input_tokens
+            self.total_output_tokens += output_tokens
+            self.total_cache_creation_tokens += cache_creation
+            self.total_cache_read_tokens += cache_read
+            self.request_count += 1
 
         return GenerationResult(
             text=text,
@@ -671,6 +908,30 @@ class MockAnthropicClient:
             cache_read_input_tokens=cache_read,
         )
 
+    def stream_with_cached_context(
+        self,
+        cached_context: str,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int = 4096,
+        temperature: float = 0.0,
+        use_local_cache: bool = True,
+        cached_artifact_excerpts: str | None = None,
+    ) -> Generator[str, None, GenerationResult]:
+        """Stream a mock response in chunks, returning its result."""
+        result = self.generate_with_cached_context(
+            cached_context,
+            system_prompt,
+            user_prompt,
+            max_tokens,
+            temperature,
+            use_local_cache,
+            cached_artifact_excerpts,
+        )
+        for start in range(0, len(result.text), self.STREAM_CHUNK_CHARS):
+            yield result.text[start:start + self.STREAM_CHUNK_CHARS]
+        return result
+
     def get_usage_summary(self) -> dict[str, Any]:
         """Get usage summary."""
         effective_input = (
@@ -45,7 +45,7 @@ from api_vault.config import (
 )
 from api_vault.errors import ConfigError, ApiVaultError
 from api_vault.planner import create_plan, load_plan
-from api_vault.repo_scanner import scan_repository
+from api_vault.repo_scanner import scan_repository, write_index
 from api_vault.runner import Runner, load_report
 from api_vault.schemas import ArtifactFamily, RepoIndex, RepoSignals, ScanConfig
 from api_vault.signal_extractor import extract_signals
@@ -189,8 +189,7 @@ def scan(
 
     # Save results
     index_path = out / "repo_index.json"
-    with open(index_path, "w") as f:
-        f.write(index.model_dump_json(indent=2))
+    write_index(index, index_path)
 
     signals_path = out / "signals.json"
     with open(signals_path, "w") as f:
@@ -266,8 +265,7 @@ def plan(
             progress.update(task, description="[bold green]Extracting signals...[/bold green]")
             signals = extract_signals(index, repo)
 
-        with open(index_path, "w") as f:
-            f.write(index.model_dump_json(indent=2))
+        write_index(index, index_path)
         with open(signals_path, "w") as f:
             f.write(signals.model_dump_json(indent=2))
     else:
@@ -510,6 +508,7 @@ def run(
         repo_path=repo,
         index=index,
         signals=signals,
+        max_concurrency=cfg.run.max_concurrency,
     )
 
     with Progress(
@@ -704,8 +703,7 @@ def init(
         progress.update(task, description="Extracting signals...")
         signals = extract_signals(index, repo)
 
-    with open(out / "repo_index.json", "w") as f:
-        f.write(index.model_dump_json(indent=2))
+    write_index(index, out / "repo_index.json")
     with open(out / "signals.json", "w") as f:
         f.write(signals.model_dump_json(indent=2))
 
@@ -774,6 +772,7 @@ def init(
         repo_path=repo,
         index=index,
         signals=signals,
+        max_concurrency=get_config().run.max_concurrency,
     )
 
     with Progress(SpinnerColumn(), TextColumn("{task.description}"), console=console) as progress:
@@ -62,6 +62,7 @@ class RunSettings(BaseModel):
     max_retries: int = Field(default=3, ge=0, le=10)
     retry_delay_seconds: float = Field(default=1.0, ge=0.1, le=60.0)
     timeout_seconds: int = Field(default=300, ge=30, le=3600)
+    max_concurrency: int = Field(default=4, ge=1, le=32)
 
 
 class SecretSettings(BaseModel):
@@ -249,6 +250,7 @@ cache_enabled = true
 max_retries = 3
 retry_delay_seconds = 1.0
 timeout_seconds = 300
+max_concurrency = 4                # Artifacts generated in parallel
 
 [secrets]
 min_confidence = 0.5
@@ -5,12 +5,42 @@ Selects relevant portions of repository files and packages them
 for inclusion in prompts, respecting byte limits and redacting secrets.
 """
 
+import fnmatch
+import re
+from collections.abc import Mapping
 from pathlib import Path
+from typing import Any
 
 from api_vault.repo_scanner import get_file_content
 from api_vault.schemas import ContextRef, FileEntry, RepoIndex, ScanConfig
 from api_vault.secret_guard import get_safe_content, is_sensitive_file
 
+# Rough approximation used for all token estimates
+CHARS_PER_TOKEN = 4
+
+# Separator used when joining context sections
+_SECTION_SEPARATOR = "\n\n"
+
+# Files read into the base context when present (shared across all artifacts)
+BASE_CONTEXT_KEY_FILES = (
+    "README.md",
+    "readme.md",
+    "package.json",
+    "pyproject.toml",
+    "Cargo.toml",
+    "go.mod",
+    "Makefile",
+    "Dockerfile",
+    "docker-compose.yml",
+    "docker-compose.yaml",
+    ".github/workflows/ci.yml",
+    ".github/workflows/ci.yaml",
+)
+
+# Redacted file excerpts keyed by (file_path, start_line, end_line, max_bytes);
+# "" records a file with no usable content
+ExcerptCache = dict[tuple[str, int | None, int | None, int], str]
+
 
 def estimate_tokens(text: str) -> int:
     """
@@ -24,14 +54,190 @@ def estimate_tokens(text: str) -> int:
     Returns:
         Estimated token count
     """
-    return len(text) // 4
+    return len(text) // CHARS_PER_TOKEN
+
+
+def estimate_joined_tokens(parts: list[str], separator: str = _SECTION_SEPARATOR) -> int:
+    """
+    Estimate token count for ``separator.join(parts)`` from the part lengths.
+
+    Lets context builders report an estimate from the fragments they already
+    hold instead of re-measuring the joined context.
+
+    Args:
+        parts: Fragments that will be joined
+        separator: Separator placed between fragments
+
+    Returns:
+        Estimated token count
+    """
+    if not parts:
+        return 0
+    total_chars = sum(map(len, parts)) + len(separator) * (len(parts) - 1)
+    return total_chars // CHARS_PER_TOKEN
+
+
+# Key files that are always relevant
+_KEY_FILES: tuple[tuple[str, str], ...] = (
+    ("README.md", "Primary documentation"),
+    ("readme.md", "Primary documentation"),
+    ("package.json", "Project configuration and dependencies"),
+    ("pyproject.toml", "Project configuration and dependencies"),
+    ("Cargo.toml", "Project configuration and dependencies"),
+    ("go.mod", "Project configuration and dependencies"),
+    ("Makefile", "Build and run commands"),
+    ("Dockerfile", "Container configuration"),
+    ("docker-compose.yml", "Service orchestration"),
+)
+
+# Map artifact families to relevant file patterns
+_RAW_FAMILY_PATTERNS: dict[str, list[tuple[str, str]]] = {
+    "docs": [
+        ("*.md", "Documentation files"),
+        ("docs/*", "Documentation folder"),
+        ("README*", "Readme files"),
+        ("src/index.*", "Main entrypoint"),
+        ("src/main.*", "Main entrypoint"),
+        ("main.*", "Main entrypoint"),
+        ("app.*", "Application entrypoint"),
+    ],
+    "security": [
+        ("SECURITY.md", "Security policy"),
+        ("auth/*", "Authentication code"),
+        ("**/auth*", "Authentication code"),
+        ("**/middleware*", "Middleware code"),
+        (".env.example", "Environment configuration"),
+        ("config/*", "Configuration files"),
+    ],
+    "tests": [
+        ("tests/*", "Test files"),
+        ("test/*", "Test files"),
+        ("__tests__/*", "Test files"),
+        ("*_test.*", "Test files"),
+        ("test_*", "Test files"),
+        ("*.spec.*", "Test files"),
+        ("conftest.py", "Test configuration"),
+        ("jest.config.*", "Test configuration"),
+        ("pytest.ini", "Test configuration"),
+    ],
+    "api": [
+        ("openapi.*", "API specification"),
+        ("swagger.*", "API specification"),
+        ("routes/*", "API routes"),
+        ("**/routes*", "API routes"),
+        ("**/api/*", "API code"),
+        ("**/controllers/*", "API controllers"),
+        ("**/handlers/*", "API handlers"),
+    ],
+    "observability": [
+        ("**/logging*", "Logging configuration"),
+        ("**/logger*", "Logger implementation"),
+        ("**/metrics*", "Metrics code"),
+        ("**/telemetry*", "Telemetry code"),
+        ("prometheus*", "Prometheus config"),
+    ],
+    "product": [
+        ("src/components/*", "UI components"),
+        ("src/pages/*", "Page components"),
+        ("app/*", "Application code"),
+        ("public/*", "Public assets"),
+        ("styles/*", "Styling"),
+    ],
+}
+
+# Artifact-specific context needs
+_RAW_ARTIFACT_CONTEXT: dict[str, list[tuple[str, str]]] = {
+    "RUNBOOK.md": [
+        ("Makefile", "Build commands"),
+        ("package.json", "NPM scripts"),
+        ("README.md", "Existing documentation"),
+        (".github/workflows/*", "CI workflows"),
+    ],
+    "TROUBLESHOOTING.md": [
+        ("*.log", "Log files"),
+        (".github/workflows/*", "CI configuration"),
+        ("Dockerfile", "Container setup"),
+        ("docker-compose.yml", "Service setup"),
+    ],
+    "ARCHITECTURE_OVERVIEW.md": [
+        ("src/**/__init__.py", "Package structure"),
+        ("src/**/index.*", "Module entrypoints"),
+        ("README.md", "Project description"),
+    ],
+    "THREAT_MODEL.md": [
+        ("**/auth*", "Authentication"),
+        ("**/middleware*", "Middleware"),
+        ("**/api/*", "API endpoints"),
+        ("**/database*", "Database access"),
+    ],
+    "SECURITY_CHECKLIST.md": [
+        (".env.example", "Environment vars"),
+        ("**/auth*", "Auth code"),
+        ("SECURITY.md", "Existing policy"),
+    ],
+    "AUTHZ_AUTHN_NOTES.md": [
+        ("**/auth*", "Auth implementation"),
+        ("**/middleware*", "Auth middleware"),
+        ("**/user*", "User handling"),
+        ("**/session*", "Session handling"),
+    ],
+    "GOLDEN_PATH_TEST_PLAN.md": [
+        ("tests/*", "Existing tests"),
+        ("src/**/*.py", "Source code"),
+        ("README.md", "Usage examples"),
+    ],
+    "MINIMUM_TESTS_SUGGESTION.md": [
+        ("tests/*", "Existing tests"),
+        ("src/**/*", "Source code"),
+    ],
+    "ENDPOINT_INVENTORY.md": [
+        ("**/routes*", "Route definitions"),
+        ("**/api/*", "API code"),
+        ("**/controllers*", "Controllers"),
+        ("openapi.*", "Existing spec"),
+    ],
+    "LOGGING_CONVENTIONS.md": [
+        ("**/log*", "Logging code"),
+        ("**/utils*", "Utility code"),
+        ("**/config*", "Configuration"),
+    ],
+    "METRICS_PLAN.md": [
+        ("**/metrics*", "Existing metrics"),
+        ("**/telemetry*", "Telemetry"),
+        ("**/health*", "Health checks"),
+    ],
+    "UX_COPY_BANK.md": [
+        ("src/components/*", "UI components"),
+        ("**/pages/*", "Pages"),
+        ("public/locales/*", "Translations"),
+    ],
+}
+
+
+def _compile_glob(pattern: str) -> re.Pattern[str]:
+    """Compile a glob pattern into a case-insensitive regex."""
+    return re.compile(fnmatch.translate(pattern), re.IGNORECASE)
+
+
+def _compile_pattern_table(
+    table: dict[str, list[tuple[str, str]]],
+) -> dict[str, tuple[tuple[re.Pattern[str], str], ...]]:
+    """Compile every glob in a pattern table once at import time."""
+    return {
+        key: tuple((_compile_glob(pattern), reason) for pattern, reason in items)
+        for key, items in table.items()
+    }
+
+
+_FAMILY_PATTERNS = _compile_pattern_table(_RAW_FAMILY_PATTERNS)
+_ARTIFACT_CONTEXT = _compile_pattern_table(_RAW_ARTIFACT_CONTEXT)
 
 
 def select_context_refs_for_artifact(
     artifact_name: str,
     artifact_family: str,
     index: RepoIndex,
-    signals_data: dict,
+    signals_data: Mapping[str, Any],
     max_refs: int = 10,
 ) -> list[ContextRef]:
     """
@@ -48,148 +254,14 @@ def select_context_refs_for_artifact(
         List of ContextRef objects
     """
     refs: list[ContextRef] = []
-
-    # Get key files that are always relevant
-    key_files = [
-        ("README.md", "Primary documentation"),
-        ("readme.md", "Primary documentation"),
-        ("package.json", "Project configuration and dependencies"),
-        ("pyproject.toml", "Project configuration and dependencies"),
-        ("Cargo.toml", "Project configuration and dependencies"),
-        ("go.mod", "Project configuration and dependencies"),
-        ("Makefile", "Build and run commands"),
-        ("Dockerfile", "Container configuration"),
-        ("docker-compose.yml", "Service orchestration"),
-    ]
-
-    # Map artifact families to relevant file patterns
-    family_patterns: dict[str, list[tuple[str, str]]] = {
-        "docs": [
-            ("*.md", "Documentation files"),
-            ("docs/*", "Documentation folder"),
-            ("README*", "Readme files"),
-            ("src/index.*", "Main entrypoint"),
-            ("src/main.*", "Main entrypoint"),
-            ("main.*", "Main entrypoint"),
-            ("app.*", "Application entrypoint"),
-        ],
-        "security": [
-            ("SECURITY.md", "Security policy"),
-            ("auth/*", "Authentication code"),
-            ("**/auth*", "Authentication code"),
-            ("**/middleware*", "Middleware code"),
-            (".env.example", "Environment configuration"),
-            ("config/*", "Configuration files"),
-        ],
-        "tests": [
-            ("tests/*", "Test files"),
-            ("test/*", "Test files"),
-            ("__tests__/*", "Test files"),
-            ("*_test.*", "Test files"),
-            ("test_*", "Test files"),
-            ("*.spec.*", "Test files"),
-            ("conftest.py", "Test configuration"),
-            ("jest.config.*", "Test configuration"),
-            ("pytest.ini", "Test configuration"),
-        ],
-        "api": [
-            ("openapi.*", "API specification"),
-            ("swagger.*", "API specification"),
-            ("routes/*", "API routes"),
-            ("**/routes*", "API routes"),
-            ("**/api/*", "API code"),
-            ("**/controllers/*", "API controllers"),
-            ("**/handlers/*", "API handlers"),
-        ],
-        "observability": [
-            ("**/logging*", "Logging configuration"),
-            ("**/logger*", "Logger implementation"),
-            ("**/metrics*", "Metrics code"),
-            ("**/telemetry*", "Telemetry code"),
-            ("prometheus*", "Prometheus config"),
-        ],
-        "product": [
-            ("src/components/*", "UI components"),
-            ("src/pages/*", "Page components"),
-            ("app/*", "Application code"),
-            ("public/*", "Public assets"),
-            ("styles/*", "Styling"),
-        ],
-    }
-
-    # Artifact-specific context needs
-    artifact_context: dict[str, list[tuple[str, str]]] = {
-        "RUNBOOK.md": [
-            ("Makefile", "Build commands"),
-            ("package.json", "NPM scripts"),
-            ("README.md", "Existing documentation"),
-            (".github/workflows/*", "CI workflows"),
-        ],
-        "TROUBLESHOOTING.md": [
-            ("*.log", "Log files"),
-            (".github/workflows/*", "CI configuration"),
-            ("Dockerfile", "Container setup"),
-            ("docker-compose.yml", "Service setup"),
-        ],
-        "ARCHITECTURE_OVERVIEW.md": [
-            ("src/**/__init__.py", "Package structure"),
-            ("src/**/index.*", "Module entrypoints"),
-            ("README.md", "Project description"),
-        ],
-        "THREAT_MODEL.md": [
-            ("**/auth*", "Authentication"),
-            ("**/middleware*", "Middleware"),
-            ("**/api/*", "API endpoints"),
-            ("**/database*", "Database access"),
-        ],
-        "SECURITY_CHECKLIST.md": [
-            (".env.example", "Environment vars"),
-            ("**/auth*", "Auth code"),
-            ("SECURITY.md", "Existing policy"),
-        ],
-        "AUTHZ_AUTHN_NOTES.md": [
-            ("**/auth*", "Auth implementation"),
-            ("**/middleware*", "Auth middleware"),
-            ("**/user*", "User handling"),
-            ("**/session*", "Session handling"),
-        ],
-        "GOLDEN_PATH_TEST_PLAN.md": [
-            ("tests/*", "Existing tests"),
-            ("src/**/*.py", "Source code"),
-            ("README.md", "Usage examples"),
-        ],
-        "MINIMUM_TESTS_SUGGESTION.md": [
-            ("tests/*", "Existing tests"),
-            ("src/**/*", "Source code"),
-        ],
-        "ENDPOINT_INVENTORY.md": [
-            ("**/routes*", "Route definitions"),
-            ("**/api/*", "API code"),
-            ("**/controllers*", "Controllers"),
-            ("openapi.*", "Existing spec"),
-        ],
-        "LOGGING_CONVENTIONS.md": [
-            ("**/log*", "Logging code"),
-            ("**/utils*", "Utility code"),
-            ("**/config*", "Configuration"),
-        ],
-        "METRICS_PLAN.md": [
-            ("**/metrics*", "Existing metrics"),
-            ("**/telemetry*", "Telemetry"),
-            ("**/health*", "Health checks"),
-        ],
-        "UX_COPY_BANK.md": [
-            ("src/components/*", "UI components"),
-            ("**/pages/*", "Pages"),
-            ("public/locales/*", "Translations"),
-        ],
-    }
+    seen: set[str] = set()
 
     file_paths = {f.path: f for f in index.files}
 
     # Add key files first
-    for filename, reason in key_files:
+    for filename, reason in _KEY_FILES:
         if filename in file_paths and not is_sensitive_file(filename):
+            seen.add(filename)
             refs.append(
                 ContextRef(
                     file_path=filename,
@@ -200,57 +272,56 @@ def select_context_refs_for_artifact(
             )
 
     # Add family-specific patterns
-    if artifact_family in family_patterns:
-        for pattern, reason in family_patterns[artifact_family]:
-            matches = _match_files(index.files, pattern)
-            for match in matches[:3]:  # Limit per pattern
-                if not is_sensitive_file(match.path) and match.path not in [r.file_path for r in refs]:
-                    refs.append(
-                        ContextRef(
-                            file_path=match.path,
-                            excerpt_type="head",
-                            max_bytes=4096,
-                            reason=reason,
-                        )
+    for pattern, reason in _FAMILY_PATTERNS.get(artifact_family, ()):
+        matches = _match_files(index.files, pattern)
+        for match in matches[:3]:  # Limit per pattern
+            if not is_sensitive_file(match.path) and match.path not in seen:
+                seen.add(match.path)
+                refs.append(
+                    ContextRef(
+                        file_path=match.path,
+                        excerpt_type="head",
+                        max_bytes=4096,
+                        reason=reason,
                     )
+                )
 
     # Add artifact-specific patterns
-    if artifact_name in artifact_context:
-        for pattern, reason in artifact_context[artifact_name]:
-            matches = _match_files(index.files, pattern)
-            for match in matches[:2]:  # Limit per pattern
-                if not is_sensitive_file(match.path) and match.path not in [r.file_path for r in refs]:
-                    refs.append(
-                        ContextRef(
-                            file_path=match.path,
-                            excerpt_type="head",
-                            max_bytes=4096,
-                            reason=reason,
-                        )
+    for pattern, reason in _ARTIFACT_CONTEXT.get(artifact_name, ()):
+        matches = _match_files(index.files, pattern)
+        for match in matches[:2]:  # Limit per pattern
+            if not is_sensitive_file(match.path) and match.path not in seen:
+                seen.add(match.path)
+                refs.append(
+                    ContextRef(
+                        file_path=match.path,
+                        excerpt_type="head",
+                        max_bytes=4096,
+                        reason=reason,
                     )
+                )
 
     # Limit total refs
     return refs[:max_refs]
 
 
-def _match_files(files: list[FileEntry], pattern: str) -> list[FileEntry]:
+def _match_files(files: list[FileEntry], pattern: re.Pattern[str]) -> list[FileEntry]:
     """
-    Match files against a glob-like pattern.
+    Match files against a compiled glob pattern.
 
     Args:
         files: List of file entries
-        pattern: Glob pattern
+        pattern: Glob pattern compiled with _compile_glob
 
     Returns:
         Matching files
     """
-    import fnmatch
-
+    match = pattern.match
     matches: list[FileEntry] = []
     for f in files:
         if f.is_binary:
             continue
-        if fnmatch.fnmatch(f.path, pattern) or fnmatch.fnmatch(f.path.lower(), pattern.lower()):
+        if match(f.path):
             matches.append(f)
 
     # Sort by size (smaller first) to get more files in context
@@ -263,6 +334,7 @@ def package_context(
     index: RepoIndex,
     context_refs: list[ContextRef],
     config: ScanConfig | None = None,
+    excerpt_cache: ExcerptCache | None = None,
 ) -> tuple[str, list[str], int]:
     """
     Package context from files into a single string.
@@ -272,6 +344,8 @@ def package_context(
         index: Repository index
         context_refs: List of context references
         config: Scan configuration
+        excerpt_cache: Optional cache of redacted excerpts, shared across
+            calls so each file range is read and scanned for secrets once
 
     Returns:
         Tuple of (packaged_context, files_used, total_bytes)
@@ -299,30 +373,41 @@ def package_context(
         if is_sensitive_file(ref.file_path):
             continue
 
-        # Get content
-        content = get_file_content(
-            repo_path,
-            file_entry,
-            max_bytes=min(ref.max_bytes, config.max_excerpt_bytes),
-            start_line=ref.start_line,
-            end_line=ref.end_line,
-        )
+        max_bytes = min(ref.max_bytes, config.max_excerpt_bytes)
+        cache_key = (ref.file_path, ref.start_line, ref.end_line, max_bytes)
+        cached = excerpt_cache.get(cache_key) if excerpt_cache is not None else None
+        if cached is not None:
+            safe_content = cached
+        else:
+            # Get content
+            content = get_file_content(
+                repo_path,
+                file_entry,
+                max_bytes=max_bytes,
+                start_line=ref.start_line,
+                end_line=ref.end_line,
+            )
 
-        if not content:
-            continue
+            # Redact secrets
+            safe_content = get_safe_content(content, ref.file_path)[0] if content else ""
+            if excerpt_cache is not None:
+                excerpt_cache[cache_key] = safe_content
 
-        # Redact secrets
-        safe_content, _ = get_safe_content(content, ref.file_path)
+        if not safe_content:
+            continue
 
         # Check if we'd exceed limit
-        content_bytes = len(safe_content.encode("utf-8"))
+        encoded = safe_content.encode("utf-8")
+        content_bytes = len(encoded)
         if total_bytes + content_bytes > config.max_total_context_bytes:
-            # Truncate to fit
+            # Truncate to fit, slicing bytes so the budget is honoured for
+            # non-ASCII content; a split trailing codepoint is dropped
             remaining = config.max_total_context_bytes - total_bytes
             if remaining < 500:  # Not worth including
                 continue
-            safe_content = safe_content[:remaining]
-            content_bytes = remaining
+            truncated = memoryview(encoded)[:remaining]
+            safe_content = str(truncated, "utf-8", errors="ignore")
+            content_bytes = len(truncated)
 
         # Format the excerpt
         header = f"### File: {ref.file_path}"
@@ -389,7 +474,7 @@ def create_file_tree_context(index: RepoIndex, max_files: int = 100) -> str:
     return "\n".join(lines)
 
 
-def create_signals_context(signals_data: dict) -> str:
+def create_signals_context(signals_data: Mapping[str, Any]) -> str:
     """
     Create a context string from extracted signals.
 
@@ -469,7 +554,7 @@ def create_signals_context(signals_data: dict) -> str:
 def build_full_context(
     repo_path: Path,
     index: RepoIndex,
-    signals_data: dict,
+    signals_data: Mapping[str, Any],
     context_refs: list[ContextRef],
     config: ScanConfig | None = None,
 ) -> tuple[str, list[str], int]:
@@ -506,8 +591,8 @@ def build_full_context(
         parts.append("\n## Relevant Files\n")
         parts.append(excerpts)
 
-    full_context = "\n\n".join(parts)
-    estimated_tokens = estimate_tokens(full_context)
+    full_context = _SECTION_SEPARATOR.join(parts)
+    estimated_tokens = estimate_joined_tokens(parts)
 
     return full_context, files_used, estimated_tokens
 
@@ -515,7 +600,7 @@ def build_full_context(
 def build_base_context(
     repo_path: Path,
     index: RepoIndex,
-    signals_data: dict,
+    signals_data: Mapping[str, Any],
     config: ScanConfig | None = None,
 ) -> tuple[str, int]:
     """
@@ -559,27 +644,12 @@ def build_base_context(
     parts.append(signals_context)
 
     # Add key files that are always relevant (shared across all artifacts)
-    key_files = [
-        "README.md",
-        "readme.md",
-        "package.json",
-        "pyproject.toml",
-        "Cargo.toml",
-        "go.mod",
-        "Makefile",
-        "Dockerfile",
-        "docker-compose.yml",
-        "docker-compose.yaml",
-        ".github/workflows/ci.yml",
-        ".github/workflows/ci.yaml",
-    ]
-
     file_map = {f.path: f for f in index.files}
     key_excerpts: list[str] = []
     total_bytes = 0
     max_key_bytes = config.max_total_context_bytes // 2  # Reserve half for key files
 
-    for filename in key_files:
+    for filename in BASE_CONTEXT_KEY_FILES:
         if total_bytes >= max_key_bytes:
             break
 
@@ -616,7 +686,7 @@ def build_base_context(
         parts.append("\n## Key Configuration Files\n")
         parts.append("\n\n".join(key_excerpts))
 
-    base_context = "\n\n".join(parts)
-    estimated_tokens = estimate_tokens(base_context)
+    base_context = _SECTION_SEPARATOR.join(parts)
+    estimated_tokens = estimate_joined_tokens(parts)
 
     return base_context, estimated_tokens
@@ -5,7 +5,7 @@ Provides structured error handling with error codes, recoverability hints,
 and rich context for debugging.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from enum import Enum
 from typing import Any
 
@@ -58,14 +58,14 @@ class ApiVaultError(Exception):
         message: Human-readable error message
         code: Error code for programmatic handling
         recoverable: Whether the operation can be retried
-        context: Additional context for debugging
+        context: Additional context for debugging (None until populated)
         suggestion: Suggested action to resolve the error
     """
 
     message: str
     code: ErrorCode = ErrorCode.UNKNOWN
     recoverable: bool = False
-    context: dict[str, Any] = field(default_factory=dict)
+    context: dict[str, Any] | None = None
     suggestion: str | None = None
 
     def __str__(self) -> str:
@@ -90,11 +90,29 @@ class ApiVaultError(Exception):
             "message": self.message,
             "code": self.code.value,
             "recoverable": self.recoverable,
-            "context": self.context,
+            "context": self.context if self.context is not None else {},
             "suggestion": self.suggestion,
         }
 
 
+def _with_context(
+    context: dict[str, Any] | None,
+    items: tuple[tuple[str, Any], ...],
+) -> dict[str, Any] | None:
+    """
+    Merge attribute-backed entries into an error context.
+
+    Only allocates a dict once a truthy value is present, so errors raised
+    without any context stay allocation-free.
+    """
+    for key, value in items:
+        if value:
+            if context is None:
+                context = {}
+            context[key] = value
+    return context
+
+
 @dataclass
 class ScanError(ApiVaultError):
     """Repository scanning failed."""
@@ -102,8 +120,7 @@ class ScanError(ApiVaultError):
     file_path: str | None = None
 
     def __post_init__(self) -> None:
-        if self.file_path:
-            self.context["file_path"] = self.file_path
+        self.context = _with_context(self.context, (("file_path", self.file_path),))
 
 
 @dataclass
@@ -113,8 +130,7 @@ class SecretDetectionError(ApiVaultError):
     pattern_name: str | None = None
 
     def __post_init__(self) -> None:
-        if self.pattern_name:
-            self.context["pattern_name"] = self.pattern_name
+        self.context = _with_context(self.context, (("pattern_name", self.pattern_name),))
 
 
 @dataclass
@@ -125,10 +141,13 @@ class PlanningError(ApiVaultError):
     requested_families: list[str] | None = None
 
     def __post_init__(self) -> None:
-        if self.budget_tokens:
-            self.context["budget_tokens"] = self.budget_tokens
-        if self.requested_families:
-            self.context["requested_families"] = self.requested_families
+        self.context = _with_context(
+            self.context,
+            (
+                ("budget_tokens", self.budget_tokens),
+                ("requested_families", self.requested_families),
+            ),
+        )
 
 
 @dataclass
@@ -141,14 +160,15 @@ class GenerationError(ApiVaultError):
     retry_after: int | None = None
 
     def __post_init__(self) -> None:
-        if self.job_id:
-            self.context["job_id"] = self.job_id
-        if self.artifact_name:
-            self.context["artifact_name"] = self.artifact_name
-        if self.model:
-            self.context["model"] = self.model
-        if self.retry_after:
-            self.context["retry_after"] = self.retry_after
+        self.context = _with_context(
+            self.context,
+            (
+                ("job_id", self.job_id),
+                ("artifact_name", self.artifact_name),
+                ("model", self.model),
+                ("retry_after", self.retry_after),
+            ),
+        )
 
 
 @dataclass
@@ -159,10 +179,13 @@ class CacheError(ApiVaultError):
     cache_path: str | None = None
 
     def __post_init__(self) -> None:
-        if self.cache_key:
-            self.context["cache_key"] = self.cache_key
-        if self.cache_path:
-            self.context["cache_path"] = self.cache_path
+        self.context = _with_context(
+            self.context,
+            (
+                ("cache_key", self.cache_key),
+                ("cache_path", self.cache_path),
+            ),
+        )
 
 
 @dataclass
@@ -173,10 +196,13 @@ class ConfigError(ApiVaultError):
     key: str | None = None
 
     def __post_init__(self) -> None:
-        if self.config_path:
-            self.context["config_path"] = self.config_path
-        if self.key:
-            self.context["key"] = self.key
+        self.context = _with_context(
+            self.context,
+            (
+                ("config_path", self.config_path),
+                ("key", self.key),
+            ),
+        )
 
 
 # Factory functions for common errors
@@ -7,16 +7,24 @@ Tracks execution history to improve future estimates by learning from:
 - Success/failure rates per artifact type
 """
 
+import atexit
 import json
 import logging
-import statistics
-from dataclasses import dataclass, field
-from datetime import datetime
+import math
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 from pydantic import BaseModel, Field
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
 
@@ -64,35 +72,317 @@ class HistoryStats(BaseModel):
     family_stats: dict[str, dict[str, float]] = Field(default_factory=dict)
 
 
+SECONDS_PER_DAY = 86400
+
+# Exact JSON types the fast path accepts per history field (bool is not
+# taken for an int); anything else goes through ExecutionRecord validation
+_ROW_FIELD_TYPES: dict[str, tuple[type, ...]] = {
+    "job_id": (str,),
+    "artifact_name": (str,),
+    "family": (str,),
+    "timestamp": (str, float, int),
+    "estimated_input_tokens": (int,),
+    "estimated_output_tokens": (int,),
+    "actual_input_tokens": (int,),
+    "actual_output_tokens": (int,),
+    "generation_time_seconds": (float, int),
+    "success": (bool,),
+    "repo_name": (str,),
+    "model": (str,),
+    "context_size_bytes": (int,),
+}
+
+
+@dataclass(slots=True)
+class _ExecRow:
+    """
+    Internal, lightweight form of an ExecutionRecord.
+
+    Used for storage and aggregation so the hot path avoids Pydantic
+    validation; the timestamp is kept as a POSIX epoch in UTC.
+    """
+
+    job_id: str
+    artifact_name: str
+    family: str
+    timestamp: float
+    estimated_input_tokens: int
+    estimated_output_tokens: int
+    actual_input_tokens: int
+    actual_output_tokens: int
+    generation_time_seconds: float
+    success: bool
+    repo_name: str
+    model: str
+    context_size_bytes: int = 0
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "_ExecRow":
+        """
+        Build a row from a decoded history line.
+
+        Older history files store the timestamp as an ISO 8601 string;
+        naive values were written with datetime.utcnow() and are read as UTC.
+
+        Args:
+            data: Decoded JSON value
+
+        Returns:
+            Row for the record
+
+        Raises:
+            TypeError: If data is not an object or a field has the wrong type
+            ValueError: If the timestamp string is not ISO 8601
+        """
+        if type(data) is not dict:
+            raise TypeError("history line is not a JSON object")
+        for name, types in _ROW_FIELD_TYPES.items():
+            if name in data and type(data[name]) not in types:
+                raise TypeError(f"history field {name!r} has type {type(data[name]).__name__}")
+
+        ts = data.get("timestamp")
+        if isinstance(ts, str):
+            parsed = datetime.fromisoformat(ts)
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=UTC)
+            data["timestamp"] = parsed.timestamp()
+        return cls(**data)
+
+    @classmethod
+    def from_record(cls, record: ExecutionRecord) -> "_ExecRow":
+        """
+        Build a row from a validated ExecutionRecord.
+
+        Args:
+            record: Validated record; a naive timestamp is read as UTC
+
+        Returns:
+            Row for the record
+        """
+        ts = record.timestamp
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=UTC)
+        data = record.model_dump()
+        data["timestamp"] = ts.timestamp()
+        return cls(**data)
+
+
+def _dumps_row(row: _ExecRow) -> bytes:
+    """Serialize a row to a single JSON line (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(row) + b"\n"
+    return json.dumps(asdict(row), separators=(",", ":")).encode() + b"\n"
+
+
+def _loads_line(line: bytes) -> Any:
+    """Decode a single JSON line (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+@dataclass
+class _Moments:
+    """Running count, mean and variance of a series (Welford's algorithm)."""
+
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def add(self, x: float) -> None:
+        """Add a single observation."""
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += (x - self.mean) * delta
+
+    def merge(self, other: "_Moments") -> None:
+        """Fold another series into this one (Chan's parallel update)."""
+        if other.n == 0:
+            return
+        if self.n == 0:
+            self.n, self.mean, self.m2 = other.n, other.mean, other.m2
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+
+    def mean_or(self, default: float) -> float:
+        """Mean of the series, or default when empty."""
+        return self.mean if self.n else default
+
+    def stdev(self) -> float:
+        """Sample standard deviation, or 0.0 with fewer than two observations."""
+        return math.sqrt(max(self.m2, 0.0) / (self.n - 1)) if self.n > 1 else 0.0
+
+
+@dataclass
+class _RunningAgg:
+    """Aggregates over a set of execution records, updated incrementally."""
+
+    count: int = 0
+    success_count: int = 0
+    input_ratio: _Moments = field(default_factory=_Moments)
+    output_ratio: _Moments = field(default_factory=_Moments)
+    generation_time: _Moments = field(default_factory=_Moments)  # successes with time > 0
+    success_time_sum: float = 0.0
+    success_output_tokens: int = 0
+
+    def add(self, record: _ExecRow) -> None:
+        """Add a single record."""
+        self.count += 1
+        if not record.success:
+            return
+
+        self.success_count += 1
+        if record.estimated_input_tokens > 0:
+            self.input_ratio.add(record.actual_input_tokens / record.estimated_input_tokens)
+        if record.estimated_output_tokens > 0:
+            self.output_ratio.add(record.actual_output_tokens / record.estimated_output_tokens)
+        if record.generation_time_seconds > 0:
+            self.generation_time.add(record.generation_time_seconds)
+        self.success_time_sum += record.generation_time_seconds
+        self.success_output_tokens += record.actual_output_tokens
+
+    def merge(self, other: "_RunningAgg") -> None:
+        """Fold another aggregate into this one."""
+        self.count += other.count
+        self.success_count += other.success_count
+        self.input_ratio.merge(other.input_ratio)
+        self.output_ratio.merge(other.output_ratio)
+        self.generation_time.merge(other.generation_time)
+        self.success_time_sum += other.success_time_sum
+        self.success_output_tokens += other.success_output_tokens
+
+    def copy(self) -> "_RunningAgg":
+        """Independent copy of this aggregate."""
+        agg = _RunningAgg()
+        agg.merge(self)
+        return agg
+
+
+def _family_agg(families: dict[str, _RunningAgg], family: str) -> _RunningAgg:
+    """Get or create a family aggregate without allocating on the hit path."""
+    agg = families.get(family)
+    if agg is None:
+        agg = families[family] = _RunningAgg()
+    return agg
+
+
+@dataclass
+class _DayBucket:
+    """Aggregates for all records that fall on one (epoch) day."""
+
+    total: _RunningAgg = field(default_factory=_RunningAgg)
+    families: dict[str, _RunningAgg] = field(default_factory=dict)
+    records: list[_ExecRow] = field(default_factory=list)
+
+    def add(self, record: _ExecRow) -> None:
+        """Add a record to the bucket."""
+        self.total.add(record)
+        _family_agg(self.families, record.family).add(record)
+        self.records.append(record)
+
+
+@dataclass
+class _Window:
+    """Merged aggregates for all whole days after cutoff_day (None = all days)."""
+
+    cutoff_day: int | None
+    total: _RunningAgg = field(default_factory=_RunningAgg)
+    families: dict[str, _RunningAgg] = field(default_factory=dict)
+
+    def covers(self, day: int) -> bool:
+        """Whether records on this day belong in the merged aggregates."""
+        return self.cutoff_day is None or day > self.cutoff_day
+
+    def merge(self, bucket: _DayBucket) -> None:
+        """Fold a whole day into the window."""
+        self.total.merge(bucket.total)
+        for family, agg in bucket.families.items():
+            _family_agg(self.families, family).merge(agg)
+
+    def add(self, record: _ExecRow) -> None:
+        """Fold a single new record into the window."""
+        self.total.add(record)
+        _family_agg(self.families, record.family).add(record)
+
+
 class ExecutionHistory:
     """
     Manages execution history for learning.
 
     Stores and analyzes past executions to improve future estimates.
+    Records are appended through a persistent buffered handle that is
+    flushed every FLUSH_EVERY_RECORDS records, every FLUSH_INTERVAL_SECONDS,
+    on flush()/close(), and at interpreter exit. Statistics are maintained
+    incrementally in per-day buckets so get_stats never rescans history,
+    and the merge of whole days for the current window is cached between
+    calls.
+    The history file is only read on the first get_stats call; in
+    append_only mode it is never read and no records are kept in memory.
     """
 
-    def __init__(self, history_dir: Path | None = None) -> None:
+    # Append buffer settings
+    WRITE_BUFFER_BYTES = 1 << 20
+    FLUSH_EVERY_RECORDS = 32
+    FLUSH_INTERVAL_SECONDS = 5.0
+
+    def __init__(self, history_dir: Path | None = None, append_only: bool = False) -> None:
         """
         Initialize history manager.
 
         Args:
             history_dir: Directory to store history files.
                         Defaults to ~/.api-vault/history/
+            append_only: Only record executions; statistics are unavailable
         """
         if history_dir is None:
             history_dir = Path.home() / ".api-vault" / "history"
 
         self.history_dir = history_dir
         self.history_dir.mkdir(parents=True, exist_ok=True)
+        self.append_only = append_only
 
-        self._records: list[ExecutionRecord] = []
-        self._stats_cache: HistoryStats | None = None
-        self._load_history()
+        self._records: list[_ExecRow] = []
+        self._buckets: dict[int, _DayBucket] = {}
+        self._window: _Window | None = None
+
+        # Persistent append handle, opened on first write
+        self._fh: BinaryIO | None = None
+        self._pending_writes = 0
+        self._last_flush = time.monotonic()
+
+        # History is read from disk on first use (see _ensure_loaded)
+        self._loaded = False
 
     def _history_file(self) -> Path:
         """Get path to main history file."""
         return self.history_dir / "executions.jsonl"
 
+    def _add_record(self, record: _ExecRow) -> None:
+        """Keep a record in memory and fold it into the running aggregates."""
+        self._records.append(record)
+        day = int(record.timestamp // SECONDS_PER_DAY)
+        bucket = self._buckets.get(day)
+        if bucket is None:
+            bucket = self._buckets[day] = _DayBucket()
+        bucket.add(record)
+        if self._window is not None and self._window.covers(day):
+            self._window.add(record)
+
+    def _ensure_loaded(self) -> None:
+        """Load history from disk on first use, including records not yet flushed."""
+        if self._loaded:
+            return
+        if self.append_only:
+            raise RuntimeError("Execution history statistics are unavailable in append-only mode")
+        self.flush()
+        self._load_history()
+        self._loaded = True
+
     def _load_history(self) -> None:
         """Load history from disk."""
         history_file = self._history_file()
@@ -100,15 +390,29 @@ class ExecutionHistory:
             return
 
         try:
-            with open(history_file) as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        record = ExecutionRecord.model_validate_json(line)
-                        self._records.append(record)
-            logger.info(f"Loaded {len(self._records)} execution records")
-        except Exception as e:
+            data = history_file.read_bytes()
+        except OSError as e:
             logger.warning(f"Failed to load history: {e}")
+            return
+
+        skipped = 0
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            try:
+                row = _ExecRow.from_dict(_loads_line(line))
+            except (ValueError, TypeError):
+                # Slow path: let Pydantic coerce rows the fast path rejects
+                try:
+                    row = _ExecRow.from_record(ExecutionRecord.model_validate_json(line))
+                except ValueError:
+                    skipped += 1
+                    continue
+            self._add_record(row)
+
+        if skipped:
+            logger.warning(f"Skipped {skipped} malformed history records")
+        logger.info(f"Loaded {len(self._records)} execution records")
 
     def record_execution(
         self,
@@ -142,10 +446,11 @@ class ExecutionHistory:
             model: Model used
             context_size_bytes: Size of context provided
         """
-        record = ExecutionRecord(
+        record = _ExecRow(
             job_id=job_id,
             artifact_name=artifact_name,
             family=family,
+            timestamp=time.time(),
             estimated_input_tokens=estimated_input_tokens,
             estimated_output_tokens=estimated_output_tokens,
             actual_input_tokens=actual_input_tokens,
@@ -157,16 +462,58 @@ class ExecutionHistory:
             context_size_bytes=context_size_bytes,
         )
 
-        self._records.append(record)
-        self._stats_cache = None  # Invalidate cache
+        # Until history is loaded the record is only written; the load
+        # will pick it up from the file
+        if self._loaded:
+            self._add_record(record)
 
-        # Append to file
+        # Append to file (buffered; see flush())
         try:
-            with open(self._history_file(), "a") as f:
-                f.write(record.model_dump_json() + "\n")
+            fh = self._append_handle()
+            fh.write(_dumps_row(record))
+            self._pending_writes += 1
+            if (
+                self._pending_writes >= self.FLUSH_EVERY_RECORDS
+                or time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL_SECONDS
+            ):
+                self.flush()
         except Exception as e:
             logger.error(f"Failed to save execution record: {e}")
 
+    def _append_handle(self) -> BinaryIO:
+        """Get the persistent append handle, opening it on first use."""
+        if self._fh is None:
+            self._fh = open(self._history_file(), "ab", buffering=self.WRITE_BUFFER_BYTES)
+            atexit.register(self.close)
+        return self._fh
+
+    def flush(self, fsync: bool = False) -> None:
+        """
+        Flush buffered records to disk.
+
+        Args:
+            fsync: Also force the data to stable storage
+        """
+        if self._fh is not None:
+            self._fh.flush()
+            if fsync:
+                os.fsync(self._fh.fileno())
+        self._pending_writes = 0
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """Flush buffered records and close the append handle."""
+        if self._fh is None:
+            return
+        try:
+            self.flush()
+        except OSError as e:
+            logger.error(f"Failed to flush execution history: {e}")
+        finally:
+            self._fh.close()
+            self._fh = None
+            atexit.unregister(self.close)
+
     def get_stats(self, max_age_days: int | None = 90) -> HistoryStats:
         """
         Get aggregated statistics from history.
@@ -176,89 +523,69 @@ class ExecutionHistory:
 
         Returns:
             Aggregated statistics
-        """
-        if self._stats_cache is not None:
-            return self._stats_cache
 
+        Raises:
+            RuntimeError: If the history was opened in append-only mode
+        """
+        self._ensure_loaded()
         if not self._records:
             return HistoryStats()
 
-        # Filter by age
-        records = self._records
+        cutoff: float | None = None
+        cutoff_day: int | None = None
         if max_age_days is not None:
-            cutoff = datetime.utcnow().timestamp() - (max_age_days * 86400)
-            records = [r for r in records if r.timestamp.timestamp() > cutoff]
-
-        if not records:
+            cutoff = time.time() - (max_age_days * SECONDS_PER_DAY)
+            cutoff_day = int(cutoff // SECONDS_PER_DAY)
+
+        # Whole days inside the window are merged once and kept up to date
+        # by _add_record until the cutoff day moves
+        window = self._window
+        if window is None or window.cutoff_day != cutoff_day:
+            window = self._window = _Window(cutoff_day)
+            for day, bucket in self._buckets.items():
+                if window.covers(day):
+                    window.merge(bucket)
+
+        total = window.total.copy()
+        families = {family: agg.copy() for family, agg in window.families.items()}
+
+        # Only the day containing the cutoff needs a per-record check
+        boundary = self._buckets.get(cutoff_day) if cutoff_day is not None else None
+        if cutoff is not None and boundary is not None:
+            for r in boundary.records:
+                if r.timestamp > cutoff:
+                    total.add(r)
+                    _family_agg(families, r.family).add(r)
+
+        if not total.count:
             return HistoryStats()
 
-        # Calculate stats
-        successes = [r for r in records if r.success]
-        success_rate = len(successes) / len(records) if records else 0.0
-
-        # Token ratios (only for successful, non-zero estimates)
-        input_ratios = []
-        output_ratios = []
-        for r in successes:
-            if r.estimated_input_tokens > 0:
-                input_ratios.append(r.actual_input_tokens / r.estimated_input_tokens)
-            if r.estimated_output_tokens > 0:
-                output_ratios.append(r.actual_output_tokens / r.estimated_output_tokens)
-
-        input_ratio_mean = statistics.mean(input_ratios) if input_ratios else 1.0
-        input_ratio_std = statistics.stdev(input_ratios) if len(input_ratios) > 1 else 0.0
-        output_ratio_mean = statistics.mean(output_ratios) if output_ratios else 1.0
-        output_ratio_std = statistics.stdev(output_ratios) if len(output_ratios) > 1 else 0.0
-
-        # Time stats
-        times = [r.generation_time_seconds for r in successes if r.generation_time_seconds > 0]
-        avg_time = statistics.mean(times) if times else 0.0
-
-        # Tokens per second
-        total_tokens = sum(r.actual_output_tokens for r in successes)
-        total_time = sum(r.generation_time_seconds for r in successes)
-        tokens_per_second = total_tokens / total_time if total_time > 0 else 0.0
-
-        # Per-family stats
-        family_stats: dict[str, dict[str, float]] = {}
-        families = set(r.family for r in records)
-        for family in families:
-            family_records = [r for r in records if r.family == family]
-            family_successes = [r for r in family_records if r.success]
-
-            family_input_ratios = [
-                r.actual_input_tokens / r.estimated_input_tokens
-                for r in family_successes
-                if r.estimated_input_tokens > 0
-            ]
-            family_output_ratios = [
-                r.actual_output_tokens / r.estimated_output_tokens
-                for r in family_successes
-                if r.estimated_output_tokens > 0
-            ]
-
-            family_stats[family] = {
-                "count": len(family_records),
-                "success_rate": len(family_successes) / len(family_records) if family_records else 0.0,
-                "input_ratio": statistics.mean(family_input_ratios) if family_input_ratios else 1.0,
-                "output_ratio": statistics.mean(family_output_ratios) if family_output_ratios else 1.0,
+        family_stats: dict[str, dict[str, float]] = {
+            family: {
+                "count": agg.count,
+                "success_rate": agg.success_count / agg.count,
+                "input_ratio": agg.input_ratio.mean_or(1.0),
+                "output_ratio": agg.output_ratio.mean_or(1.0),
             }
+            for family, agg in families.items()
+        }
 
-        stats = HistoryStats(
-            total_executions=len(records),
-            success_rate=success_rate,
-            input_token_ratio_mean=input_ratio_mean,
-            input_token_ratio_std=input_ratio_std,
-            output_token_ratio_mean=output_ratio_mean,
-            output_token_ratio_std=output_ratio_std,
-            avg_generation_time=avg_time,
-            tokens_per_second=tokens_per_second,
+        return HistoryStats(
+            total_executions=total.count,
+            success_rate=total.success_count / total.count,
+            input_token_ratio_mean=total.input_ratio.mean_or(1.0),
+            input_token_ratio_std=total.input_ratio.stdev(),
+            output_token_ratio_mean=total.output_ratio.mean_or(1.0),
+            output_token_ratio_std=total.output_ratio.stdev(),
+            avg_generation_time=total.generation_time.mean_or(0.0),
+            tokens_per_second=(
+                total.success_output_tokens / total.success_time_sum
+                if total.success_time_sum > 0
+                else 0.0
+            ),
             family_stats=family_stats,
         )
 
-        self._stats_cache = stats
-        return stats
-
     def adjust_estimate(
         self,
         estimated_tokens: int,
@@ -338,8 +665,11 @@ class ExecutionHistory:
 
     def clear_history(self) -> None:
         """Clear all execution history."""
+        self.close()
         self._records = []
-        self._stats_cache = None
+        self._buckets = {}
+        self._window = None
+        self._loaded = not self.append_only
 
         history_file = self._history_file()
         if history_file.exists():
@@ -363,4 +693,6 @@ def get_history(history_dir: Path | None = None) -> ExecutionHistory:
 def reset_history() -> None:
     """Reset the global history manager (mainly for testing)."""
     global _history
+    if _history is not None:
+        _history.close()
     _history = None
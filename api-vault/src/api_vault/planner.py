@@ -6,7 +6,7 @@ the optimal set within budget constraints.
 """
 
 import hashlib
-import json
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -14,6 +14,7 @@ from typing import Any
 
 from api_vault.context_packager import estimate_tokens, select_context_refs_for_artifact
 from api_vault.schemas import (
+    DEFAULT_SCORE_WEIGHTS,
     ArtifactFamily,
     ContextRef,
     Plan,
@@ -41,6 +42,22 @@ class ArtifactTemplate:
     required_signals: list[str] = field(default_factory=list)
     boosted_by_gaps: list[str] = field(default_factory=list)
     prerequisites: list[str] = field(default_factory=list)
+    _boosted_lower: tuple[str, ...] = field(init=False, repr=False, compare=False, default=())
+    _static_score: float = field(init=False, repr=False, compare=False, default=0.0)
+    _family_value: str = field(init=False, repr=False, compare=False, default="")
+    _output_path: str = field(init=False, repr=False, compare=False, default="")
+
+    def __post_init__(self) -> None:
+        """Cache derived values: gap keywords, family/output path, static score."""
+        self._boosted_lower = tuple(g.lower() for g in self.boosted_by_gaps)
+        self._family_value = self.family.value
+        self._output_path = f"artifacts/{self._family_value}/{self.output_filename}"
+        # Same term order as ScoreBreakdown.compute_total so totals are identical
+        self._static_score = (
+            self.base_reusability * DEFAULT_SCORE_WEIGHTS["reusability"]
+            + self.base_time_saved * DEFAULT_SCORE_WEIGHTS["time_saved"]
+            + self.base_leverage * DEFAULT_SCORE_WEIGHTS["leverage"]
+        )
 
 
 # Define all artifact templates
@@ -218,13 +235,71 @@ ARTIFACT_TEMPLATES: list[ArtifactTemplate] = [
 ]
 
 
-def compute_gap_weight(template: ArtifactTemplate, gaps: list[str]) -> float:
+# Gap weight by number of matched gaps (3 or more share the top weight)
+_GAP_WEIGHTS: tuple[float, ...] = (5.0, 7.0, 8.0, 10.0)
+
+
+class _GapIndex:
+    """
+    Per-plan index from template gap keywords to the gaps containing them.
+
+    Templates share many keywords, so each distinct keyword is scanned
+    against the gaps once and every template's matches are a union of
+    cached keyword hits.
+    """
+
+    def __init__(self, gaps: Sequence[str]) -> None:
+        self._gaps = gaps
+        self._gaps_lower = [g.lower() for g in gaps]
+        self._keyword_hits: dict[str, frozenset[int]] = {}
+        self._template_hits: dict[str, list[int]] = {}
+
+    def _hits(self, keyword: str) -> frozenset[int]:
+        hits = self._keyword_hits.get(keyword)
+        if hits is None:
+            hits = frozenset(i for i, gap in enumerate(self._gaps_lower) if keyword in gap)
+            self._keyword_hits[keyword] = hits
+        return hits
+
+    def matches(self, template: ArtifactTemplate) -> list[int]:
+        """Sorted indices of the gaps that boost this template."""
+        matched = self._template_hits.get(template.name)
+        if matched is None:
+            hits: set[int] = set()
+            for keyword in template._boosted_lower:
+                hits |= self._hits(keyword)
+            matched = self._template_hits[template.name] = sorted(hits)
+        return matched
+
+    def first_match(self, template: ArtifactTemplate) -> str | None:
+        """First gap (original text) that boosts this template, if any."""
+        matched = self._template_hits.get(template.name)
+        if matched is not None:
+            return self._gaps[matched[0]] if matched else None
+        # Not scored through this index yet: stop at the first hit
+        boosted = template._boosted_lower
+        return next(
+            (
+                self._gaps[i]
+                for i, gap in enumerate(self._gaps_lower)
+                if any(bg in gap for bg in boosted)
+            ),
+            None,
+        )
+
+
+def compute_gap_weight(
+    template: ArtifactTemplate,
+    gaps: list[str],
+    gap_index: _GapIndex | None = None,
+) -> float:
     """
     Compute how much a repo needs this artifact based on gaps.
 
     Args:
         template: Artifact template
         gaps: List of identified gaps
+        gap_index: Index over the same gaps, if already built by the caller
 
     Returns:
         Gap weight score (0-10)
@@ -232,17 +307,12 @@ def compute_gap_weight(template: ArtifactTemplate, gaps: list[str]) -> float:
     if not template.boosted_by_gaps:
         return 5.0  # Default neutral weight
 
-    matched_gaps = sum(1 for gap in gaps if any(bg.lower() in gap.lower() for bg in template.boosted_by_gaps))
+    if gap_index is None:
+        gap_index = _GapIndex(gaps)
+    matched_gaps = len(gap_index.matches(template))
 
     # More matched gaps = higher weight
-    if matched_gaps >= 3:
-        return 10.0
-    elif matched_gaps == 2:
-        return 8.0
-    elif matched_gaps == 1:
-        return 7.0
-    else:
-        return 5.0
+    return _GAP_WEIGHTS[min(matched_gaps, len(_GAP_WEIGHTS) - 1)]
 
 
 def check_prerequisites(template: ArtifactTemplate, signals: RepoSignals) -> bool:
@@ -256,22 +326,52 @@ def check_prerequisites(template: ArtifactTemplate, signals: RepoSignals) -> boo
     Returns:
         True if prerequisites are met
     """
-    if not template.required_signals:
-        return True
+    # Read flags directly rather than dumping the whole model per template
+    return all(getattr(signals, signal, False) for signal in template.required_signals)
 
-    signals_dict = signals.model_dump() if hasattr(signals, "model_dump") else signals.__dict__
 
-    for signal in template.required_signals:
-        if not signals_dict.get(signal, False):
-            return False
+def _score_values(
+    template: ArtifactTemplate,
+    gaps: list[str],
+    estimated_context_tokens: int,
+    gap_index: _GapIndex | None = None,
+) -> tuple[float, float, float]:
+    """Context cost, gap weight and total score, without building a ScoreBreakdown."""
+    # Lower context cost is better (inverse relationship)
+    context_cost = min(template.base_context_cost + (estimated_context_tokens / 2000), 10.0)
+    gap_weight = compute_gap_weight(template, gaps, gap_index)
+    total = (
+        template._static_score
+        + context_cost * DEFAULT_SCORE_WEIGHTS["context_cost"]
+        + gap_weight * DEFAULT_SCORE_WEIGHTS["gap_weight"]
+    )
+    return context_cost, gap_weight, total
+
 
-    return True
+def _breakdown(
+    template: ArtifactTemplate, context_cost: float, gap_weight: float, total: float
+) -> ScoreBreakdown:
+    """
+    Materialize a ScoreBreakdown from precomputed values.
+
+    Skips validation: the base scores come from the template table and
+    context cost and gap weight are clamped to 0-10 by construction.
+    """
+    return ScoreBreakdown.model_construct(
+        reusability=template.base_reusability,
+        time_saved=template.base_time_saved,
+        leverage=template.base_leverage,
+        context_cost=context_cost,
+        gap_weight=gap_weight,
+        total_score=total,
+    )
 
 
 def score_artifact(
     template: ArtifactTemplate,
     signals: RepoSignals,
     estimated_context_tokens: int,
+    gap_index: _GapIndex | None = None,
 ) -> ScoreBreakdown:
     """
     Score an artifact candidate.
@@ -280,31 +380,13 @@ def score_artifact(
         template: Artifact template
         signals: Repository signals
         estimated_context_tokens: Estimated tokens needed for context
+        gap_index: Index over the identified gaps, if already built by the caller
 
     Returns:
         ScoreBreakdown with all scores
     """
     gaps = signals.identified_gaps if hasattr(signals, "identified_gaps") else []
-
-    # Calculate context cost based on estimated tokens
-    # Lower context cost is better (inverse relationship)
-    context_cost = min(template.base_context_cost + (estimated_context_tokens / 2000), 10.0)
-
-    gap_weight = compute_gap_weight(template, gaps)
-
-    breakdown = ScoreBreakdown(
-        reusability=template.base_reusability,
-        time_saved=template.base_time_saved,
-        leverage=template.base_leverage,
-        context_cost=context_cost,
-        gap_weight=gap_weight,
-        total_score=0.0,  # Will be computed
-    )
-
-    # Compute total score
-    breakdown.total_score = breakdown.compute_total()
-
-    return breakdown
+    return _breakdown(template, *_score_values(template, gaps, estimated_context_tokens, gap_index))
 
 
 def generate_plan_id(repo_path: str, timestamp: datetime) -> str:
@@ -313,10 +395,21 @@ def generate_plan_id(repo_path: str, timestamp: datetime) -> str:
     return hashlib.sha256(data.encode()).hexdigest()[:16]
 
 
+def _job_id_hasher(plan_id: str) -> "hashlib._Hash":
+    """Hash state over the "<plan_id>:" prefix shared by all jobs of a plan."""
+    return hashlib.sha256(f"{plan_id}:".encode())
+
+
+def _job_id_from(prefix: "hashlib._Hash", artifact_name: str) -> str:
+    """Finish a job ID from a copy of the shared prefix state."""
+    h = prefix.copy()
+    h.update(artifact_name.encode())
+    return h.hexdigest()[:12]
+
+
 def generate_job_id(plan_id: str, artifact_name: str) -> str:
     """Generate deterministic job ID."""
-    data = f"{plan_id}:{artifact_name}"
-    return hashlib.sha256(data.encode()).hexdigest()[:12]
+    return _job_id_from(_job_id_hasher(plan_id), artifact_name)
 
 
 def create_plan(
@@ -344,11 +437,21 @@ def create_plan(
 
     timestamp = datetime.utcnow()
     plan_id = generate_plan_id(index.repo_path, timestamp)
+    job_id_prefix = _job_id_hasher(plan_id)
+
+    # Estimate tokens per job: context + output + overhead
+    OVERHEAD_TOKENS = 500  # System prompt, formatting, etc.
 
-    # Score all candidate artifacts
-    candidates: list[tuple[ArtifactTemplate, ScoreBreakdown, list[ContextRef], int]] = []
+    # Score all candidate artifacts; sort keys and job costs are kept in
+    # parallel lists so sorting and packing only touch plain numbers, and
+    # ScoreBreakdown models are only built for selected jobs
+    candidates: list[tuple[ArtifactTemplate, list[ContextRef], int, float, float]] = []
+    total_scores: list[float] = []
+    job_costs: list[int] = []
 
     signals_dict = signals.model_dump() if hasattr(signals, "model_dump") else {}
+    gaps = signals.identified_gaps if hasattr(signals, "identified_gaps") else []
+    gap_index = _GapIndex(gaps)
 
     for template in ARTIFACT_TEMPLATES:
         # Filter by family
@@ -362,58 +465,68 @@ def create_plan(
         # Select context references
         context_refs = select_context_refs_for_artifact(
             template.name,
-            template.family.value,
+            template._family_value,
             index,
             signals_dict,
         )
 
         # Estimate context tokens (rough estimate)
-        estimated_context_tokens = sum(
-            min(ref.max_bytes, 4096) // 4 for ref in context_refs
-        )
+        estimated_context_tokens = sum(ref.token_cost for ref in context_refs)
 
         # Score the artifact
-        score = score_artifact(template, signals, estimated_context_tokens)
+        context_cost, gap_weight, total_score = _score_values(
+            template, gaps, estimated_context_tokens, gap_index
+        )
 
-        candidates.append((template, score, context_refs, estimated_context_tokens))
+        candidates.append((template, context_refs, estimated_context_tokens, context_cost, gap_weight))
+        total_scores.append(total_score)
+        job_costs.append(estimated_context_tokens + template.max_output_tokens + OVERHEAD_TOKENS)
 
-    # Sort by total score (descending)
-    candidates.sort(key=lambda x: x[1].total_score, reverse=True)
+    # Sort by total score (descending, stable for ties)
+    order = sorted(range(len(candidates)), key=total_scores.__getitem__, reverse=True)
 
-    # Select jobs within budget
-    jobs: list[PlanJob] = []
-    excluded_jobs: list[dict[str, Any]] = []
+    # Select jobs within budget, then build both result lists in one pass
+    # each, sized to their final length
+    selected: list[int] = []
+    rejected: list[int] = []
     total_estimated_tokens = 0
 
-    # Estimate tokens per job: context + output + overhead
-    OVERHEAD_TOKENS = 500  # System prompt, formatting, etc.
-
-    for template, score, context_refs, est_context_tokens in candidates:
-        job_tokens = est_context_tokens + template.max_output_tokens + OVERHEAD_TOKENS
-
+    for i in order:
+        job_tokens = job_costs[i]
         if total_estimated_tokens + job_tokens <= budget_tokens:
-            job = PlanJob(
-                id=generate_job_id(plan_id, template.name),
-                family=template.family,
-                artifact_name=template.name,
-                output_path=f"artifacts/{template.family.value}/{template.output_filename}",
-                prompt_template_id=template.prompt_template_id,
-                max_output_tokens=template.max_output_tokens,
-                context_refs=context_refs,
-                score_breakdown=score,
-                reason=_generate_reason(template, score, signals),
-                estimated_input_tokens=est_context_tokens + OVERHEAD_TOKENS,
-            )
-            jobs.append(job)
+            selected.append(i)
             total_estimated_tokens += job_tokens
         else:
-            excluded_jobs.append({
-                "artifact_name": template.name,
-                "family": template.family.value,
-                "score": score.total_score,
-                "estimated_tokens": job_tokens,
-                "reason": "Exceeded token budget",
-            })
+            rejected.append(i)
+
+    def build_job(i: int) -> PlanJob:
+        """Materialize the PlanJob for candidate i."""
+        template, context_refs, est_context_tokens, context_cost, gap_weight = candidates[i]
+        score = _breakdown(template, context_cost, gap_weight, total_scores[i])
+        return PlanJob.model_construct(
+            id=_job_id_from(job_id_prefix, template.name),
+            family=template.family,
+            artifact_name=template.name,
+            output_path=template._output_path,
+            prompt_template_id=template.prompt_template_id,
+            max_output_tokens=template.max_output_tokens,
+            context_refs=context_refs,
+            score_breakdown=score,
+            reason=_generate_reason(template, score, signals, gap_index),
+            estimated_input_tokens=est_context_tokens + OVERHEAD_TOKENS,
+        )
+
+    jobs = [build_job(i) for i in selected]
+    excluded_jobs: list[dict[str, Any]] = [
+        {
+            "artifact_name": candidates[i][0].name,
+            "family": candidates[i][0]._family_value,
+            "score": total_scores[i],
+            "estimated_tokens": job_costs[i],
+            "reason": "Exceeded token budget",
+        }
+        for i in rejected
+    ]
 
     return Plan(
         plan_id=plan_id,
@@ -434,6 +547,7 @@ def _generate_reason(
     template: ArtifactTemplate,
     score: ScoreBreakdown,
     signals: RepoSignals,
+    gap_index: _GapIndex,
 ) -> str:
     """
     Generate a human-readable reason for selecting an artifact.
@@ -442,6 +556,7 @@ def _generate_reason(
         template: Artifact template
         score: Score breakdown
         signals: Repository signals
+        gap_index: Index over the identified gaps
 
     Returns:
         Reason string
@@ -459,10 +574,10 @@ def _generate_reason(
     reasons.append(f"Selected for {top_factor[0]} (score: {top_factor[1]:.1f})")
 
     # Gap-specific reasons
-    if hasattr(signals, "identified_gaps") and template.boosted_by_gaps:
-        matched = [g for g in signals.identified_gaps if any(bg.lower() in g.lower() for bg in template.boosted_by_gaps)]
-        if matched:
-            reasons.append(f"Addresses: {matched[0]}")
+    if template.boosted_by_gaps:
+        first = gap_index.first_match(template)
+        if first:
+            reasons.append(f"Addresses: {first}")
 
     # Prerequisite context
     if template.required_signals:
@@ -482,7 +597,7 @@ def plan_to_dict(plan: Plan) -> dict[str, Any]:
     Returns:
         Dictionary representation
     """
-    return json.loads(plan.model_dump_json())
+    return plan.model_dump(mode="json")
 
 
 def load_plan(path: Path) -> Plan:
@@ -495,6 +610,6 @@ def load_plan(path: Path) -> Plan:
     Returns:
         Plan object
     """
-    with open(path) as f:
-        data = json.load(f)
-    return Plan.model_validate(data)
+    # Parsed straight into the schema by pydantic-core, with no
+    # intermediate dict
+    return Plan.model_validate_json(path.read_bytes())
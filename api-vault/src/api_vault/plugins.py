@@ -8,12 +8,14 @@ Allows users to extend functionality with custom:
 - Post-processors (transform generated content)
 """
 
+import bisect
 import importlib
 import importlib.util
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from pathlib import Path
+from types import ModuleType
 from typing import Any, Callable, Protocol, TypeVar
 
 from api_vault.schemas import (
@@ -31,7 +33,15 @@ logger = logging.getLogger(__name__)
 
 
 class ArtifactGeneratorPlugin(ABC):
-    """Base class for custom artifact generators."""
+    """
+    Base class for custom artifact generators.
+
+    The name, family, description and priority properties may also be
+    provided as plain class attributes, which avoids a property call on
+    every access.
+    """
+
+    __slots__ = ()
 
     @property
     @abstractmethod
@@ -111,6 +121,8 @@ class ArtifactGeneratorPlugin(ABC):
 class SignalDetectorPlugin(ABC):
     """Base class for custom signal detection."""
 
+    __slots__ = ()
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -144,6 +156,8 @@ class SignalDetectorPlugin(ABC):
 class SecretPatternPlugin(ABC):
     """Base class for custom secret detection patterns."""
 
+    __slots__ = ()
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -179,6 +193,8 @@ class SecretPatternPlugin(ABC):
 class PostProcessorPlugin(ABC):
     """Base class for content post-processors."""
 
+    __slots__ = ()
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -241,10 +257,34 @@ class PluginRegistry:
 
     _plugin_info: list[PluginInfo] = field(default_factory=list)
 
+    # Sort keys mirroring the ordered plugin lists, for bisect insertion
+    _generator_keys: list[int] = field(default_factory=list, repr=False)
+    _detector_keys: list[int] = field(default_factory=list, repr=False)
+    _processor_keys: list[int] = field(default_factory=list, repr=False)
+
+    # Artifact generators per family, in the same order, with their sort keys
+    _generators_by_family: dict[ArtifactFamily, list[ArtifactGeneratorPlugin]] = field(
+        default_factory=dict, repr=False
+    )
+    _family_keys: dict[ArtifactFamily, list[int]] = field(default_factory=dict, repr=False)
+
+    @staticmethod
+    def _insert_sorted(items: list[Any], keys: list[int], item: Any, key: int) -> None:
+        """Insert item after any existing items with the same key (stable)."""
+        i = bisect.bisect_right(keys, key)
+        keys.insert(i, key)
+        items.insert(i, item)
+
     def register_artifact_generator(self, plugin: ArtifactGeneratorPlugin) -> None:
         """Register an artifact generator plugin."""
-        self.artifact_generators.append(plugin)
-        self.artifact_generators.sort(key=lambda p: -p.priority)
+        key = -plugin.priority
+        self._insert_sorted(self.artifact_generators, self._generator_keys, plugin, key)
+        self._insert_sorted(
+            self._generators_by_family.setdefault(plugin.family, []),
+            self._family_keys.setdefault(plugin.family, []),
+            plugin,
+            key,
+        )
         self._plugin_info.append(PluginInfo(
             name=plugin.name,
             type="artifact_generator",
@@ -255,8 +295,7 @@ class PluginRegistry:
 
     def register_signal_detector(self, plugin: SignalDetectorPlugin) -> None:
         """Register a signal detector plugin."""
-        self.signal_detectors.append(plugin)
-        self.signal_detectors.sort(key=lambda p: -p.priority)
+        self._insert_sorted(self.signal_detectors, self._detector_keys, plugin, -plugin.priority)
         self._plugin_info.append(PluginInfo(
             name=plugin.name,
             type="signal_detector",
@@ -278,8 +317,7 @@ class PluginRegistry:
 
     def register_post_processor(self, plugin: PostProcessorPlugin) -> None:
         """Register a post-processor plugin."""
-        self.post_processors.append(plugin)
-        self.post_processors.sort(key=lambda p: p.priority)
+        self._insert_sorted(self.post_processors, self._processor_keys, plugin, plugin.priority)
         self._plugin_info.append(PluginInfo(
             name=plugin.name,
             type="post_processor",
@@ -294,18 +332,22 @@ class PluginRegistry:
 
     def get_generators_for_family(self, family: ArtifactFamily) -> list[ArtifactGeneratorPlugin]:
         """Get all generators for a specific family."""
-        return [g for g in self.artifact_generators if g.family == family]
+        return self._generators_by_family.get(family, []).copy()
 
 
 # Global registry instance
 _registry: PluginRegistry | None = None
+_builtins_registered = False
 
 
 def get_registry() -> PluginRegistry:
-    """Get the global plugin registry."""
-    global _registry
+    """Get the global plugin registry, registering built-ins on first use."""
+    global _registry, _builtins_registered
     if _registry is None:
         _registry = PluginRegistry()
+        if not _builtins_registered:
+            _builtins_registered = True
+            _register_builtins(_registry)
     return _registry
 
 
@@ -318,20 +360,30 @@ def reset_registry() -> None:
 # --- Plugin Loading ---
 
 
-def load_plugin_from_file(path: Path) -> list[Any]:
-    """
-    Load plugins from a Python file.
+# Executed plugin modules keyed by (resolved path, mtime_ns)
+_module_cache: dict[tuple[str, int], ModuleType] = {}
+
 
-    The file should define classes that extend the plugin base classes.
+def reset_plugin_cache() -> None:
+    """Forget cached plugin modules (mainly for testing)."""
+    _module_cache.clear()
+
+
+def _load_plugin_module(path: Path) -> ModuleType:
+    """
+    Execute a plugin file, reusing the module if the file is unchanged.
 
     Args:
         path: Path to Python file
 
     Returns:
-        List of loaded plugin instances
+        Executed module
     """
-    if not path.exists():
-        raise FileNotFoundError(f"Plugin file not found: {path}")
+    resolved = path.resolve()
+    key = (str(resolved), resolved.stat().st_mtime_ns)
+    module = _module_cache.get(key)
+    if module is not None:
+        return module
 
     spec = importlib.util.spec_from_file_location(path.stem, path)
     if spec is None or spec.loader is None:
@@ -339,33 +391,58 @@ def load_plugin_from_file(path: Path) -> list[Any]:
 
     module = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(module)
+    _module_cache[key] = module
+    return module
+
+
+def load_plugin_from_file(path: Path) -> list[Any]:
+    """
+    Load plugins from a Python file.
+
+    The file should define classes that extend the plugin base classes,
+    optionally listed in a module-level ``__plugins__`` sequence to skip
+    inspecting every attribute.
+    The module is only executed again if the file has changed since it was
+    last loaded; plugin classes are instantiated on every call.
+
+    Args:
+        path: Path to Python file
+
+    Returns:
+        List of loaded plugin instances
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"Plugin file not found: {path}")
+
+    module = _load_plugin_module(path)
 
-    plugins = []
     registry = get_registry()
+    registrars: tuple[tuple[type, Callable[[Any], None]], ...] = (
+        (ArtifactGeneratorPlugin, registry.register_artifact_generator),
+        (SignalDetectorPlugin, registry.register_signal_detector),
+        (SecretPatternPlugin, registry.register_secret_pattern),
+        (PostProcessorPlugin, registry.register_post_processor),
+    )
+
+    # Prefer an explicit export list; otherwise inspect every module attribute
+    candidates = getattr(module, "__plugins__", None)
+    if candidates is None:
+        candidates = [getattr(module, name) for name in dir(module)]
 
-    for name in dir(module):
-        obj = getattr(module, name)
-        if isinstance(obj, type):  # It's a class
-            try:
-                if issubclass(obj, ArtifactGeneratorPlugin) and obj is not ArtifactGeneratorPlugin:
-                    instance = obj()
-                    registry.register_artifact_generator(instance)
-                    plugins.append(instance)
-                elif issubclass(obj, SignalDetectorPlugin) and obj is not SignalDetectorPlugin:
-                    instance = obj()
-                    registry.register_signal_detector(instance)
-                    plugins.append(instance)
-                elif issubclass(obj, SecretPatternPlugin) and obj is not SecretPatternPlugin:
-                    instance = obj()
-                    registry.register_secret_pattern(instance)
-                    plugins.append(instance)
-                elif issubclass(obj, PostProcessorPlugin) and obj is not PostProcessorPlugin:
+    plugins = []
+    for obj in candidates:
+        if not isinstance(obj, type):  # Only classes can be plugins
+            continue
+        for base, register in registrars:
+            if issubclass(obj, base) and obj is not base:
+                try:
                     instance = obj()
-                    registry.register_post_processor(instance)
-                    plugins.append(instance)
-            except TypeError:
-                # Abstract class, skip
-                pass
+                except TypeError:
+                    # Abstract class, skip
+                    break
+                register(instance)
+                plugins.append(instance)
+                break
 
     return plugins
 
@@ -415,23 +492,17 @@ def artifact_generator(
         def my_generator(index, signals, context):
             return "prompt for generation"
     """
+    generator_name, generator_family = name, family
+    generator_description, generator_priority = description, priority
+
     def decorator(func: Callable[[RepoIndex, RepoSignals, str], str]) -> ArtifactGeneratorPlugin:
         class DecoratedGenerator(ArtifactGeneratorPlugin):
-            @property
-            def name(self) -> str:
-                return name
-
-            @property
-            def family(self) -> ArtifactFamily:
-                return family
+            __slots__ = ()
 
-            @property
-            def description(self) -> str:
-                return description
-
-            @property
-            def priority(self) -> int:
-                return priority
+            name = generator_name
+            family = generator_family
+            description = generator_description
+            priority = generator_priority
 
             def should_generate(self, index: RepoIndex, signals: RepoSignals) -> bool:
                 return True  # Override if needed
@@ -460,23 +531,17 @@ def secret_pattern(
         def validate_my_pattern(match):
             return len(match) > 10
     """
+    pattern_name, pattern_regex = name, pattern
+    pattern_description, pattern_severity = description, severity
+
     def decorator(func: Callable[[str], bool] | None = None) -> SecretPatternPlugin:
         class DecoratedPattern(SecretPatternPlugin):
-            @property
-            def name(self) -> str:
-                return name
+            __slots__ = ()
 
-            @property
-            def pattern(self) -> str:
-                return pattern
-
-            @property
-            def description(self) -> str:
-                return description
-
-            @property
-            def severity(self) -> str:
-                return severity
+            name = pattern_name
+            pattern = pattern_regex
+            description = pattern_description
+            severity = pattern_severity
 
             def validate_match(self, match: str) -> bool:
                 if func is not None:
@@ -499,21 +564,12 @@ def secret_pattern(
 class ArchitectureDocGenerator(ArtifactGeneratorPlugin):
     """Example built-in generator for architecture documentation."""
 
-    @property
-    def name(self) -> str:
-        return "architecture-doc"
+    __slots__ = ()
 
-    @property
-    def family(self) -> ArtifactFamily:
-        return ArtifactFamily.DOCS
-
-    @property
-    def description(self) -> str:
-        return "Generates architecture overview documentation"
-
-    @property
-    def priority(self) -> int:
-        return 10
+    name = "architecture-doc"
+    family = ArtifactFamily.DOCS
+    description = "Generates architecture overview documentation"
+    priority = 10
 
     def should_generate(self, index: RepoIndex, signals: RepoSignals) -> bool:
         # Generate for larger projects
@@ -539,12 +595,8 @@ Context:
 Output the document in Markdown format."""
 
 
-# Register built-in plugins on import
-def _register_builtins() -> None:
+# Built-in plugins are registered by the first get_registry() call rather
+# than on import, so importing this module stays cheap
+def _register_builtins(registry: PluginRegistry) -> None:
     """Register built-in plugins."""
-    registry = get_registry()
     registry.register_artifact_generator(ArchitectureDocGenerator())
-
-
-# Auto-register builtins
-_register_builtins()
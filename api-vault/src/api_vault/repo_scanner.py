@@ -7,28 +7,82 @@ computing hashes, detecting file types, and collecting metrics.
 
 import fnmatch
 import hashlib
+import heapq
+import mmap
 import os
+import re
+import stat
 import subprocess
-from collections.abc import Callable
+import sys
+from collections import deque
+from collections.abc import Callable, Collection, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
 from api_vault.schemas import FileEntry, RepoIndex, ScanConfig
 
+# Upper bound on threads used to hash files during a scan
+SCAN_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Files larger than this are hashed through a read-only mmap instead of reads
+MMAP_MIN_BYTES = 1 << 20
+
+# Bytes read from each end of a file for a partial (head + tail) digest
+PARTIAL_HASH_BYTES = 64 * 1024
+
+# Bytes treated as printable by the binary heuristic (tab, LF, CR and >= 0x20)
+_PRINTABLE_BYTES = bytes(b for b in range(256) if b >= 32 or b in (9, 10, 13))
+
 
 def compute_sha256(file_path: Path) -> str:
     """Compute SHA-256 hash of a file."""
-    sha256_hash = hashlib.sha256()
     try:
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                sha256_hash.update(chunk)
-        return sha256_hash.hexdigest()
+            if os.fstat(f.fileno()).st_size > MMAP_MIN_BYTES:
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        return hashlib.sha256(mm).hexdigest()
+                except (OSError, ValueError):
+                    pass  # Not mappable; fall back to reading
+            return hashlib.file_digest(f, "sha256").hexdigest()
     except (OSError, IOError):
         return "0" * 64  # Return empty hash on read error
 
 
+def _head_tail_digest(f: BinaryIO, size: int, head_tail: int) -> tuple[str, bytes]:
+    """Digest the first and last head_tail bytes of an open file plus its size."""
+    head = f.read(head_tail)
+    f.seek(max(size - head_tail, 0))
+    tail = f.read(head_tail)
+    return hashlib.sha256(head + str(size).encode() + tail).hexdigest(), head
+
+
+def compute_partial_sha256(file_path: Path, size: int, head_tail: int = PARTIAL_HASH_BYTES) -> str:
+    """
+    Compute a cheap signature of a large file from its ends and size.
+
+    The SHA-256 covers the first and last head_tail bytes and the decimal
+    size, so it changes on most edits without reading the whole file. It
+    is not a hash of the full contents.
+
+    Args:
+        file_path: Path to file
+        size: File size in bytes
+        head_tail: Bytes to read from each end of the file
+
+    Returns:
+        Hex digest, or all zeros on read error
+    """
+    try:
+        with open(file_path, "rb") as f:
+            return _head_tail_digest(f, size, head_tail)[0]
+    except OSError:
+        return "0" * 64
+
+
 def is_binary_file(file_path: Path, sample_size: int = 8192) -> bool:
     """
     Detect if a file is binary by checking for null bytes.
@@ -42,19 +96,69 @@ def is_binary_file(file_path: Path, sample_size: int = 8192) -> bool:
     """
     try:
         with open(file_path, "rb") as f:
-            sample = f.read(sample_size)
-            # Check for null bytes (common in binary files)
-            if b"\x00" in sample:
-                return True
-            # Check for high ratio of non-printable characters
-            non_printable = sum(1 for b in sample if b < 32 and b not in (9, 10, 13))
-            if len(sample) > 0 and non_printable / len(sample) > 0.3:
-                return True
-            return False
+            return _looks_binary(f.read(sample_size))
     except (OSError, IOError):
         return True  # Assume binary on read error
 
 
+def _looks_binary(sample: bytes) -> bool:
+    """Binary heuristic over a leading sample of a file."""
+    # Check for null bytes (common in binary files)
+    if b"\x00" in sample:
+        return True
+    # Check for high ratio of non-printable characters: translate() deletes
+    # every printable byte in C, leaving only the non-printable ones
+    non_printable = len(sample.translate(None, _PRINTABLE_BYTES))
+    if len(sample) > 0 and non_printable / len(sample) > 0.3:
+        return True
+    return False
+
+
+def scan_file(
+    file_path: Path | str, sample_size: int = 8192, hash_max_size: int | None = None
+) -> tuple[str, bool, int]:
+    """
+    Hash a file and detect whether it is binary in a single read.
+
+    The leading sample used for binary detection is fed to the hash
+    before hashlib.file_digest streams the rest of the file through it.
+    Files over MMAP_MIN_BYTES are hashed from a read-only mapping instead,
+    and files over hash_max_size get a compute_partial_sha256 signature.
+
+    Args:
+        file_path: Path to file
+        sample_size: Number of leading bytes to sample for binary detection
+        hash_max_size: Largest file to hash in full, or None for no limit
+
+    Returns:
+        Tuple of (sha256_hex, is_binary, bytes_read); on read error the
+        hash is all zeros and the file is treated as binary
+    """
+    sha256_hash = hashlib.sha256()
+    try:
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if hash_max_size is not None and size > hash_max_size:
+                digest, head = _head_tail_digest(f, size, max(PARTIAL_HASH_BYTES, sample_size))
+                return digest, _looks_binary(head[:sample_size]), size
+            if size > MMAP_MIN_BYTES:
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        sha256_hash.update(mm)
+                        return sha256_hash.hexdigest(), _looks_binary(mm[:sample_size]), len(mm)
+                except (OSError, ValueError):
+                    pass  # Not mappable; fall back to reading
+            head = f.read(sample_size)
+            is_binary = _looks_binary(head)
+            sha256_hash.update(head)
+            # Stream the remainder into the same hash object
+            hashlib.file_digest(f, lambda: sha256_hash)
+            size = f.tell()
+        return sha256_hash.hexdigest(), is_binary, size
+    except OSError:
+        return "0" * 64, True, 0
+
+
 def should_exclude_path(path: Path, excluded_dirs: list[str], repo_root: Path) -> bool:
     """
     Check if a path should be excluded based on patterns.
@@ -68,21 +172,18 @@ def should_exclude_path(path: Path, excluded_dirs: list[str], repo_root: Path) -
         True if path should be excluded
     """
     rel_path = path.relative_to(repo_root) if path.is_absolute() else path
-
-    for part in rel_path.parts:
-        for pattern in excluded_dirs:
-            if fnmatch.fnmatch(part, pattern):
-                return True
-    return False
+    exclude_re = _compile_path_excludes(tuple(excluded_dirs))
+    return exclude_re is not None and exclude_re.search(rel_path.as_posix()) is not None
 
 
-def should_exclude_file(file_path: Path, excluded_extensions: list[str]) -> bool:
+def should_exclude_file(file_path: Path, excluded_extensions: Collection[str]) -> bool:
     """
     Check if a file should be excluded based on extension.
 
     Args:
         file_path: Path to file
-        excluded_extensions: List of extensions to exclude
+        excluded_extensions: Extensions to exclude; pass a set when
+            checking many files
 
     Returns:
         True if file should be excluded
@@ -91,6 +192,88 @@ def should_exclude_file(file_path: Path, excluded_extensions: list[str]) -> bool
     return ext in excluded_extensions
 
 
+def _compile_globs(patterns: list[str]) -> re.Pattern[str] | None:
+    """
+    Compile glob patterns into one regex with fnmatch semantics.
+
+    Match against os.path.normcase(name), as fnmatch.fnmatch does.
+
+    Args:
+        patterns: Glob patterns
+
+    Returns:
+        Compiled alternation, or None if there are no patterns
+    """
+    if not patterns:
+        return None
+    return re.compile(
+        "|".join(fnmatch.translate(os.path.normcase(p)) for p in patterns)
+    )
+
+
+def _glob_component_regex(pattern: str) -> str:
+    """
+    Translate a glob to a regex that matches within one path component.
+
+    Follows fnmatch syntax, except that wildcards never match "/".
+
+    Args:
+        pattern: Glob pattern for a single file or directory name
+
+    Returns:
+        Unanchored regex source
+    """
+    i, n = 0, len(pattern)
+    res: list[str] = []
+    while i < n:
+        c = pattern[i]
+        i += 1
+        if c == "*":
+            res.append("[^/]*")
+        elif c == "?":
+            res.append("[^/]")
+        elif c == "[":
+            j = i
+            if j < n and pattern[j] == "!":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 1
+            if j >= n:
+                res.append("\\[")
+                continue
+            # Let fnmatch translate the bracket expression itself (ranges,
+            # negation, escaping) and unwrap it from its "(?s:...)\Z"
+            translated = fnmatch.translate(pattern[i - 1 : j + 1])
+            i = j + 1
+            res.append("(?!/)" + translated[translated.index(":") + 1 : translated.rindex(")")])
+        else:
+            res.append(re.escape(c))
+    return "".join(res)
+
+
+@lru_cache(maxsize=32)
+def _compile_path_excludes(patterns: tuple[str, ...]) -> re.Pattern[str] | None:
+    """
+    Compile excluded_dirs globs into one regex over "/"-separated paths.
+
+    The regex finds any path component that matches one of the patterns,
+    with the same case sensitivity as fnmatch.fnmatch on this platform.
+
+    Args:
+        patterns: Glob patterns for directory names
+
+    Returns:
+        Compiled regex to use with search(), or None if there are no patterns
+    """
+    if not patterns:
+        return None
+    alternation = "|".join(_glob_component_regex(p) for p in patterns)
+    flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+    return re.compile(f"(?:^|/)(?:{alternation})(?:/|$)", flags)
+
+
 def get_git_info(repo_path: Path) -> tuple[str | None, str | None]:
     """
     Get git commit hash and branch name.
@@ -104,33 +287,308 @@ def get_git_info(repo_path: Path) -> tuple[str | None, str | None]:
     commit_hash = None
     branch_name = None
 
+    # One rev-parse call prints the commit hash and branch on separate lines
     try:
         result = subprocess.run(
-            ["git", "rev-parse", "HEAD"],
+            ["git", "rev-parse", "HEAD", "--abbrev-ref", "HEAD"],
             cwd=repo_path,
             capture_output=True,
             text=True,
             timeout=10,
         )
         if result.returncode == 0:
-            commit_hash = result.stdout.strip()
+            lines = result.stdout.strip().splitlines()
+            if len(lines) >= 2:
+                commit_hash, branch_name = lines[0].strip(), lines[1].strip()
     except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
         pass
 
+    return commit_hash, branch_name
+
+
+def _list_files_git(repo_path: Path) -> list[str] | None:
+    """
+    List tracked and untracked, non-ignored files using git.
+
+    Only used when repo_path is the top level of its work tree: a
+    directory inside an enclosing repository may be ignored by that
+    repository as a whole, and would list as empty.
+
+    Args:
+        repo_path: Path to repository
+
+    Returns:
+        Paths relative to repo_path in git's order, or None if repo_path
+        is not the top of a git work tree, nothing is listed, or git is
+        unavailable
+    """
     try:
-        result = subprocess.run(
-            ["git", "rev-parse", "--abbrev-ref", "HEAD"],
+        toplevel = subprocess.run(
+            ["git", "rev-parse", "--show-toplevel"],
             cwd=repo_path,
             capture_output=True,
-            text=True,
             timeout=10,
         )
-        if result.returncode == 0:
-            branch_name = result.stdout.strip()
+        if toplevel.returncode != 0:
+            return None
+        top = Path(os.fsdecode(toplevel.stdout.strip()))
+        if top.resolve() != repo_path.resolve():
+            return None
+
+        result = subprocess.run(
+            ["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+            cwd=repo_path,
+            capture_output=True,
+            timeout=60,
+        )
     except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        return None
+    if result.returncode != 0:
+        return None
+    files = [os.fsdecode(p) for p in result.stdout.split(b"\x00") if p]
+    return files or None
+
+
+def _suffix(name: str) -> str:
+    """Path(name).suffix for a bare file name, without building a Path."""
+    i = name.rfind(".")
+    return name[i:] if 0 < i < len(name) - 1 else ""
+
+
+def _scan_dir(
+    top: str,
+    prefix_len: int,
+    excluded_dir_re: re.Pattern[str] | None,
+    excluded_exts: frozenset[str],
+    files: list[tuple[str, str, os.stat_result]],
+) -> list[str]:
+    """
+    List one directory, appending its files and returning its subdirectories.
+
+    Args:
+        top: Directory to list
+        prefix_len: Length of the repository root prefix to strip from paths
+        excluded_dir_re: Compiled excluded_dirs globs, matched against names
+        excluded_exts: Lowercased file extensions (with dot) to skip
+        files: List receiving (absolute_path, relative_path, stat_result)
+
+    Returns:
+        Subdirectories to descend into, in directory order
+    """
+    normcase = os.path.normcase
+    subdirs: list[str] = []
+    try:
+        with os.scandir(top) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        if not entry.is_symlink() and (
+                            excluded_dir_re is None
+                            or not excluded_dir_re.match(normcase(entry.name))
+                        ):
+                            subdirs.append(entry.path)
+                    elif entry.is_file():
+                        if _suffix(entry.name).lower() not in excluded_exts:
+                            path = entry.path
+                            files.append((path, path[prefix_len:], entry.stat()))
+                except OSError:
+                    continue
+    except OSError:
         pass
+    return subdirs
 
-    return commit_hash, branch_name
+
+def _walk_files(
+    root: Path,
+    excluded_dir_re: re.Pattern[str] | None,
+    excluded_exts: frozenset[str],
+    start: str | None = None,
+) -> Iterator[tuple[str, str, os.stat_result]]:
+    """
+    Walk a directory tree with os.scandir, yielding files with their stat.
+
+    Files come out in os.walk order (each directory's files, then its
+    subdirectories). Symlinked directories are not followed, and
+    unreadable directories and files are skipped.
+
+    Args:
+        root: Repository root that relative paths are taken from
+        excluded_dir_re: Compiled excluded_dirs globs, matched against names
+        excluded_exts: Lowercased file extensions (with dot) to skip
+        start: Directory under root to walk instead of root itself
+
+    Yields:
+        Tuples of (absolute_path, relative_path, stat_result) as strings
+    """
+    prefix_len = len(os.path.join(str(root), ""))
+    stack = [start if start is not None else str(root)]
+    files: list[tuple[str, str, os.stat_result]] = []
+    while stack:
+        subdirs = _scan_dir(stack.pop(), prefix_len, excluded_dir_re, excluded_exts, files)
+        yield from files
+        files.clear()
+        stack.extend(reversed(subdirs))
+
+
+def _walk_files_parallel(
+    executor: ThreadPoolExecutor,
+    root: Path,
+    excluded_dir_re: re.Pattern[str] | None,
+    excluded_exts: frozenset[str],
+) -> list[tuple[str, str, os.stat_result]]:
+    """
+    Walk each top-level subdirectory on the executor, in _walk_files order.
+
+    Args:
+        executor: Executor to run subtree walks on
+        root: Repository root
+        excluded_dir_re: Compiled excluded_dirs globs, matched against names
+        excluded_exts: Lowercased file extensions (with dot) to skip
+
+    Returns:
+        Tuples of (absolute_path, relative_path, stat_result)
+    """
+    files: list[tuple[str, str, os.stat_result]] = []
+    prefix_len = len(os.path.join(str(root), ""))
+    subdirs = _scan_dir(str(root), prefix_len, excluded_dir_re, excluded_exts, files)
+    futures = [
+        executor.submit(lambda d: list(_walk_files(root, excluded_dir_re, excluded_exts, d)), d)
+        for d in subdirs
+    ]
+    for future in futures:
+        files.extend(future.result())
+    return files
+
+
+# FileEntry state is set with object's own methods, as model_construct does
+_FILE_ENTRY_FIELDS = tuple(FileEntry.model_fields)
+_object_new = object.__new__
+_object_setattr = object.__setattr__
+
+
+def _new_file_entry(
+    path: str,
+    size_bytes: int,
+    sha256: str,
+    hash_partial: bool,
+    is_binary: bool,
+    extension: str,
+    last_modified: datetime,
+) -> FileEntry:
+    """
+    Build a FileEntry from final values, as model_construct would.
+
+    model_construct resolves aliases and defaults field by field; every
+    field is supplied here, so the instance state is set directly. This
+    is the per-file hot path of a scan.
+
+    Returns:
+        FileEntry equal to FileEntry.model_construct() with the same values
+    """
+    entry = _object_new(FileEntry)
+    _object_setattr(
+        entry,
+        "__dict__",
+        {
+            "path": path,
+            "size_bytes": size_bytes,
+            "sha256": sha256,
+            "hash_partial": hash_partial,
+            "is_binary": is_binary,
+            "extension": extension,
+            "last_modified": last_modified,
+        },
+    )
+    _object_setattr(entry, "__pydantic_fields_set__", set(_FILE_ENTRY_FIELDS))
+    _object_setattr(entry, "__pydantic_extra__", None)
+    _object_setattr(entry, "__pydantic_private__", None)
+    return entry
+
+
+def _scan_file(
+    file_path: str,
+    rel_path: str,
+    config: ScanConfig,
+    stat_info: os.stat_result | None = None,
+) -> FileEntry | None:
+    """
+    Build the index entry for a single file.
+
+    Args:
+        file_path: Absolute path to the file
+        rel_path: Path relative to the repository root
+        config: Scanning configuration
+        stat_info: Stat result from the directory walk, if already known
+
+    Returns:
+        FileEntry, or None if the file is too large or unreadable
+    """
+    try:
+        if stat_info is None:
+            stat_info = os.stat(file_path)
+        file_size = stat_info.st_size
+
+        # Skip directories (e.g. git submodules) and special files
+        if not stat.S_ISREG(stat_info.st_mode):
+            return None
+
+        # Skip files larger than max size
+        if file_size > config.max_file_size_bytes:
+            return None
+
+        # Hash and check if binary in one pass over the file; files over
+        # hash_max_size_bytes (if set) only get a head/tail signature
+        hash_partial = (
+            config.hash_max_size_bytes is not None and file_size > config.hash_max_size_bytes
+        )
+        file_hash, is_binary, _ = scan_file(file_path, hash_max_size=config.hash_max_size_bytes)
+
+        # Get extension; interned so the index holds one string per
+        # distinct extension instead of one per file
+        extension = sys.intern(_suffix(os.path.basename(file_path)).lstrip(".").lower())
+
+        # Get modification time
+        mtime = datetime.fromtimestamp(stat_info.st_mtime)
+
+        # Every field is produced here with its final type (sha256 is a
+        # lowercase hexdigest), so skip per-file validation
+        return _new_file_entry(
+            rel_path, file_size, file_hash, hash_partial, is_binary, extension, mtime
+        )
+
+    except (OSError, IOError, PermissionError):
+        # Skip files we can't access
+        return None
+
+
+def _iter_entries(
+    executor: ThreadPoolExecutor,
+    candidates: list[tuple[str, str, os.stat_result | None]],
+    config: ScanConfig,
+    window: int,
+) -> Iterator[FileEntry | None]:
+    """
+    Scan candidate files on an executor, yielding results in input order.
+
+    At most `window` files are in flight at once, so pending futures stay
+    bounded however large the repository is.
+
+    Args:
+        executor: Executor running _scan_file
+        candidates: Tuples of (absolute_path, relative_path, stat_result or None)
+        config: Scanning configuration
+        window: Maximum number of outstanding files
+
+    Yields:
+        FileEntry, or None for skipped files, per candidate
+    """
+    pending: deque[Future[FileEntry | None]] = deque()
+    for file_path, rel_path, stat_info in candidates:
+        if len(pending) >= window:
+            yield pending.popleft().result()
+        pending.append(executor.submit(_scan_file, file_path, rel_path, config, stat_info))
+    while pending:
+        yield pending.popleft().result()
 
 
 def scan_repository(
@@ -164,68 +622,60 @@ def scan_repository(
     # Get git info
     commit_hash, branch_name = get_git_info(repo_path)
 
-    # Collect all files first for progress tracking
-    all_files: list[Path] = []
-    for root, dirs, filenames in os.walk(repo_path):
-        root_path = Path(root)
-
-        # Filter out excluded directories in-place
-        dirs[:] = [
-            d
-            for d in dirs
-            if not should_exclude_path(root_path / d, config.excluded_dirs, repo_path)
-        ]
-
-        for filename in filenames:
-            file_path = root_path / filename
-            if not should_exclude_file(file_path, config.excluded_extensions):
-                all_files.append(file_path)
-
-    total_files = len(all_files)
-
-    for idx, file_path in enumerate(all_files):
-        if progress_callback:
-            progress_callback(idx + 1, total_files, str(file_path.relative_to(repo_path)))
-
-        try:
-            stat_info = file_path.stat()
-            file_size = stat_info.st_size
-
-            # Skip files larger than max size
-            if file_size > config.max_file_size_bytes:
+    # Compile exclusions once per scan
+    excluded_dir_re = _compile_globs(config.excluded_dirs)
+    excluded_exts = frozenset(config.excluded_extensions)
+
+    # Collect all files first for progress tracking. The walk stats each
+    # file as it goes; git listings are stat'ed by the hashing workers.
+    # Paths stay plain strings until they land in a FileEntry.
+    all_files: list[tuple[str, str, os.stat_result | None]] = []
+    git_files = _list_files_git(repo_path) if config.respect_gitignore else None
+    if git_files is not None:
+        # git already skips ignored files and .git itself without walking
+        # them; excluded_dirs still apply to tracked directories, checked
+        # with one regex search per distinct parent directory
+        exclude_re = _compile_path_excludes(tuple(config.excluded_dirs))
+        dir_excluded: dict[str, bool] = {"": False}
+        root = str(repo_path)
+        for rel in git_files:
+            parent, _, name = rel.rpartition("/")
+            excluded = dir_excluded.get(parent)
+            if excluded is None:
+                excluded = exclude_re is not None and exclude_re.search(parent) is not None
+                dir_excluded[parent] = excluded
+            if excluded:
                 continue
-
-            # Get relative path
-            rel_path = str(file_path.relative_to(repo_path))
-
-            # Compute hash
-            file_hash = compute_sha256(file_path)
-
-            # Check if binary
-            is_binary = is_binary_file(file_path)
-
-            # Get extension
-            extension = file_path.suffix.lstrip(".").lower() if file_path.suffix else ""
-
-            # Get modification time
-            mtime = datetime.fromtimestamp(stat_info.st_mtime)
-
-            entry = FileEntry(
-                path=rel_path,
-                size_bytes=file_size,
-                sha256=file_hash,
-                is_binary=is_binary,
-                extension=extension,
-                last_modified=mtime,
+            if _suffix(name).lower() not in excluded_exts:
+                if os.sep != "/":
+                    rel = rel.replace("/", os.sep)
+                all_files.append((os.path.join(root, rel), rel, None))
+    elif not config.parallel_scan:
+        # Parent directories have already passed the filter when the walk
+        # descends, so only each new directory name needs checking
+        # (equivalent to should_exclude_path)
+        all_files.extend(_walk_files(repo_path, excluded_dir_re, excluded_exts))
+
+    # Hash and sniff files on a thread pool; the work is I/O bound and
+    # hashlib releases the GIL. Entries stream back in walk order and are
+    # appended as they arrive rather than collected into a second list.
+    # With parallel_scan, the same pool first walks top-level subtrees.
+    with ThreadPoolExecutor(max_workers=SCAN_MAX_WORKERS) as executor:
+        if git_files is None and config.parallel_scan:
+            all_files.extend(
+                _walk_files_parallel(executor, repo_path, excluded_dir_re, excluded_exts)
             )
-            files.append(entry)
-            total_size += file_size
 
-        except (OSError, IOError, PermissionError):
-            # Skip files we can't access
-            continue
+        total_files = len(all_files)
+        results = _iter_entries(executor, all_files, config, SCAN_MAX_WORKERS * 4)
+        for done, ((_, rel, _), entry) in enumerate(zip(all_files, results, strict=True), start=1):
+            if entry is not None:
+                files.append(entry)
+                total_size += entry.size_bytes
+            if progress_callback:
+                progress_callback(done, total_files, rel)
 
-    return RepoIndex(
+    return RepoIndex.model_construct(
         repo_path=str(repo_path),
         repo_name=repo_path.name,
         scan_timestamp=datetime.utcnow(),
@@ -238,6 +688,40 @@ def scan_repository(
     )
 
 
+def write_index(index: RepoIndex, path: Path, batch_size: int = 1024) -> None:
+    """
+    Write a repository index as JSON without building one document string.
+
+    The top-level fields are written first, then the files one compact
+    entry per line in batches, so peak memory is bounded by the batch
+    rather than the whole index. The result is an ordinary JSON document
+    that RepoIndex.model_validate_json reads back unchanged. It goes to a
+    temporary file first and is renamed into place.
+
+    Args:
+        index: Repository index to write
+        path: Destination file
+        batch_size: Number of file entries serialized per write
+    """
+    # exclude= drops "files" from the header; its closing "\n}" is
+    # replaced so the files array can be appended as the last key
+    header = index.model_dump_json(indent=2, exclude={"files"})
+    to_json = FileEntry.__pydantic_serializer__.to_json
+    files = index.files
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(header[:-2].encode("utf-8"))
+            f.write(b',\n  "files": [')
+            for start in range(0, len(files), batch_size):
+                f.write(b",\n    " if start else b"\n    ")
+                f.write(b",\n    ".join([to_json(entry) for entry in files[start : start + batch_size]]))
+            f.write(b"\n  ]\n}" if files else b"]\n}")
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
 def get_file_content(
     repo_path: Path,
     file_entry: FileEntry,
@@ -295,8 +779,17 @@ def get_files_by_extension(index: RepoIndex, extensions: list[str]) -> list[File
     Returns:
         List of matching FileEntry objects
     """
-    extensions_lower = [ext.lower().lstrip(".") for ext in extensions]
-    return [f for f in index.files if f.extension in extensions_lower]
+    by_extension = index.extension_positions()
+    buckets = [
+        by_extension[ext]
+        for ext in dict.fromkeys(ext.lower().lstrip(".") for ext in extensions)
+        if ext in by_extension
+    ]
+    files = index.files
+    if len(buckets) == 1:
+        return [files[i] for i in buckets[0]]
+    # Keep index order across extensions
+    return [files[i] for i in heapq.merge(*buckets)]
 
 
 def get_files_by_pattern(index: RepoIndex, pattern: str) -> list[FileEntry]:
@@ -310,7 +803,34 @@ def get_files_by_pattern(index: RepoIndex, pattern: str) -> list[FileEntry]:
     Returns:
         List of matching FileEntry objects
     """
-    return [f for f in index.files if fnmatch.fnmatch(f.path, pattern)]
+    match = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+    normcase = os.path.normcase
+    return [f for f in index.files if match(normcase(f.path))]
+
+
+# Names of commonly important files, checked in order, per file type
+_KEY_FILE_PATTERNS: dict[str, list[str]] = {
+    "readme": ["README.md", "README.rst", "README.txt", "README", "readme.md"],
+    "license": ["LICENSE", "LICENSE.md", "LICENSE.txt", "LICENCE", "COPYING"],
+    "contributing": ["CONTRIBUTING.md", "CONTRIBUTING.rst", "CONTRIBUTING"],
+    "changelog": ["CHANGELOG.md", "CHANGELOG", "HISTORY.md", "NEWS.md", "CHANGES.md"],
+    "security": ["SECURITY.md", "SECURITY"],
+    "package_json": ["package.json"],
+    "pyproject": ["pyproject.toml"],
+    "setup_py": ["setup.py"],
+    "cargo_toml": ["Cargo.toml"],
+    "go_mod": ["go.mod"],
+    "dockerfile": ["Dockerfile", "dockerfile"],
+    "docker_compose": ["docker-compose.yml", "docker-compose.yaml", "compose.yml"],
+    "makefile": ["Makefile", "makefile"],
+    "gitignore": [".gitignore"],
+    "env_example": [".env.example", ".env.sample", "env.example"],
+}
+
+# Lowercased lookup names for get_key_files, in priority order
+_KEY_FILE_NAMES: dict[str, tuple[str, ...]] = {
+    key: tuple(p.lower() for p in patterns) for key, patterns in _KEY_FILE_PATTERNS.items()
+}
 
 
 def get_key_files(index: RepoIndex) -> dict[str, FileEntry | None]:
@@ -323,39 +843,17 @@ def get_key_files(index: RepoIndex) -> dict[str, FileEntry | None]:
     Returns:
         Dict mapping file type to FileEntry or None
     """
-    key_patterns = {
-        "readme": ["README.md", "README.rst", "README.txt", "README", "readme.md"],
-        "license": ["LICENSE", "LICENSE.md", "LICENSE.txt", "LICENCE", "COPYING"],
-        "contributing": ["CONTRIBUTING.md", "CONTRIBUTING.rst", "CONTRIBUTING"],
-        "changelog": ["CHANGELOG.md", "CHANGELOG", "HISTORY.md", "NEWS.md", "CHANGES.md"],
-        "security": ["SECURITY.md", "SECURITY"],
-        "package_json": ["package.json"],
-        "pyproject": ["pyproject.toml"],
-        "setup_py": ["setup.py"],
-        "cargo_toml": ["Cargo.toml"],
-        "go_mod": ["go.mod"],
-        "dockerfile": ["Dockerfile", "dockerfile"],
-        "docker_compose": ["docker-compose.yml", "docker-compose.yaml", "compose.yml"],
-        "makefile": ["Makefile", "makefile"],
-        "gitignore": [".gitignore"],
-        "env_example": [".env.example", ".env.sample", "env.example"],
-    }
+    # Key files live in the repo root; index root files by lowercased name
+    # once (first entry wins, as in index order) so each lookup is O(1)
+    root_files: dict[str, FileEntry] = {}
+    for file_entry in index.files:
+        path = file_entry.path
+        if "/" not in path and "\\" not in path:
+            root_files.setdefault(path.lower(), file_entry)
 
     result: dict[str, FileEntry | None] = {}
 
-    for key, patterns in key_patterns.items():
-        result[key] = None
-        for pattern in patterns:
-            for file_entry in index.files:
-                # Check exact match or case-insensitive match
-                if file_entry.path == pattern or file_entry.path.lower() == pattern.lower():
-                    result[key] = file_entry
-                    break
-                # Also check if it's in the root directory with different path separator
-                if file_entry.path.replace("\\", "/") == pattern:
-                    result[key] = file_entry
-                    break
-            if result[key] is not None:
-                break
+    for key, names in _KEY_FILE_NAMES.items():
+        result[key] = next((root_files[n] for n in names if n in root_files), None)
 
     return result
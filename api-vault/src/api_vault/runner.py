@@ -10,15 +10,27 @@ Executes artifact generation plans, managing:
 import hashlib
 import json
 import logging
+import os
+import threading
+import time
 import uuid
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import zlib
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
-from collections.abc import Callable
+from types import MappingProxyType
+from collections.abc import Callable, Generator, Mapping
 from typing import Any, Protocol
 
-from api_vault.context_packager import build_base_context, build_full_context, package_context
+from api_vault.context_packager import (
+    BASE_CONTEXT_KEY_FILES,
+    ExcerptCache,
+    build_base_context,
+    package_context,
+)
 from api_vault.schemas import (
     ArtifactMeta,
+    ContextRef,
     JobResult,
     Plan,
     PlanJob,
@@ -29,8 +41,31 @@ from api_vault.schemas import (
 )
 from api_vault.templates import render_prompt
 
+try:
+    import blake3
+except ImportError:
+    blake3 = None  # type: ignore[assignment, unused-ignore]
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
+# Content-defined chunking for context fingerprints: a line ends a chunk
+# when the low 6 bits of its CRC-32 are zero (~64 lines, a few KiB), and
+# chunks are capped so long unbroken text still splits
+CDC_BOUNDARY_MASK = 0x3F
+CDC_MAX_CHUNK_CHARS = 8192
+
+# Characters of context encoded and hashed at a time
+HASH_SLICE_CHARS = 64 * 1024
+
+# Algorithm for new context hashes; BLAKE3 is much faster on long contexts
+# and the hash is only an identity key, so sha256 is just the fallback
+CONTEXT_HASH_ALGORITHM = "blake3" if blake3 is not None else "sha256"
+
 
 class GenerationClient(Protocol):
     """Protocol for generation clients."""
@@ -53,16 +88,220 @@ class GenerationClient(Protocol):
         max_tokens: int,
         temperature: float,
         use_local_cache: bool,
+        cached_artifact_excerpts: str | None = None,
     ) -> Any:
         ...
 
+    def stream_with_cached_context(
+        self,
+        cached_context: str,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int,
+        temperature: float,
+        use_local_cache: bool,
+        cached_artifact_excerpts: str | None = None,
+    ) -> Generator[str, None, Any]:
+        ...
+
     def get_usage_summary(self) -> dict[str, Any]:
         ...
 
 
-def compute_context_hash(context: str) -> str:
+def _new_context_hasher(algorithm: str, data: bytes = b"") -> Any:
+    """
+    Create an incremental hasher for context hashing.
+
+    Args:
+        algorithm: "blake3" or "sha256"
+        data: Initial data to hash
+
+    Returns:
+        Hasher with update(), copy() and hexdigest()
+
+    Raises:
+        ValueError: If the algorithm is unknown or not installed
+    """
+    if algorithm == "sha256":
+        return hashlib.sha256(data)
+    if algorithm == "blake3" and blake3 is not None:
+        return blake3.blake3(data)
+    raise ValueError(f"Unsupported context hash algorithm: {algorithm}")
+
+
+def _update_hasher(hasher: Any, text: str) -> None:
+    """
+    Feed text to a hasher as UTF-8 in bounded slices.
+
+    Hashes the same bytes as text.encode() without materializing a full
+    encoded copy of a multi-megabyte context.
+
+    Args:
+        hasher: Hasher from _new_context_hasher
+        text: Text to hash
+    """
+    for start in range(0, len(text), HASH_SLICE_CHARS):
+        hasher.update(text[start : start + HASH_SLICE_CHARS].encode())
+
+
+def compute_context_hash(context: str, algorithm: str = CONTEXT_HASH_ALGORITHM) -> str:
     """Compute hash of context for caching."""
-    return hashlib.sha256(context.encode()).hexdigest()[:16]
+    hasher = _new_context_hasher(algorithm)
+    _update_hasher(hasher, context)
+    digest: str = hasher.hexdigest()
+    return digest[:16]
+
+
+def compute_context_fingerprint(context: str) -> list[str]:
+    """
+    Split context into content-defined chunks and hash each one.
+
+    A chunk ends after a line whose CRC-32 has its low bits clear (about
+    one line in CDC_BOUNDARY_MASK + 1), or once it exceeds
+    CDC_MAX_CHUNK_CHARS. Boundaries depend only on nearby content, so an
+    edit to one file excerpt changes only the chunks around it.
+
+    Args:
+        context: Context text
+
+    Returns:
+        16-hex-character BLAKE2b digest per chunk, in order
+    """
+    fingerprint: list[str] = []
+    chunk: list[str] = []
+    chunk_chars = 0
+    for line in context.splitlines(keepends=True):
+        chunk.append(line)
+        chunk_chars += len(line)
+        if (
+            zlib.crc32(line.encode()) & CDC_BOUNDARY_MASK == 0
+            or chunk_chars >= CDC_MAX_CHUNK_CHARS
+        ):
+            fingerprint.append(_chunk_digest(chunk))
+            chunk = []
+            chunk_chars = 0
+    if chunk:
+        fingerprint.append(_chunk_digest(chunk))
+    return fingerprint
+
+
+def _chunk_digest(lines: list[str]) -> str:
+    """Digest one fingerprint chunk."""
+    return hashlib.blake2b("".join(lines).encode(), digest_size=8).hexdigest()
+
+
+def fingerprint_overlap(previous: list[str], current: list[str]) -> float:
+    """
+    Fraction of chunks shared by two context fingerprints.
+
+    Args:
+        previous: Fingerprint stored with an existing artifact
+        current: Fingerprint of the current context
+
+    Returns:
+        Shared distinct chunks over the larger number of distinct chunks
+    """
+    previous_set, current_set = set(previous), set(current)
+    largest = max(len(previous_set), len(current_set))
+    if largest == 0:
+        return 1.0
+    return len(previous_set & current_set) / largest
+
+
+def _context_refs_key(
+    context_refs: list[ContextRef],
+) -> tuple[tuple[str, str, int, int, int], ...]:
+    """
+    Build a hashable, orderable key for a job's context references.
+
+    Args:
+        context_refs: Context references for a job
+
+    Returns:
+        Tuple of (file_path, excerpt_type, start_line, end_line, max_bytes)
+        per reference, with missing line bounds as 0
+    """
+    return tuple(
+        (ref.file_path, ref.excerpt_type, ref.start_line or 0, ref.end_line or 0, ref.max_bytes)
+        for ref in context_refs
+    )
+
+
+def order_jobs_for_cache(jobs: list[PlanJob]) -> list[int]:
+    """
+    Order jobs so those sharing context references run back-to-back.
+
+    Anthropic's ephemeral prompt cache expires after five minutes, so jobs
+    with the same artifact excerpts are grouped to hit it while it is warm.
+    Plans that declare job dependencies keep their original order.
+
+    Args:
+        jobs: Jobs in plan order
+
+    Returns:
+        Indices into jobs in execution order
+    """
+    if any(job.dependencies for job in jobs):
+        return list(range(len(jobs)))
+    # Stable sort, so jobs with equal references keep their plan order
+    return sorted(range(len(jobs)), key=lambda i: _context_refs_key(jobs[i].context_refs))
+
+
+def _dumps_json(data: dict[str, Any]) -> bytes:
+    """Serialize to indented UTF-8 JSON, with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, default=str, ensure_ascii=False).encode()
+
+
+def _loads_json(data: bytes) -> Any:
+    """Parse UTF-8 JSON, with orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _read_meta(meta_path: Path) -> dict[str, Any] | None:
+    """
+    Read an artifact metadata file.
+
+    Args:
+        meta_path: Path to a .meta.json file
+
+    Returns:
+        Parsed metadata, or None if it is missing or unreadable
+    """
+    try:
+        meta = _loads_json(meta_path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    return meta if isinstance(meta, dict) else None
+
+
+def _drain_stream(chunks: Generator[str, None, Any], write: Callable[[str], Any]) -> Any:
+    """
+    Pass every chunk of a generation stream to write.
+
+    Args:
+        chunks: Generator yielding text chunks and returning a result
+        write: Callable receiving each chunk
+
+    Returns:
+        The generator's return value
+    """
+    while True:
+        try:
+            chunk = next(chunks)
+        except StopIteration as stop:
+            return stop.value
+        write(chunk)
+
+
+def _write_json_atomic(path: Path, data: dict[str, Any]) -> None:
+    """Write JSON to a temporary file, then rename it over path."""
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.write_bytes(_dumps_json(data))
+    os.replace(tmp_path, path)
 
 
 class Runner:
@@ -70,6 +309,15 @@ class Runner:
     Executes artifact generation plans.
     """
 
+    # Artifact metadata is written in batches of this many jobs, and
+    # whatever is left at the end of a run
+    META_FLUSH_EVERY = 8
+
+    # Share of artifact excerpt chunks that must match an existing
+    # artifact's for it to be reused even though the context hash changed;
+    # the base context must still match exactly (1.0 disables)
+    CONTEXT_REUSE_THRESHOLD = 0.95
+
     def __init__(
         self,
         output_dir: Path,
@@ -78,17 +326,20 @@ class Runner:
         index: RepoIndex,
         signals: RepoSignals,
         config: ScanConfig | None = None,
+        max_concurrency: int = 4,
     ):
         """
         Initialize the runner.
 
         Args:
             output_dir: Directory for output artifacts
-            client: Generation client (Anthropic or mock)
+            client: Generation client (Anthropic or mock); must be thread-safe
+                when max_concurrency is above 1
             repo_path: Path to repository
             index: Repository index
             signals: Extracted signals
             config: Scan configuration
+            max_concurrency: Maximum number of jobs generating at once
         """
         self.output_dir = output_dir
         self.client = client
@@ -96,6 +347,7 @@ class Runner:
         self.index = index
         self.signals = signals
         self.config = config or ScanConfig()
+        self.max_concurrency = max(1, max_concurrency)
 
         # Ensure output directories exist
         self.artifacts_dir = output_dir / "artifacts"
@@ -103,20 +355,73 @@ class Runner:
         self.artifacts_dir.mkdir(parents=True, exist_ok=True)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
-        # Convert signals to dict for context packaging
-        self.signals_dict = (
-            signals.model_dump() if hasattr(signals, "model_dump") else signals.__dict__
+        # Convert signals to a mapping for context packaging once; it is
+        # read-only so callees can share it without defensive copies
+        self.signals_dict: Mapping[str, Any] = MappingProxyType(
+            signals.model_dump() if hasattr(signals, "model_dump") else dict(signals.__dict__)
         )
 
-        # Build base context once for Anthropic prompt caching
-        # This is shared across all artifact generations
-        self.base_context, self.base_context_tokens = build_base_context(
-            repo_path, index, self.signals_dict, config
-        )
-        logger.info(
-            f"Built base context: ~{self.base_context_tokens} tokens "
-            "(will be cached by Anthropic for subsequent requests)"
-        )
+        # Base context for Anthropic prompt caching, shared across all
+        # artifact generations; built on first use, so a run where every
+        # job is skipped never builds it
+        self._base_context: tuple[str, int] | None = None
+        self._base_context_lock = threading.Lock()
+
+        # Paths in the index, and the key files the base context reads
+        self._index_paths = {f.path for f in index.files}
+        self._base_source_paths = [p for p in BASE_CONTEXT_KEY_FILES if p in self._index_paths]
+
+        # Hash of everything a job's context is built from besides file
+        # contents (config, signals, indexed files); each job continues
+        # from a copy with its context refs
+        self._context_inputs_hasher: Any = None
+
+        # Hash the base context once per algorithm; each job's context hash
+        # continues from a copy of this state with only its artifact excerpts
+        self._base_context_hashers: dict[str, Any] = {}
+
+        # Packaged excerpts per distinct set of context refs, shared by the
+        # skip check and generation; cleared at the start of each run
+        self._excerpt_cache: dict[tuple[Any, ...], tuple[str, list[str], int]] = {}
+
+        # Redacted excerpts per file range, shared by jobs whose context refs
+        # overlap without being identical; cleared at the start of each run
+        self._file_excerpt_cache: ExcerptCache = {}
+
+        # Existing artifact metadata by path, loaded at the start of each
+        # run; None outside a run, when the skip check reads from disk
+        self._meta_cache: dict[Path, dict[str, Any]] | None = None
+
+        # Wall-clock time sampled once at the start of a run, with the
+        # monotonic clock reading taken at the same moment
+        self._clock_start: tuple[datetime, int] | None = None
+
+        # Metadata waiting to be written, as (meta_path, meta_dict)
+        self._meta_queue: list[tuple[Path, dict[str, Any]]] = []
+        self._meta_lock = threading.Lock()
+
+    def _get_base_context(self) -> tuple[str, int]:
+        """Build the base context on first use; returns (base_context, estimated_tokens)."""
+        with self._base_context_lock:
+            if self._base_context is None:
+                self._base_context = build_base_context(
+                    self.repo_path, self.index, self.signals_dict, self.config
+                )
+                logger.info(
+                    f"Built base context: ~{self._base_context[1]} tokens "
+                    "(will be cached by Anthropic for subsequent requests)"
+                )
+            return self._base_context
+
+    @property
+    def base_context(self) -> str:
+        """Repository context shared by every job and cached by Anthropic."""
+        return self._get_base_context()[0]
+
+    @property
+    def base_context_tokens(self) -> int:
+        """Estimated token count of the base context."""
+        return self._get_base_context()[1]
 
     def _get_artifact_path(self, job: PlanJob) -> Path:
         """Get full path for artifact output."""
@@ -127,44 +432,250 @@ class Runner:
         artifact_path = self._get_artifact_path(job)
         return artifact_path.with_suffix(".meta.json")
 
-    def _should_skip_job(self, job: PlanJob) -> tuple[bool, str]:
+    def _package_excerpts(self, context_refs: list[ContextRef]) -> tuple[str, list[str], int]:
+        """
+        Package artifact-specific file excerpts, reusing earlier results.
+
+        Args:
+            context_refs: Context references for a job
+
+        Returns:
+            Tuple of (packaged_context, files_used, total_bytes)
+        """
+        key = _context_refs_key(context_refs)
+        packaged = self._excerpt_cache.get(key)
+        if packaged is None:
+            packaged = package_context(
+                self.repo_path, self.index, context_refs, self.config, self._file_excerpt_cache
+            )
+            self._excerpt_cache[key] = packaged
+        return packaged
+
+    def _context_hash(self, artifact_excerpts: str, algorithm: str = CONTEXT_HASH_ALGORITHM) -> str:
+        """
+        Hash the full job context without re-hashing the base context.
+
+        Equal to compute_context_hash of the base context combined with
+        the artifact-specific excerpts, as sent for generation.
+
+        Args:
+            artifact_excerpts: Packaged artifact-specific file excerpts
+            algorithm: Hash algorithm to use
+
+        Returns:
+            Truncated hex digest of the full context
+        """
+        hasher = self._base_context_hasher(algorithm).copy()
+        if artifact_excerpts:
+            hasher.update(b"\n\n## Artifact-Specific Files\n\n")
+            _update_hasher(hasher, artifact_excerpts)
+        digest: str = hasher.hexdigest()
+        return digest[:16]
+
+    def _base_context_hasher(self, algorithm: str) -> Any:
+        """Get a hasher fed with the base context, building it on first use."""
+        base_hasher = self._base_context_hashers.get(algorithm)
+        if base_hasher is None:
+            base_hasher = _new_context_hasher(algorithm)
+            _update_hasher(base_hasher, self.base_context)
+            self._base_context_hashers[algorithm] = base_hasher
+        return base_hasher
+
+    def _base_context_hash(self, algorithm: str = CONTEXT_HASH_ALGORITHM) -> str:
+        """
+        Hash the base context alone.
+
+        Args:
+            algorithm: Hash algorithm to use
+
+        Returns:
+            Truncated hex digest of the base context
+        """
+        digest: str = self._base_context_hasher(algorithm).copy().hexdigest()
+        return digest[:16]
+
+    def _excerpt_fingerprint(self, artifact_excerpts: str) -> list[str]:
+        """
+        Fingerprint the artifact-specific part of a job's context.
+
+        The base context is shared by every job and usually makes up most
+        of the context, so it is compared by hash instead; counting its
+        chunks would let a job whose own excerpts were replaced still look
+        nearly unchanged.
+
+        Args:
+            artifact_excerpts: Packaged artifact-specific file excerpts
+
+        Returns:
+            Chunk digests of the excerpts, as appended to the base context
+        """
+        if not artifact_excerpts:
+            return []
+        return compute_context_fingerprint(
+            f"\n\n## Artifact-Specific Files\n\n{artifact_excerpts}"
+        )
+
+    def _context_inputs_hash(self, context_refs: list[ContextRef]) -> str:
+        """
+        Hash the inputs a job's context is built from, apart from file contents.
+
+        Covers the scan config, signals, every indexed file's path and
+        hash, and the job's context refs, using CONTEXT_HASH_ALGORITHM.
+
+        Args:
+            context_refs: Context references for the job
+
+        Returns:
+            Truncated hex digest of the inputs
+        """
+        base_hasher = self._context_inputs_hasher
+        if base_hasher is None:
+            base_hasher = _new_context_hasher(CONTEXT_HASH_ALGORITHM)
+            _update_hasher(base_hasher, self.config.model_dump_json())
+            _update_hasher(base_hasher, json.dumps(dict(self.signals_dict), sort_keys=True, default=str))
+            _update_hasher(base_hasher, "\n".join(f"{f.path}\0{f.sha256}" for f in self.index.files))
+            self._context_inputs_hasher = base_hasher
+        hasher = base_hasher.copy()
+        _update_hasher(hasher, repr(_context_refs_key(context_refs)))
+        digest: str = hasher.hexdigest()
+        return digest[:16]
+
+    def _context_sources_mtime(self, context_refs: list[ContextRef]) -> int | None:
+        """
+        Get the newest modification time of the files a job's context reads.
+
+        Args:
+            context_refs: Context references for the job
+
+        Returns:
+            Newest st_mtime_ns across the job's referenced files and the base
+            context's key files, or None if any of them cannot be read
+        """
+        paths = self._base_source_paths + [
+            ref.file_path for ref in context_refs if ref.file_path in self._index_paths
+        ]
+        try:
+            return max((os.stat(self.repo_path / path).st_mtime_ns for path in paths), default=0)
+        except OSError:
+            return None
+
+    def _queue_meta(self, meta_path: Path, meta_dict: dict[str, Any]) -> None:
+        """
+        Queue artifact metadata, writing the batch once it is full.
+
+        Args:
+            meta_path: Destination .meta.json path
+            meta_dict: Metadata to serialize
+        """
+        with self._meta_lock:
+            self._meta_queue.append((meta_path, meta_dict))
+            if len(self._meta_queue) < self.META_FLUSH_EVERY:
+                return
+        self._flush_meta()
+
+    def _flush_meta(self) -> None:
+        """Write all queued artifact metadata, each file replaced atomically."""
+        with self._meta_lock:
+            batch, self._meta_queue = self._meta_queue, []
+            for meta_path, meta_dict in batch:
+                try:
+                    _write_json_atomic(meta_path, meta_dict)
+                except OSError as e:
+                    logger.error(f"Failed to write metadata {meta_path}: {e}")
+
+    def _now(self) -> datetime:
+        """
+        Get the current UTC time.
+
+        During a run this is the run's single wall-clock sample advanced by
+        the monotonic clock, so timestamps within a run never go backwards.
+
+        Returns:
+            Timezone-aware UTC datetime
+        """
+        if self._clock_start is None:
+            return datetime.now(UTC)
+        start_wall, start_mono = self._clock_start
+        return start_wall + timedelta(microseconds=(time.monotonic_ns() - start_mono) // 1000)
+
+    def _preload_meta_cache(self) -> None:
+        """Read every artifact metadata file under artifacts_dir in one pass."""
+        meta_paths = list(self.artifacts_dir.rglob("*.meta.json"))
+        with ThreadPoolExecutor() as executor:
+            metas = executor.map(_read_meta, meta_paths)
+            self._meta_cache = {
+                path: meta for path, meta in zip(meta_paths, metas, strict=True) if meta is not None
+            }
+
+    def _load_meta(self, meta_path: Path) -> dict[str, Any] | None:
+        """
+        Get existing metadata for an artifact, preferring the preloaded cache.
+
+        Args:
+            meta_path: Path to the artifact's .meta.json file
+
+        Returns:
+            Parsed metadata, or None if there is none
+        """
+        if self._meta_cache is not None and meta_path.is_relative_to(self.artifacts_dir):
+            return self._meta_cache.get(meta_path)
+        return _read_meta(meta_path)
+
+    def _should_skip_job(self, job: PlanJob, sources_mtime: int | None = None) -> tuple[bool, str]:
         """
         Check if job should be skipped (already completed with same hash).
 
         Args:
             job: Job to check
+            sources_mtime: Newest mtime of the job's context sources, if
+                already taken
 
         Returns:
             Tuple of (should_skip, reason)
         """
-        meta_path = self._get_meta_path(job)
-        if not meta_path.exists():
+        meta = self._load_meta(self._get_meta_path(job))
+        if meta is None:
             return False, ""
 
-        try:
-            with open(meta_path) as f:
-                meta = json.load(f)
-
-            # Check if request hash matches (indicates same input)
-            existing_hash = meta.get("request_hash", "")
-            if existing_hash:
-                # Build context to compare hashes
-                context, _, _ = build_full_context(
-                    self.repo_path,
-                    self.index,
-                    self.signals_dict,
-                    job.context_refs,
-                    self.config,
-                )
-                context_hash = compute_context_hash(context)
-
+        # Check if request hash matches (indicates same input)
+        existing_hash = meta.get("request_hash", "")
+        if existing_hash:
+            # Same inputs and untouched source files mean the same context,
+            # so the context itself need not be rebuilt or hashed
+            if (
+                meta.get("context_hash_algorithm") == CONTEXT_HASH_ALGORITHM
+                and meta.get("context_inputs_hash") == self._context_inputs_hash(job.context_refs)
+            ):
+                if sources_mtime is None:
+                    sources_mtime = self._context_sources_mtime(job.context_refs)
+                if sources_mtime is not None and meta.get("context_sources_mtime_ns") == sources_mtime:
+                    return True, "Artifact exists and its context sources are unchanged"
+
+            # Only the artifact excerpts need rebuilding to compare
+            # hashes; the base context hash is cached
+            artifact_excerpts, _, _ = self._package_excerpts(job.context_refs)
+
+            # Metadata written before BLAKE3 support has no algorithm
+            # and was hashed with sha256
+            algorithm = meta.get("context_hash_algorithm", "sha256")
+            if algorithm in ("sha256", CONTEXT_HASH_ALGORITHM):
+                context_hash = self._context_hash(artifact_excerpts, algorithm)
                 if meta.get("context_hash") == context_hash:
                     return True, "Artifact exists with matching context"
 
-            return False, ""
+            # Otherwise accept an unchanged base context whose artifact
+            # excerpts barely changed
+            previous = meta.get("excerpt_fingerprint")
+            if (
+                previous is not None
+                and algorithm in ("sha256", CONTEXT_HASH_ALGORITHM)
+                and meta.get("base_context_hash") == self._base_context_hash(algorithm)
+            ):
+                overlap = fingerprint_overlap(previous, self._excerpt_fingerprint(artifact_excerpts))
+                if overlap >= self.CONTEXT_REUSE_THRESHOLD:
+                    return True, f"Artifact exists with {overlap:.0%} matching excerpts"
 
-        except (json.JSONDecodeError, OSError):
-            return False, ""
+        return False, ""
 
     def _execute_job(
         self,
@@ -184,11 +695,15 @@ class Runner:
         if progress_callback:
             progress_callback(f"Executing: {job.artifact_name}")
 
+        # Taken before any file is read, so a later edit always shows up as
+        # a newer mtime on the next run
+        sources_mtime = self._context_sources_mtime(job.context_refs)
+
         # Check if should skip
-        should_skip, skip_reason = self._should_skip_job(job)
+        should_skip, skip_reason = self._should_skip_job(job, sources_mtime)
         if should_skip:
             logger.info(f"Skipping {job.artifact_name}: {skip_reason}")
-            return JobResult(
+            return JobResult.model_construct(
                 job_id=job.id,
                 status="skipped",
                 artifact_path=str(self._get_artifact_path(job)),
@@ -199,25 +714,19 @@ class Runner:
         if progress_callback:
             progress_callback(f"Building context for: {job.artifact_name}")
 
-        # Package artifact-specific file excerpts
-        artifact_excerpts, files_used, excerpt_bytes = package_context(
-            self.repo_path,
-            self.index,
-            job.context_refs,
-            self.config,
-        )
+        # Package artifact-specific file excerpts (usually already done by
+        # the skip check)
+        artifact_excerpts, files_used, excerpt_bytes = self._package_excerpts(job.context_refs)
 
-        # Combine base context with artifact-specific excerpts for hash
-        full_context = self.base_context
-        if artifact_excerpts:
-            full_context += f"\n\n## Artifact-Specific Files\n\n{artifact_excerpts}"
-        context_hash = compute_context_hash(full_context)
+        # Hash base context combined with artifact-specific excerpts
+        context_hash = self._context_hash(artifact_excerpts)
+        excerpt_fingerprint = self._excerpt_fingerprint(artifact_excerpts)
 
         # Get prompt template (pass artifact excerpts, not full context)
         prompt_result = render_prompt(job.prompt_template_id, artifact_excerpts or "No additional context files.")
         if prompt_result is None:
             logger.error(f"Unknown prompt template: {job.prompt_template_id}")
-            return JobResult(
+            return JobResult.model_construct(
                 job_id=job.id,
                 status="failed",
                 error_message=f"Unknown prompt template: {job.prompt_template_id}",
@@ -226,22 +735,38 @@ class Runner:
         system_prompt, user_prompt = prompt_result
 
         # Generate artifact using Anthropic prompt caching
-        # The base_context is cached server-side, saving ~90% on repeated input tokens
+        # The base_context is cached server-side, saving ~90% on repeated input tokens;
+        # artifact excerpts get their own breakpoint for jobs sharing the same files
         if progress_callback:
             progress_callback(f"Generating: {job.artifact_name}")
 
-        result = self.client.generate_with_cached_context(
+        chunks = self.client.stream_with_cached_context(
             cached_context=self.base_context,
             system_prompt=system_prompt,
-            user_prompt=user_prompt if not artifact_excerpts else f"{user_prompt}\n\n## Additional Context\n\n{artifact_excerpts}",
+            user_prompt=user_prompt,
             max_tokens=job.max_output_tokens,
             temperature=0.0,
             use_local_cache=True,
+            cached_artifact_excerpts=artifact_excerpts or None,
         )
 
+        # Stream the artifact to a temporary file as text arrives, replacing
+        # the real file only once generation succeeds. Chunks are encoded
+        # here and written in binary mode, skipping the text layer
+        artifact_path = self._get_artifact_path(job)
+        artifact_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = artifact_path.with_name(f"{artifact_path.name}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                result = _drain_stream(chunks, lambda chunk: f.write(chunk.encode("utf-8")))
+            if not result.error:
+                os.replace(tmp_path, artifact_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
         if result.error:
             logger.error(f"Generation failed for {job.artifact_name}: {result.error}")
-            return JobResult(
+            return JobResult.model_construct(
                 job_id=job.id,
                 status="failed",
                 error_message=result.error,
@@ -250,21 +775,15 @@ class Runner:
                 generation_time_seconds=result.generation_time_seconds,
             )
 
-        # Write artifact
-        artifact_path = self._get_artifact_path(job)
-        artifact_path.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(artifact_path, "w", encoding="utf-8") as f:
-            f.write(result.text)
-
-        # Write metadata
-        meta = ArtifactMeta(
-            artifact_id=str(uuid.uuid4()),
+        # Write metadata; every field comes from trusted internal values, so
+        # construct without re-running validation
+        meta = ArtifactMeta.model_construct(
+            artifact_id=uuid.uuid4().hex,
             job_id=job.id,
             family=job.family,
             artifact_name=job.artifact_name,
             output_path=job.output_path,
-            generated_at=datetime.utcnow(),
+            generated_at=self._now(),
             request_hash=result.request_hash,
             model_used=result.model,
             input_tokens=result.input_tokens,
@@ -277,11 +796,15 @@ class Runner:
         # Add context hash to meta for skip detection
         meta_dict = meta.model_dump()
         meta_dict["context_hash"] = context_hash
+        meta_dict["context_hash_algorithm"] = CONTEXT_HASH_ALGORITHM
+        meta_dict["base_context_hash"] = self._base_context_hash()
+        meta_dict["excerpt_fingerprint"] = excerpt_fingerprint
+        meta_dict["context_inputs_hash"] = self._context_inputs_hash(job.context_refs)
+        meta_dict["context_sources_mtime_ns"] = sources_mtime
         meta_dict["generated_at"] = meta_dict["generated_at"].isoformat()
 
         meta_path = self._get_meta_path(job)
-        with open(meta_path, "w") as f:
-            json.dump(meta_dict, f, indent=2, default=str)
+        self._queue_meta(meta_path, meta_dict)
 
         logger.info(
             f"Generated {job.artifact_name}: "
@@ -289,7 +812,7 @@ class Runner:
             f"{result.generation_time_seconds:.2f}s"
         )
 
-        return JobResult(
+        return JobResult.model_construct(
             job_id=job.id,
             status="completed",
             artifact_path=str(artifact_path),
@@ -315,53 +838,85 @@ class Runner:
         Returns:
             Report with execution results
         """
-        started_at = datetime.utcnow()
-        report_id = str(uuid.uuid4())[:8]
+        started_at = datetime.now(UTC)
+        self._clock_start = (started_at, time.monotonic_ns())
+        report_id = uuid.uuid4().hex[:8]
+
+        # Re-read files on each run in case they changed since the last one
+        self._excerpt_cache.clear()
+        self._file_excerpt_cache.clear()
+        self._preload_meta_cache()
 
-        job_results: list[JobResult] = []
         artifacts_generated: list[str] = []
         errors: list[str] = []
 
         total_jobs = len(plan.jobs)
 
-        for idx, job in enumerate(plan.jobs, 1):
+        # Jobs run on worker threads, so serialize progress reporting
+        progress_lock = threading.Lock()
+
+        def report_progress(message: str) -> None:
             if progress_callback:
-                progress_callback(f"Job {idx}/{total_jobs}: {job.artifact_name}")
+                with progress_lock:
+                    progress_callback(message)
 
+        def run_job(idx: int, job: PlanJob) -> JobResult:
+            report_progress(f"Job {idx}/{total_jobs}: {job.artifact_name}")
             try:
-                result = self._execute_job(job, progress_callback)
-                job_results.append(result)
-
-                if result.status == "completed" and result.artifact_path:
-                    artifacts_generated.append(result.artifact_path)
-                elif result.status == "failed" and result.error_message:
-                    errors.append(f"{job.artifact_name}: {result.error_message}")
-
+                return self._execute_job(job, report_progress if progress_callback else None)
             except Exception as e:
                 logger.exception(f"Unexpected error executing {job.artifact_name}")
-                job_results.append(
-                    JobResult(
-                        job_id=job.id,
-                        status="failed",
-                        error_message=str(e),
-                    )
+                return JobResult.model_construct(
+                    job_id=job.id,
+                    status="failed",
+                    error_message=str(e),
                 )
-                errors.append(f"{job.artifact_name}: {str(e)}")
-
-        completed_at = datetime.utcnow()
 
-        # Count results
-        completed = sum(1 for r in job_results if r.status == "completed")
-        skipped = sum(1 for r in job_results if r.status == "skipped")
-        failed = sum(1 for r in job_results if r.status == "failed")
-        cached = sum(1 for r in job_results if r.cached)
+        # Generation is dominated by API latency, so jobs run concurrently.
+        # The first job runs alone so it writes Anthropic's prompt cache for
+        # the shared base context before the others read it.
+        order = order_jobs_for_cache(plan.jobs)
+        jobs = [(position, plan.jobs[i]) for position, i in enumerate(order, 1)]
+        try:
+            ordered_results = [run_job(*jobs[0])] if jobs else []
+            if len(jobs) > 1:
+                workers = min(self.max_concurrency, len(jobs) - 1)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    ordered_results.extend(executor.map(lambda item: run_job(*item), jobs[1:]))
+        finally:
+            self._flush_meta()
+            self._meta_cache = None
+
+        results_by_index = dict(zip(order, ordered_results, strict=True))
+        job_results = [results_by_index[i] for i in range(total_jobs)]
+
+        # Collect outcomes in plan order, counting results and summing
+        # tokens and time in the same pass
+        completed = skipped = failed = cached = 0
+        total_input = total_output = 0
+        total_time = 0.0
+        for job, result in zip(plan.jobs, job_results, strict=True):
+            if result.status == "completed":
+                completed += 1
+                if result.artifact_path:
+                    artifacts_generated.append(result.artifact_path)
+            elif result.status == "skipped":
+                skipped += 1
+            elif result.status == "failed":
+                failed += 1
+                if result.error_message:
+                    errors.append(f"{job.artifact_name}: {result.error_message}")
+            if result.cached:
+                cached += 1
+            total_input += result.input_tokens
+            total_output += result.output_tokens
+            total_time += result.generation_time_seconds
 
-        # Sum tokens and time
-        total_input = sum(r.input_tokens for r in job_results)
-        total_output = sum(r.output_tokens for r in job_results)
-        total_time = sum(r.generation_time_seconds for r in job_results)
+        completed_at = self._now()
+        self._clock_start = None
 
-        report = Report(
+        # Totals and results come from this run; only load_report validates
+        report = Report.model_construct(
             report_id=report_id,
             repo_path=plan.repo_path,
             repo_name=plan.repo_name,
@@ -399,6 +954,6 @@ def load_report(path: Path) -> Report:
     Returns:
         Report object
     """
-    with open(path) as f:
-        data = json.load(f)
-    return Report.model_validate(data)
+    # Parsed straight into the schema by pydantic-core, with no
+    # intermediate dict
+    return Report.model_validate_json(path.read_bytes())
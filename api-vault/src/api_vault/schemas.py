@@ -11,10 +11,10 @@ Schema Version History:
 
 from datetime import datetime
 from enum import Enum
-from pathlib import Path
-from typing import Any, ClassVar
+from functools import lru_cache
+from typing import Annotated, Any, Self
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, StringConstraints, model_validator
 
 # Schema version for data compatibility
 SCHEMA_VERSION = "1.1.0"
@@ -23,7 +23,46 @@ SCHEMA_VERSION_MINOR = 1
 SCHEMA_VERSION_PATCH = 0
 
 
-class VersionedModel(BaseModel):
+@lru_cache(maxsize=32)
+def _schema_version_compatibility(version: str) -> tuple[bool, str]:
+    """
+    Check a schema version string against SCHEMA_VERSION.
+
+    Only a handful of distinct versions are ever seen, so results are
+    cached and repeated loads skip both the parsing and the message
+    formatting.
+
+    Args:
+        version: Version string such as "1.1.0"; a missing minor part is 0
+
+    Returns:
+        Tuple of (is_compatible, message)
+    """
+    try:
+        parts = version.split(".")
+        major = int(parts[0])
+        minor = int(parts[1]) if len(parts) > 1 else 0
+    except (ValueError, IndexError):
+        return False, f"Invalid version format: {version}"
+    if major != SCHEMA_VERSION_MAJOR:
+        return False, f"Incompatible major version: {version} vs {SCHEMA_VERSION}"
+    if minor > SCHEMA_VERSION_MINOR:
+        return True, f"Data from newer minor version: {version} (current: {SCHEMA_VERSION})"
+    return True, "Compatible"
+
+
+class _SchemaModel(BaseModel):
+    """
+    Base for the models in this module.
+
+    Core schemas and validators are built on first use rather than at
+    import; most commands only touch a few of these models.
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+
+class VersionedModel(_SchemaModel):
     """Base model with schema versioning support."""
 
     schema_version: str = Field(default=SCHEMA_VERSION, description="Schema version for compatibility")
@@ -36,19 +75,7 @@ class VersionedModel(BaseModel):
         Returns:
             Tuple of (is_compatible, message)
         """
-        data_version = data.get("schema_version", "1.0.0")
-        try:
-            parts = data_version.split(".")
-            major = int(parts[0])
-            minor = int(parts[1]) if len(parts) > 1 else 0
-
-            if major != SCHEMA_VERSION_MAJOR:
-                return False, f"Incompatible major version: {data_version} vs {SCHEMA_VERSION}"
-            if minor > SCHEMA_VERSION_MINOR:
-                return True, f"Data from newer minor version: {data_version} (current: {SCHEMA_VERSION})"
-            return True, "Compatible"
-        except (ValueError, IndexError):
-            return False, f"Invalid version format: {data_version}"
+        return _schema_version_compatibility(data.get("schema_version", "1.0.0"))
 
     @classmethod
     def migrate_from_version(cls, data: dict[str, Any], from_version: str) -> dict[str, Any]:
@@ -73,30 +100,35 @@ class ArtifactFamily(str, Enum):
     PRODUCT = "product"
 
 
-class FileEntry(BaseModel):
+# Checked by pydantic-core's compiled regex; the pattern admits uppercase
+# because it runs before to_lower normalizes the value.
+Sha256Hex = Annotated[str, StringConstraints(pattern=r"^[0-9a-fA-F]{64}$", to_lower=True)]
+
+
+class FileEntry(_SchemaModel):
     """A single file in the repository index."""
 
+    model_config = ConfigDict(frozen=True)
+
     path: str = Field(..., description="Relative path from repo root")
     size_bytes: int = Field(..., ge=0, description="File size in bytes")
-    sha256: str = Field(..., min_length=64, max_length=64, description="SHA-256 hash of contents")
+    sha256: Sha256Hex = Field(..., description="SHA-256 hash of contents")
+    hash_partial: bool = Field(
+        default=False, description="Whether sha256 only covers the file's ends and size"
+    )
     is_binary: bool = Field(default=False, description="Whether file is binary")
     extension: str = Field(default="", description="File extension without dot")
     last_modified: datetime | None = Field(default=None, description="Last modification time")
 
-    @field_validator("sha256")
-    @classmethod
-    def validate_sha256(cls, v: str) -> str:
-        """Ensure sha256 is lowercase hex."""
-        if not all(c in "0123456789abcdef" for c in v.lower()):
-            raise ValueError("sha256 must be hexadecimal")
-        return v.lower()
-
 
-class RepoIndex(BaseModel):
+class RepoIndex(_SchemaModel):
     """Complete index of a repository's files."""
 
     repo_path: str = Field(..., description="Absolute path to repository root")
     repo_name: str = Field(..., description="Repository directory name")
+    # Document timestamps stay datetimes: they are part of the stored
+    # index/plan/report format, and the factory runs once per document
+    # (per-file and per-redaction entries carry no default timestamp)
     scan_timestamp: datetime = Field(default_factory=datetime.utcnow)
     total_files: int = Field(..., ge=0)
     total_size_bytes: int = Field(..., ge=0)
@@ -105,10 +137,35 @@ class RepoIndex(BaseModel):
     git_commit_hash: str | None = Field(default=None, description="HEAD commit hash if git repo")
     git_branch: str | None = Field(default=None, description="Current branch name")
 
+    _extension_positions: dict[str, list[int]] = PrivateAttr(default_factory=dict)
+    _extension_files: list[FileEntry] | None = PrivateAttr(default=None)
+
+    def extension_positions(self) -> dict[str, list[int]]:
+        """
+        Positions in `files` grouped by file extension.
 
-class LanguageStats(BaseModel):
+        Built in one pass on first use. The entries it was built from are
+        kept and compared with `files` on each call (an identity check per
+        entry in C), so replacing, reordering, adding or removing files
+        rebuilds it.
+
+        Returns:
+            Dict mapping extension to ascending indices into `files`
+        """
+        if self._extension_files != self.files:
+            positions: dict[str, list[int]] = {}
+            for i, file_entry in enumerate(self.files):
+                positions.setdefault(file_entry.extension, []).append(i)
+            self._extension_positions = positions
+            self._extension_files = list(self.files)
+        return self._extension_positions
+
+
+class LanguageStats(_SchemaModel):
     """Statistics about a detected programming language."""
 
+    model_config = ConfigDict(frozen=True)
+
     language: str = Field(..., description="Language name")
     file_count: int = Field(..., ge=0)
     total_bytes: int = Field(..., ge=0)
@@ -116,9 +173,11 @@ class LanguageStats(BaseModel):
     extensions: list[str] = Field(default_factory=list)
 
 
-class FrameworkDetection(BaseModel):
+class FrameworkDetection(_SchemaModel):
     """A detected framework or tool."""
 
+    model_config = ConfigDict(frozen=True)
+
     name: str = Field(..., description="Framework/tool name")
     category: str = Field(..., description="Category: framework, library, tool, service")
     confidence: float = Field(..., ge=0, le=1, description="Detection confidence 0-1")
@@ -126,7 +185,7 @@ class FrameworkDetection(BaseModel):
     version: str | None = Field(default=None, description="Detected version if available")
 
 
-class DocsMaturity(BaseModel):
+class DocsMaturity(_SchemaModel):
     """Assessment of documentation maturity."""
 
     has_readme: bool = False
@@ -141,7 +200,7 @@ class DocsMaturity(BaseModel):
     maturity_score: float = Field(default=0, ge=0, le=1, description="Overall docs maturity 0-1")
 
 
-class TestingMaturity(BaseModel):
+class TestingMaturity(_SchemaModel):
     """Assessment of testing maturity."""
 
     has_test_folder: bool = False
@@ -152,7 +211,7 @@ class TestingMaturity(BaseModel):
     maturity_score: float = Field(default=0, ge=0, le=1)
 
 
-class CIMaturity(BaseModel):
+class CIMaturity(_SchemaModel):
     """Assessment of CI/CD maturity."""
 
     has_ci_config: bool = False
@@ -163,7 +222,7 @@ class CIMaturity(BaseModel):
     maturity_score: float = Field(default=0, ge=0, le=1)
 
 
-class SecurityMaturity(BaseModel):
+class SecurityMaturity(_SchemaModel):
     """Assessment of security maturity."""
 
     has_security_policy: bool = False
@@ -174,7 +233,7 @@ class SecurityMaturity(BaseModel):
     maturity_score: float = Field(default=0, ge=0, le=1)
 
 
-class RepoSignals(BaseModel):
+class RepoSignals(_SchemaModel):
     """Extracted signals about repository characteristics."""
 
     repo_path: str
@@ -208,7 +267,26 @@ class RepoSignals(BaseModel):
     identified_gaps: list[str] = Field(default_factory=list, description="Missing or weak areas")
 
 
-class ScoreBreakdown(BaseModel):
+# Default weights for ScoreBreakdown.compute_total
+DEFAULT_SCORE_WEIGHTS: dict[str, float] = {
+    "reusability": 1.0,
+    "time_saved": 1.5,
+    "leverage": 2.0,
+    "context_cost": -0.5,  # Negative because lower is better
+    "gap_weight": 1.5,
+}
+
+# DEFAULT_SCORE_WEIGHTS in compute_total's term order, for the default path
+_DEFAULT_WEIGHT_VALUES: tuple[float, float, float, float, float] = (
+    DEFAULT_SCORE_WEIGHTS["reusability"],
+    DEFAULT_SCORE_WEIGHTS["time_saved"],
+    DEFAULT_SCORE_WEIGHTS["leverage"],
+    DEFAULT_SCORE_WEIGHTS["context_cost"],
+    DEFAULT_SCORE_WEIGHTS["gap_weight"],
+)
+
+
+class ScoreBreakdown(_SchemaModel):
     """Breakdown of how an artifact was scored."""
 
     reusability: float = Field(..., ge=0, le=10, description="How reusable is this artifact")
@@ -221,25 +299,27 @@ class ScoreBreakdown(BaseModel):
     def compute_total(self, weights: dict[str, float] | None = None) -> float:
         """Compute weighted total score."""
         if weights is None:
-            weights = {
-                "reusability": 1.0,
-                "time_saved": 1.5,
-                "leverage": 2.0,
-                "context_cost": -0.5,  # Negative because lower is better
-                "gap_weight": 1.5,
-            }
+            r, t, lev, c, g = _DEFAULT_WEIGHT_VALUES
+        else:
+            r = weights.get("reusability", 1.0)
+            t = weights.get("time_saved", 1.0)
+            lev = weights.get("leverage", 1.0)
+            c = weights.get("context_cost", -0.5)
+            g = weights.get("gap_weight", 1.0)
         return (
-            self.reusability * weights.get("reusability", 1.0)
-            + self.time_saved * weights.get("time_saved", 1.0)
-            + self.leverage * weights.get("leverage", 1.0)
-            + self.context_cost * weights.get("context_cost", -0.5)
-            + self.gap_weight * weights.get("gap_weight", 1.0)
+            self.reusability * r
+            + self.time_saved * t
+            + self.leverage * lev
+            + self.context_cost * c
+            + self.gap_weight * g
         )
 
 
-class ContextRef(BaseModel):
+class ContextRef(_SchemaModel):
     """Reference to context that should be included for an artifact."""
 
+    model_config = ConfigDict(frozen=True)
+
     file_path: str = Field(..., description="Path to file")
     excerpt_type: str = Field(default="full", description="full, head, tail, or range")
     start_line: int | None = Field(default=None, ge=1)
@@ -247,8 +327,26 @@ class ContextRef(BaseModel):
     max_bytes: int = Field(default=8192, description="Maximum bytes to include")
     reason: str = Field(default="", description="Why this context is needed")
 
-
-class PlanJob(BaseModel):
+    @model_validator(mode="after")
+    def _check_line_range(self) -> Self:
+        """Reject ranges that end before they start, so readers can trust them."""
+        if (
+            self.start_line is not None
+            and self.end_line is not None
+            and self.start_line > self.end_line
+        ):
+            raise ValueError(
+                f"start_line ({self.start_line}) is after end_line ({self.end_line})"
+            )
+        return self
+
+    @property
+    def token_cost(self) -> int:
+        """Estimated context tokens this reference adds to a plan job (capped at 4 KiB, ~4 bytes/token)."""
+        return min(self.max_bytes, 4096) // 4
+
+
+class PlanJob(_SchemaModel):
     """A single artifact generation job in the plan."""
 
     id: str = Field(..., description="Unique job identifier")
@@ -261,7 +359,7 @@ class PlanJob(BaseModel):
     score_breakdown: ScoreBreakdown
     reason: str = Field(..., description="Why this artifact was selected")
     estimated_input_tokens: int = Field(default=0, ge=0)
-    dependencies: list[str] = Field(default_factory=list, description="Job IDs this depends on")
+    dependencies: tuple[str, ...] = Field(default=(), description="Job IDs this depends on")
 
 
 class Plan(VersionedModel):
@@ -282,9 +380,11 @@ class Plan(VersionedModel):
     )
 
 
-class RedactionEntry(BaseModel):
+class RedactionEntry(_SchemaModel):
     """Record of a redacted secret."""
 
+    model_config = ConfigDict(frozen=True)
+
     file_path: str
     line_number: int
     pattern_name: str = Field(..., description="Name of pattern that matched")
@@ -293,7 +393,7 @@ class RedactionEntry(BaseModel):
     confidence: float = Field(default=1.0, ge=0, le=1)
 
 
-class RedactionReport(BaseModel):
+class RedactionReport(_SchemaModel):
     """Report of all redactions performed."""
 
     scan_timestamp: datetime = Field(default_factory=datetime.utcnow)
@@ -303,7 +403,7 @@ class RedactionReport(BaseModel):
     patterns_matched: dict[str, int] = Field(default_factory=dict)
 
 
-class ArtifactMeta(BaseModel):
+class ArtifactMeta(_SchemaModel):
     """Metadata for a generated artifact."""
 
     artifact_id: str
@@ -323,7 +423,7 @@ class ArtifactMeta(BaseModel):
     error_message: str | None = None
 
 
-class JobResult(BaseModel):
+class JobResult(_SchemaModel):
     """Result of executing a single job."""
 
     job_id: str
@@ -360,155 +460,184 @@ class Report(VersionedModel):
     errors: list[str] = Field(default_factory=list)
 
 
-class ScanConfig(BaseModel):
+# ScanConfig defaults; each config gets its own list copy of these
+_DEFAULT_EXCLUDED_DIRS: tuple[str, ...] = (
+    "node_modules",
+    "dist",
+    "build",
+    ".next",
+    ".git",
+    "coverage",
+    "vendor",
+    "__pycache__",
+    "target",
+    ".venv",
+    "venv",
+    ".tox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    "htmlcov",
+    ".eggs",
+    "*.egg-info",
+)
+
+_DEFAULT_EXCLUDED_EXTENSIONS: tuple[str, ...] = (
+    ".pyc",
+    ".pyo",
+    ".so",
+    ".dylib",
+    ".dll",
+    ".exe",
+    ".bin",
+    ".obj",
+    ".o",
+    ".a",
+    ".lib",
+    ".zip",
+    ".tar",
+    ".gz",
+    ".rar",
+    ".7z",
+    ".jar",
+    ".war",
+    ".ear",
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".ico",
+    ".svg",
+    ".webp",
+    ".mp3",
+    ".mp4",
+    ".avi",
+    ".mov",
+    ".pdf",
+    ".doc",
+    ".docx",
+    ".xls",
+    ".xlsx",
+    ".woff",
+    ".woff2",
+    ".ttf",
+    ".eot",
+    ".lock",
+)
+
+_DEFAULT_TEXT_EXTENSIONS: tuple[str, ...] = (
+    ".py",
+    ".js",
+    ".ts",
+    ".tsx",
+    ".jsx",
+    ".java",
+    ".go",
+    ".rs",
+    ".c",
+    ".cpp",
+    ".h",
+    ".hpp",
+    ".cs",
+    ".rb",
+    ".php",
+    ".swift",
+    ".kt",
+    ".scala",
+    ".sh",
+    ".bash",
+    ".zsh",
+    ".fish",
+    ".ps1",
+    ".bat",
+    ".cmd",
+    ".sql",
+    ".graphql",
+    ".json",
+    ".yaml",
+    ".yml",
+    ".toml",
+    ".ini",
+    ".cfg",
+    ".conf",
+    ".xml",
+    ".html",
+    ".htm",
+    ".css",
+    ".scss",
+    ".sass",
+    ".less",
+    ".md",
+    ".markdown",
+    ".rst",
+    ".txt",
+    ".csv",
+    ".env",
+    ".env.example",
+    ".gitignore",
+    ".dockerignore",
+    ".editorconfig",
+    "Dockerfile",
+    "Makefile",
+    "CMakeLists.txt",
+    "Cargo.toml",
+    "go.mod",
+    "go.sum",
+    "package.json",
+    "tsconfig.json",
+    "pyproject.toml",
+    "setup.py",
+    "setup.cfg",
+    "requirements.txt",
+    "Gemfile",
+    "Pipfile",
+    "pom.xml",
+    "build.gradle",
+    ".gitattributes",
+)
+
+
+class ScanConfig(_SchemaModel):
     """Configuration for repository scanning."""
 
     max_file_size_bytes: int = Field(default=1_000_000, description="Max file size to read")
+    hash_max_size_bytes: int | None = Field(
+        default=None,
+        ge=1,
+        description=(
+            "Larger files get a head/tail signature, not a full hash; at most "
+            "max_file_size_bytes (None hashes every scanned file in full)"
+        ),
+    )
     max_excerpt_bytes: int = Field(default=8192, description="Max bytes per excerpt")
     max_total_context_bytes: int = Field(default=65536, description="Max context per job")
-    excluded_dirs: list[str] = Field(
-        default_factory=lambda: [
-            "node_modules",
-            "dist",
-            "build",
-            ".next",
-            ".git",
-            "coverage",
-            "vendor",
-            "__pycache__",
-            "target",
-            ".venv",
-            "venv",
-            ".tox",
-            ".mypy_cache",
-            ".pytest_cache",
-            ".ruff_cache",
-            "htmlcov",
-            ".eggs",
-            "*.egg-info",
-        ]
+    excluded_dirs: list[str] = Field(default_factory=lambda: list(_DEFAULT_EXCLUDED_DIRS))
+    excluded_extensions: list[str] = Field(default_factory=lambda: list(_DEFAULT_EXCLUDED_EXTENSIONS))
+    text_extensions: list[str] = Field(default_factory=lambda: list(_DEFAULT_TEXT_EXTENSIONS))
+    respect_gitignore: bool = Field(
+        default=True, description="In git repositories, list files with git and skip ignored ones"
     )
-    excluded_extensions: list[str] = Field(
-        default_factory=lambda: [
-            ".pyc",
-            ".pyo",
-            ".so",
-            ".dylib",
-            ".dll",
-            ".exe",
-            ".bin",
-            ".obj",
-            ".o",
-            ".a",
-            ".lib",
-            ".zip",
-            ".tar",
-            ".gz",
-            ".rar",
-            ".7z",
-            ".jar",
-            ".war",
-            ".ear",
-            ".png",
-            ".jpg",
-            ".jpeg",
-            ".gif",
-            ".ico",
-            ".svg",
-            ".webp",
-            ".mp3",
-            ".mp4",
-            ".avi",
-            ".mov",
-            ".pdf",
-            ".doc",
-            ".docx",
-            ".xls",
-            ".xlsx",
-            ".woff",
-            ".woff2",
-            ".ttf",
-            ".eot",
-            ".lock",
-        ]
-    )
-    text_extensions: list[str] = Field(
-        default_factory=lambda: [
-            ".py",
-            ".js",
-            ".ts",
-            ".tsx",
-            ".jsx",
-            ".java",
-            ".go",
-            ".rs",
-            ".c",
-            ".cpp",
-            ".h",
-            ".hpp",
-            ".cs",
-            ".rb",
-            ".php",
-            ".swift",
-            ".kt",
-            ".scala",
-            ".sh",
-            ".bash",
-            ".zsh",
-            ".fish",
-            ".ps1",
-            ".bat",
-            ".cmd",
-            ".sql",
-            ".graphql",
-            ".json",
-            ".yaml",
-            ".yml",
-            ".toml",
-            ".ini",
-            ".cfg",
-            ".conf",
-            ".xml",
-            ".html",
-            ".htm",
-            ".css",
-            ".scss",
-            ".sass",
-            ".less",
-            ".md",
-            ".markdown",
-            ".rst",
-            ".txt",
-            ".csv",
-            ".env",
-            ".env.example",
-            ".gitignore",
-            ".dockerignore",
-            ".editorconfig",
-            "Dockerfile",
-            "Makefile",
-            "CMakeLists.txt",
-            "Cargo.toml",
-            "go.mod",
-            "go.sum",
-            "package.json",
-            "tsconfig.json",
-            "pyproject.toml",
-            "setup.py",
-            "setup.cfg",
-            "requirements.txt",
-            "Gemfile",
-            "Pipfile",
-            "pom.xml",
-            "build.gradle",
-            ".gitattributes",
-        ]
+    parallel_scan: bool = Field(
+        default=False, description="Walk top-level directories concurrently (for slow filesystems)"
     )
     safe_mode: bool = Field(default=False, description="If true, send only file paths, no content")
     docs_only_mode: bool = Field(default=False, description="If true, only scan documentation files")
 
-
-class CacheEntry(BaseModel):
+    @model_validator(mode="after")
+    def _check_hash_max_size(self) -> Self:
+        """Reject a partial-hash threshold that no scanned file could exceed."""
+        if (
+            self.hash_max_size_bytes is not None
+            and self.hash_max_size_bytes > self.max_file_size_bytes
+        ):
+            raise ValueError(
+                f"hash_max_size_bytes ({self.hash_max_size_bytes}) exceeds "
+                f"max_file_size_bytes ({self.max_file_size_bytes}); larger files are not scanned"
+            )
+        return self
+
+
+class CacheEntry(_SchemaModel):
     """A cached API response."""
 
     request_hash: str
@@ -7,7 +7,9 @@ Each template includes:
 - Structured output format requirements
 """
 
+import string
 from dataclasses import dataclass
+from functools import lru_cache
 
 
 @dataclass
@@ -831,5 +833,35 @@ def render_prompt(template_id: str, context: str) -> tuple[str, str] | None:
     if template is None:
         return None
 
-    user_prompt = template.user_prompt_template.format(context=context)
+    literals = _split_user_prompt(template.user_prompt_template)
+    if literals is None:
+        user_prompt = template.user_prompt_template.format(context=context)
+    else:
+        user_prompt = context.join(literals)
     return template.system_prompt, user_prompt
+
+
+@lru_cache(maxsize=64)
+def _split_user_prompt(user_prompt_template: str) -> tuple[str, ...] | None:
+    """
+    Parse a user prompt template once into the text around its fields.
+
+    Keyed on the template string, so templates replaced at runtime are
+    parsed again rather than served stale.
+
+    Args:
+        user_prompt_template: Template using str.format syntax
+
+    Returns:
+        Literal text between the {context} fields with braces unescaped,
+        or None if the template uses any other field, conversion or format spec
+    """
+    literals = [""]
+    for literal, field_name, format_spec, conversion in string.Formatter().parse(user_prompt_template):
+        literals[-1] += literal
+        if field_name is None:
+            continue
+        if field_name != "context" or format_spec or conversion:
+            return None
+        literals.append("")
+    return tuple(literals)
@@ -2,10 +2,12 @@
 
 import tempfile
 from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
 
 from api_vault.anthropic_client import (
+    AnthropicClient,
     CacheManager,
     MockAnthropicClient,
     canonicalize_json,
@@ -91,6 +93,16 @@ class TestCacheManager:
 
             assert result is None
 
+    def test_returns_none_for_corrupt(self):
+        """Test that unparseable or invalid entries return None."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = CacheManager(Path(tmpdir))
+            (Path(tmpdir) / f"{'c' * 64}.json").write_text("{not json")
+            (Path(tmpdir) / f"{'d' * 64}.json").write_text('{"request_hash": "d"}')
+
+            assert cache.get("c" * 64) is None
+            assert cache.get("d" * 64) is None
+
 
 class TestMockAnthropicClient:
     """Tests for mock Anthropic client."""
@@ -149,3 +161,135 @@ class TestMockAnthropicClient:
         result2 = client.generate("system", "user", 100)
 
         assert result1.request_hash == result2.request_hash
+
+    def test_excerpts_hash_like_appended_user_prompt(self):
+        """Test that separately cached excerpts keep the old request hash."""
+        client = MockAnthropicClient()
+
+        separate = client.generate_with_cached_context(
+            "context", "system", "user", 100,
+            cached_artifact_excerpts="excerpts",
+        )
+        appended = client.generate_with_cached_context(
+            "context", "system", "user\n\n## Additional Context\n\nexcerpts", 100,
+        )
+
+        assert separate.request_hash == appended.request_hash
+        assert client.requests[0]["user"] == "user"
+        assert client.requests[0]["artifact_excerpts"] == "excerpts"
+
+    def test_excerpts_read_from_cache_when_shared(self):
+        """Test that repeated excerpts are simulated as cache reads."""
+        client = MockAnthropicClient()
+        context = "c" * 400
+        excerpts = "e" * 400
+
+        first = client.generate_with_cached_context(
+            context, "system one", "user", 100, cached_artifact_excerpts=excerpts,
+        )
+        second = client.generate_with_cached_context(
+            context, "system two", "user", 100, cached_artifact_excerpts=excerpts,
+        )
+
+        assert first.cache_creation_input_tokens == 200
+        assert first.cache_read_input_tokens == 0
+        assert second.cache_creation_input_tokens == 0
+        assert second.cache_read_input_tokens == 200
+
+    def test_stream_yields_chunks_and_returns_result(self):
+        """Test that streaming yields the response text and returns its result."""
+        client = MockAnthropicClient()
+        stream = client.stream_with_cached_context("context", "system", "user", 100)
+
+        chunks = []
+        while True:
+            try:
+                chunks.append(next(stream))
+            except StopIteration as stop:
+                result = stop.value
+                break
+
+        assert len(chunks) > 1
+        assert "".join(chunks) == result.text
+        assert client.request_count == 1
+
+
+class TestAnthropicClientStreaming:
+    """Tests for streaming generation against a fake Messages API."""
+
+    def make_client(self, events, cache_dir=None):
+        """Build a client whose messages.create returns the given events."""
+        client = AnthropicClient(api_key="test-key", cache_dir=cache_dir)
+        calls = []
+
+        def create(**kwargs):
+            calls.append(kwargs)
+            return iter(events)
+
+        client.client = SimpleNamespace(messages=SimpleNamespace(create=create))
+        return client, calls
+
+    def text_events(self, *texts):
+        """Build a minimal stream of message events for the given texts."""
+        usage = SimpleNamespace(
+            input_tokens=50, output_tokens=1,
+            cache_creation_input_tokens=40, cache_read_input_tokens=0,
+        )
+        events = [SimpleNamespace(type="message_start", message=SimpleNamespace(usage=usage))]
+        events += [
+            SimpleNamespace(
+                type="content_block_delta", delta=SimpleNamespace(type="text_delta", text=text)
+            )
+            for text in texts
+        ]
+        events.append(SimpleNamespace(type="message_delta", usage=SimpleNamespace(output_tokens=7)))
+        return events
+
+    def drain(self, stream):
+        """Collect chunks and the return value of a generation stream."""
+        chunks = []
+        while True:
+            try:
+                chunks.append(next(stream))
+            except StopIteration as stop:
+                return chunks, stop.value
+
+    def test_streams_text_and_records_usage(self):
+        """Test that text deltas are yielded and final usage is recorded."""
+        client, calls = self.make_client(self.text_events("Hello", ", world"))
+
+        chunks, result = self.drain(
+            client.stream_with_cached_context("context", "system", "user", 100)
+        )
+
+        assert chunks == ["Hello", ", world"]
+        assert calls[0]["stream"] is True
+        assert result.error is None
+        assert result.output_tokens == 7
+        assert result.cache_creation_input_tokens == 40
+        assert client.get_usage_summary()["request_count"] == 1
+
+    def test_streamed_response_served_from_local_cache(self):
+        """Test that a streamed response is stored and replayed locally."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            client, calls = self.make_client(self.text_events("Hello"), Path(tmpdir))
+
+            self.drain(client.stream_with_cached_context("context", "system", "user", 100))
+            chunks, result = self.drain(
+                client.stream_with_cached_context("context", "system", "user", 100)
+            )
+
+            assert len(calls) == 1
+            assert chunks == ["Hello"]
+            assert result.cached
+
+    def test_stream_failure_returns_error(self):
+        """Test that a stream ending without a message reports an error."""
+        client, _ = self.make_client([])
+
+        chunks, result = self.drain(
+            client.stream_with_cached_context("context", "system", "user", 100)
+        )
+
+        assert chunks == []
+        assert result.error
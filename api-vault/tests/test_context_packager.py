@@ -0,0 +1,131 @@
+"""Tests for context packager."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from api_vault import context_packager as context_packager_module
+from api_vault.context_packager import (
+    build_full_context,
+    estimate_tokens,
+    package_context,
+    select_context_refs_for_artifact,
+)
+from api_vault.repo_scanner import scan_repository
+from api_vault.schemas import ContextRef, ScanConfig
+
+
+@pytest.fixture
+def sample_repo():
+    """Create a sample repository for testing."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        root = Path(tmpdir)
+
+        (root / "docs").mkdir()
+        (root / "tests").mkdir()
+
+        (root / "README.md").write_text("# Sample\n\nA sample project.")
+        (root / "pyproject.toml").write_text('[project]\nname = "sample"\n')
+        (root / "docs" / "guide.md").write_text("# Guide\n\nHow to use it.")
+        (root / "tests" / "test_app.py").write_text("def test_ok():\n    assert True\n")
+        (root / "notes.txt").write_text("é" * 3000, encoding="utf-8")
+
+        yield root
+
+
+class TestSelectContextRefs:
+    """Tests for context reference selection."""
+
+    def test_includes_key_files(self, sample_repo):
+        """Test that key files are always selected."""
+        index = scan_repository(sample_repo)
+        refs = select_context_refs_for_artifact("RUNBOOK.md", "docs", index, {})
+
+        paths = [r.file_path for r in refs]
+        assert "README.md" in paths
+        assert "pyproject.toml" in paths
+
+    def test_family_patterns_match(self, sample_repo):
+        """Test that family-specific patterns add matching files."""
+        index = scan_repository(sample_repo)
+        refs = select_context_refs_for_artifact("GOLDEN_PATH_TEST_PLAN.md", "tests", index, {})
+
+        assert "tests/test_app.py" in [r.file_path for r in refs]
+
+    def test_no_duplicate_refs(self, sample_repo):
+        """Test that a file is only referenced once."""
+        index = scan_repository(sample_repo)
+        refs = select_context_refs_for_artifact("RUNBOOK.md", "docs", index, {})
+
+        paths = [r.file_path for r in refs]
+        assert len(paths) == len(set(paths))
+
+    def test_respects_max_refs(self, sample_repo):
+        """Test that the number of refs is capped."""
+        index = scan_repository(sample_repo)
+        refs = select_context_refs_for_artifact("RUNBOOK.md", "docs", index, {}, max_refs=2)
+
+        assert len(refs) <= 2
+
+
+class TestPackageContext:
+    """Tests for context packaging."""
+
+    def test_truncates_by_bytes(self, sample_repo):
+        """Test that truncation honours the byte budget for non-ASCII content."""
+        index = scan_repository(sample_repo)
+        config = ScanConfig(max_total_context_bytes=1001, max_excerpt_bytes=8192)
+        refs = [ContextRef(file_path="notes.txt", max_bytes=8192)]
+
+        packaged, files_used, total_bytes = package_context(sample_repo, index, refs, config)
+
+        assert files_used == ["notes.txt"]
+        assert total_bytes <= 1001
+        body = packaged.split("```\n", 1)[1].rsplit("\n```", 1)[0]
+        assert len(body.encode("utf-8")) <= 1001
+        assert "�" not in body
+
+    def test_excerpt_cache_reads_each_range_once(self, sample_repo, monkeypatch):
+        """Test that a shared excerpt cache skips re-reading overlapping refs."""
+        index = scan_repository(sample_repo)
+        reads = []
+        get_file_content = context_packager_module.get_file_content
+
+        def counting_get_file_content(repo_path, file_entry, **kwargs):
+            reads.append(file_entry.path)
+            return get_file_content(repo_path, file_entry, **kwargs)
+
+        monkeypatch.setattr(context_packager_module, "get_file_content", counting_get_file_content)
+        cache = {}
+        first = package_context(
+            sample_repo, index, [ContextRef(file_path="README.md")], excerpt_cache=cache
+        )
+        second = package_context(
+            sample_repo,
+            index,
+            [ContextRef(file_path="README.md"), ContextRef(file_path="docs/guide.md")],
+            excerpt_cache=cache,
+        )
+
+        assert reads == ["README.md", "docs/guide.md"]
+        assert second[0].startswith(first[0])
+        assert second[0] == package_context(
+            sample_repo,
+            index,
+            [ContextRef(file_path="README.md"), ContextRef(file_path="docs/guide.md")],
+        )[0]
+
+
+class TestBuildFullContext:
+    """Tests for full context building."""
+
+    def test_token_estimate_matches_context(self, sample_repo):
+        """Test that the token estimate matches the assembled context."""
+        index = scan_repository(sample_repo)
+        refs = [ContextRef(file_path="README.md", max_bytes=4096)]
+
+        context, files_used, tokens = build_full_context(sample_repo, index, {}, refs)
+
+        assert files_used == ["README.md"]
+        assert tokens == estimate_tokens(context)
@@ -0,0 +1,222 @@
+"""Tests for execution history."""
+
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from api_vault.history import ExecutionHistory, ExecutionRecord
+
+
+@pytest.fixture
+def history_dir():
+    """Create a temporary history directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+def record(history: ExecutionHistory, **overrides) -> None:
+    """Record an execution with sensible defaults."""
+    values = {
+        "job_id": "job1",
+        "artifact_name": "RUNBOOK.md",
+        "family": "docs",
+        "estimated_input_tokens": 1000,
+        "estimated_output_tokens": 2000,
+        "actual_input_tokens": 1100,
+        "actual_output_tokens": 1800,
+        "generation_time_seconds": 10.0,
+        "success": True,
+        "repo_name": "repo",
+        "model": "mock-model",
+    }
+    values.update(overrides)
+    history.record_execution(**values)
+
+
+class TestRecordExecution:
+    """Tests for recording executions."""
+
+    def test_buffers_until_flush(self, history_dir):
+        """Test that records are buffered and written on flush."""
+        history = ExecutionHistory(history_dir)
+        record(history)
+        record(history)
+
+        history.flush()
+        lines = (history_dir / "executions.jsonl").read_text().splitlines()
+        assert len(lines) == 2
+        history.close()
+
+    def test_flushes_after_batch(self, history_dir):
+        """Test that a full batch is flushed without an explicit flush."""
+        history = ExecutionHistory(history_dir)
+        for _ in range(history.FLUSH_EVERY_RECORDS):
+            record(history)
+
+        lines = (history_dir / "executions.jsonl").read_text().splitlines()
+        assert len(lines) == history.FLUSH_EVERY_RECORDS
+        history.close()
+
+    def test_reloads_recorded_history(self, history_dir):
+        """Test that closed history is visible to a new instance."""
+        history = ExecutionHistory(history_dir)
+        record(history)
+        history.close()
+
+        reloaded = ExecutionHistory(history_dir)
+        assert reloaded.get_stats().total_executions == 1
+
+    def test_loads_lazily(self, history_dir):
+        """Test that history is read on first stats call, including new records."""
+        first = ExecutionHistory(history_dir)
+        record(first)
+        first.close()
+
+        history = ExecutionHistory(history_dir)
+        assert history._records == []
+        record(history)
+
+        assert history.get_stats().total_executions == 2
+        record(history)
+        assert history.get_stats().total_executions == 3
+        history.close()
+
+    def test_append_only(self, history_dir):
+        """Test that append-only mode writes records but keeps none in memory."""
+        history = ExecutionHistory(history_dir, append_only=True)
+        record(history)
+        record(history)
+        history.close()
+
+        assert history._records == []
+        with pytest.raises(RuntimeError):
+            history.get_stats()
+        assert ExecutionHistory(history_dir).get_stats().total_executions == 2
+
+    def test_clear_history(self, history_dir):
+        """Test that clearing removes the history file."""
+        history = ExecutionHistory(history_dir)
+        record(history)
+        history.clear_history()
+
+        assert not (history_dir / "executions.jsonl").exists()
+        assert history.get_stats().total_executions == 0
+
+
+class TestGetStats:
+    """Tests for aggregated statistics."""
+
+    def test_empty_history(self, history_dir):
+        """Test stats for an empty history."""
+        stats = ExecutionHistory(history_dir).get_stats()
+
+        assert stats.total_executions == 0
+        assert stats.input_token_ratio_mean == 1.0
+
+    def test_aggregates_ratios(self, history_dir):
+        """Test that ratio mean and stdev match the recorded values."""
+        history = ExecutionHistory(history_dir)
+        record(history, actual_input_tokens=1000)
+        record(history, actual_input_tokens=1200)
+        record(history, actual_input_tokens=1400, success=False)
+
+        stats = history.get_stats()
+        assert stats.total_executions == 3
+        assert stats.success_rate == pytest.approx(2 / 3)
+        assert stats.input_token_ratio_mean == pytest.approx(1.1)
+        assert stats.input_token_ratio_std == pytest.approx(0.1414213, rel=1e-5)
+        assert stats.tokens_per_second == pytest.approx(180.0)
+        history.close()
+
+    def test_stats_update_after_record(self, history_dir):
+        """Test that new records are reflected in subsequent stats."""
+        history = ExecutionHistory(history_dir)
+        record(history)
+        assert history.get_stats().total_executions == 1
+
+        record(history, family="security")
+        stats = history.get_stats()
+        assert stats.total_executions == 2
+        assert set(stats.family_stats) == {"docs", "security"}
+        history.close()
+
+    def test_filters_by_age(self, history_dir):
+        """Test that records older than max_age_days are excluded."""
+        old = ExecutionRecord(
+            job_id="old",
+            artifact_name="RUNBOOK.md",
+            family="docs",
+            timestamp=datetime.utcnow() - timedelta(days=120),
+            estimated_input_tokens=1000,
+            estimated_output_tokens=1000,
+            actual_input_tokens=1000,
+            actual_output_tokens=1000,
+            generation_time_seconds=1.0,
+            success=True,
+            repo_name="repo",
+            model="mock-model",
+        )
+        (history_dir / "executions.jsonl").write_text(old.model_dump_json() + "\n")
+
+        history = ExecutionHistory(history_dir)
+        record(history)
+
+        assert history.get_stats().total_executions == 1
+        assert history.get_stats(max_age_days=None).total_executions == 2
+        history.close()
+
+
+class TestStorageFormat:
+    """Tests for the on-disk history format."""
+
+    def test_json_fallback_round_trip(self, history_dir, monkeypatch):
+        """Test that history is written and read without orjson installed."""
+        monkeypatch.setattr("api_vault.history.orjson", None)
+        history = ExecutionHistory(history_dir)
+        record(history)
+        history.close()
+
+        reloaded = ExecutionHistory(history_dir)
+        assert reloaded.get_stats().total_executions == 1
+
+    def test_reads_iso_timestamps(self, history_dir):
+        """Test that records written by ExecutionRecord still load."""
+        entry = ExecutionRecord(
+            job_id="legacy",
+            artifact_name="RUNBOOK.md",
+            family="docs",
+            estimated_input_tokens=1000,
+            estimated_output_tokens=1000,
+            actual_input_tokens=1000,
+            actual_output_tokens=1000,
+            generation_time_seconds=1.0,
+            success=True,
+            repo_name="repo",
+            model="mock-model",
+        )
+        (history_dir / "executions.jsonl").write_text(entry.model_dump_json() + "\n")
+
+        history = ExecutionHistory(history_dir)
+        assert history.get_stats(max_age_days=1).total_executions == 1
+
+    def test_skips_malformed_lines(self, history_dir):
+        """Test that corrupt lines are skipped and coercible ones are kept."""
+        history = ExecutionHistory(history_dir)
+        record(history)
+        history.close()
+
+        with open(history_dir / "executions.jsonl", "a") as f:
+            f.write("{not json\n")
+            f.write(
+                '{"job_id": "x", "artifact_name": "a", "family": "docs",'
+                ' "estimated_input_tokens": "100", "estimated_output_tokens": 100,'
+                ' "actual_input_tokens": 100, "actual_output_tokens": 100,'
+                ' "generation_time_seconds": 1.0, "success": true,'
+                ' "repo_name": "r", "model": "m"}\n'
+            )
+            f.write("[1, 2]\n")
+
+        reloaded = ExecutionHistory(history_dir)
+        assert reloaded.get_stats().total_executions == 2
@@ -1,5 +1,7 @@
 """Tests for planner."""
 
+import hashlib
+import json
 import tempfile
 from datetime import datetime
 from pathlib import Path
@@ -8,15 +10,17 @@ import pytest
 
 from api_vault.planner import (
     ARTIFACT_TEMPLATES,
+    _GapIndex,
     check_prerequisites,
     compute_gap_weight,
     create_plan,
     generate_job_id,
     generate_plan_id,
+    plan_to_dict,
     score_artifact,
 )
 from api_vault.repo_scanner import scan_repository
-from api_vault.schemas import ArtifactFamily, RepoSignals
+from api_vault.schemas import ArtifactFamily, RepoSignals, ScoreBreakdown
 from api_vault.signal_extractor import extract_signals
 
 
@@ -106,6 +110,11 @@ class TestGenerateJobId:
 
         assert id1 != id2
 
+    def test_format(self):
+        """Test that job ID is the truncated hash of plan and artifact."""
+        expected = hashlib.sha256(b"plan123:RUNBOOK.md").hexdigest()[:12]
+        assert generate_job_id("plan123", "RUNBOOK.md") == expected
+
 
 class TestComputeGapWeight:
     """Tests for gap weight computation."""
@@ -126,6 +135,33 @@ class TestComputeGapWeight:
         weight = compute_gap_weight(template, gaps)
         assert weight == 5.0
 
+    def test_matching_is_case_insensitive(self):
+        """Test that gap matching ignores case."""
+        template = ARTIFACT_TEMPLATES[0]
+        gaps = ["NO ARCHITECTURE DOCUMENTATION"]
+
+        assert compute_gap_weight(template, gaps) == 7.0
+        assert compute_gap_weight(template, gaps, _GapIndex(gaps)) == 7.0
+
+    def test_shared_index_matches_per_template(self):
+        """Test that one gap index gives each template its own matches."""
+        gaps = ["No architecture documentation", "Limited test coverage"]
+        index = _GapIndex(gaps)
+
+        for template in ARTIFACT_TEMPLATES:
+            assert compute_gap_weight(template, gaps, index) == compute_gap_weight(template, gaps)
+
+    def test_first_match_with_and_without_cached_matches(self):
+        """Test that the first matching gap is found whether or not it was scored."""
+        gaps = ["Limited test coverage", "NO ARCHITECTURE DOCUMENTATION"]
+        template = ARTIFACT_TEMPLATES[0]  # RUNBOOK.md
+
+        assert _GapIndex(gaps).first_match(template) == "NO ARCHITECTURE DOCUMENTATION"
+        index = _GapIndex(gaps)
+        index.matches(template)
+        assert index.first_match(template) == "NO ARCHITECTURE DOCUMENTATION"
+        assert index.first_match(ARTIFACT_TEMPLATES[1]) is None
+
 
 class TestCheckPrerequisites:
     """Tests for prerequisite checking."""
@@ -172,6 +208,18 @@ class TestScoreArtifact:
 
         assert score_large.context_cost > score_small.context_cost
 
+    def test_total_matches_compute_total(self, sample_signals):
+        """Test that the precomputed total equals the model's weighted total."""
+        for template in ARTIFACT_TEMPLATES:
+            score = score_artifact(template, sample_signals, 1234)
+            assert score.total_score == score.compute_total()
+
+    def test_unvalidated_breakdown_is_valid(self, sample_signals):
+        """Test that breakdowns built without validation pass validation."""
+        for template in ARTIFACT_TEMPLATES:
+            score = score_artifact(template, sample_signals, 50000)
+            assert ScoreBreakdown.model_validate(score.model_dump()) == score
+
 
 class TestCreatePlan:
     """Tests for plan creation."""
@@ -291,3 +339,15 @@ class TestCreatePlan:
         for job in plan.jobs:
             assert job.reason is not None
             assert len(job.reason) > 0
+
+
+class TestPlanToDict:
+    """Tests for plan serialization."""
+
+    def test_matches_json_round_trip(self, sample_repo):
+        """Test that the dict equals the parsed JSON serialization."""
+        index = scan_repository(sample_repo)
+        signals = extract_signals(index, sample_repo)
+        plan = create_plan(index=index, signals=signals, budget_tokens=50000, budget_seconds=3600)
+
+        assert plan_to_dict(plan) == json.loads(plan.model_dump_json())
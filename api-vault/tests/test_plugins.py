@@ -0,0 +1,171 @@
+"""Tests for plugin architecture."""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from api_vault.plugins import (
+    ArtifactGeneratorPlugin,
+    PluginRegistry,
+    artifact_generator,
+    get_registry,
+    load_plugin_from_file,
+    reset_plugin_cache,
+    reset_registry,
+)
+from api_vault.schemas import ArtifactFamily
+
+PLUGIN_SOURCE = '''
+from api_vault.plugins import ArtifactGeneratorPlugin
+from api_vault.schemas import ArtifactFamily
+
+
+class ExampleGenerator(ArtifactGeneratorPlugin):
+    @property
+    def name(self):
+        return "example"
+
+    @property
+    def family(self):
+        return ArtifactFamily.DOCS
+
+    def should_generate(self, index, signals):
+        return True
+
+    def get_prompt(self, index, signals, context):
+        return "prompt"
+'''
+
+
+@pytest.fixture
+def plugin_file():
+    """Create a temporary plugin file and reset plugin state."""
+    reset_registry()
+    reset_plugin_cache()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "example_plugin.py"
+        path.write_text(PLUGIN_SOURCE)
+        yield path
+    reset_registry()
+    reset_plugin_cache()
+
+
+class TestLoadPluginFromFile:
+    """Tests for loading plugins from files."""
+
+    def test_loads_and_registers(self, plugin_file):
+        """Test that plugin classes are instantiated and registered."""
+        plugins = load_plugin_from_file(plugin_file)
+
+        assert [p.name for p in plugins] == ["example"]
+        assert "example" in [p.name for p in get_registry().artifact_generators]
+
+    def test_reuses_unchanged_module(self, plugin_file):
+        """Test that an unchanged file is not executed again."""
+        first = load_plugin_from_file(plugin_file)
+        second = load_plugin_from_file(plugin_file)
+
+        assert type(first[0]) is type(second[0])
+        assert first[0] is not second[0]
+
+    def test_reloads_changed_module(self, plugin_file):
+        """Test that a modified file is executed again."""
+        first = load_plugin_from_file(plugin_file)
+        plugin_file.write_text(PLUGIN_SOURCE)
+        stat = plugin_file.stat()
+        os.utime(plugin_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        second = load_plugin_from_file(plugin_file)
+
+        assert type(first[0]) is not type(second[0])
+
+    def test_missing_file(self):
+        """Test that a missing file raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            load_plugin_from_file(Path("/nonexistent/plugin.py"))
+
+    def test_uses_explicit_plugin_list(self, plugin_file):
+        """Test that only classes listed in __plugins__ are registered."""
+        plugin_file.write_text(
+            PLUGIN_SOURCE
+            + "\n\nclass Unlisted(ExampleGenerator):\n"
+            + "    @property\n    def name(self):\n        return 'unlisted'\n"
+            + "\n\n__plugins__ = [ExampleGenerator]\n"
+        )
+
+        plugins = load_plugin_from_file(plugin_file)
+
+        assert [p.name for p in plugins] == ["example"]
+
+
+def make_generator(
+    name: str, priority: int, family: ArtifactFamily = ArtifactFamily.DOCS
+) -> ArtifactGeneratorPlugin:
+    """Build a minimal artifact generator with the given priority."""
+
+    class Generator(ArtifactGeneratorPlugin):
+        @property
+        def name(self) -> str:
+            return name
+
+        @property
+        def family(self) -> ArtifactFamily:
+            return family
+
+        @property
+        def priority(self) -> int:
+            return priority
+
+        def should_generate(self, index, signals):
+            return True
+
+        def get_prompt(self, index, signals, context):
+            return ""
+
+    return Generator()
+
+
+class TestPluginRegistry:
+    """Tests for the plugin registry."""
+
+    def test_generators_ordered_by_priority(self):
+        """Test that generators are kept in descending priority, stable for ties."""
+        registry = PluginRegistry()
+        for name, priority in [("a", 0), ("b", 5), ("c", 0), ("d", 10), ("e", 5)]:
+            registry.register_artifact_generator(make_generator(name, priority))
+
+        assert [g.name for g in registry.artifact_generators] == ["d", "b", "e", "a", "c"]
+
+    def test_generators_for_family(self):
+        """Test that family lookup returns that family's generators in priority order."""
+        registry = PluginRegistry()
+        registry.register_artifact_generator(make_generator("docs-low", 0))
+        registry.register_artifact_generator(make_generator("api", 3, ArtifactFamily.API))
+        registry.register_artifact_generator(make_generator("docs-high", 7))
+
+        docs = registry.get_generators_for_family(ArtifactFamily.DOCS)
+        assert [g.name for g in docs] == ["docs-high", "docs-low"]
+        assert registry.get_generators_for_family(ArtifactFamily.SECURITY) == []
+
+        docs.clear()
+        assert len(registry.get_generators_for_family(ArtifactFamily.DOCS)) == 2
+
+
+class TestDecorators:
+    """Tests for decorator-based plugins."""
+
+    def test_artifact_generator_attributes(self, plugin_file):
+        """Test that decorator arguments become plugin attributes."""
+
+        @artifact_generator("decorated", ArtifactFamily.API, description="desc", priority=3)
+        def generate(index, signals, context):
+            return "prompt"
+
+        assert (generate.name, generate.family, generate.priority) == (
+            "decorated",
+            ArtifactFamily.API,
+            3,
+        )
+        assert generate.description == "desc"
+        assert generate in get_registry().get_generators_for_family(ArtifactFamily.API)
@@ -9,15 +9,20 @@ import string
 from datetime import datetime
 
 import pytest
+from pydantic import ValidationError
 from hypothesis import given, settings, strategies as st, assume
 
 from api_vault.schemas import (
+    DEFAULT_SCORE_WEIGHTS,
+    SCHEMA_VERSION_MAJOR,
+    SCHEMA_VERSION_MINOR,
     FileEntry,
     LanguageStats,
     ScoreBreakdown,
     ContextRef,
     RedactionEntry,
     ScanConfig,
+    VersionedModel,
 )
 from api_vault.secret_guard import (
     calculate_entropy,
@@ -94,6 +99,15 @@ class TestFileEntryProperties:
         )
         assert entry.sha256 == sha256.lower()  # Output lowercase
 
+    @given(sha256=valid_sha256())
+    def test_file_entry_frozen_and_hashable(self, sha256: str) -> None:
+        """FileEntry is immutable and equal entries hash alike."""
+        entry = FileEntry(path="test.py", size_bytes=100, sha256=sha256)
+
+        with pytest.raises(ValidationError):
+            entry.path = "other.py"  # type: ignore[misc]
+        assert hash(entry) == hash(entry.model_copy())
+
     @given(bad_sha=st.text(min_size=64, max_size=64).filter(
         lambda s: not all(c in "0123456789abcdefABCDEF" for c in s)
     ))
@@ -142,6 +156,33 @@ class TestScoreBreakdownProperties:
 
         assert total1 == total2
 
+    @given(
+        reusability=score_strategy(),
+        time_saved=score_strategy(),
+        leverage=score_strategy(),
+        context_cost=score_strategy(),
+        gap_weight=score_strategy(),
+    )
+    def test_default_weights_match_explicit(
+        self,
+        reusability: float,
+        time_saved: float,
+        leverage: float,
+        context_cost: float,
+        gap_weight: float,
+    ) -> None:
+        """The default-weights path gives exactly the explicit-weights total."""
+        breakdown = ScoreBreakdown(
+            reusability=reusability,
+            time_saved=time_saved,
+            leverage=leverage,
+            context_cost=context_cost,
+            gap_weight=gap_weight,
+            total_score=0,
+        )
+
+        assert breakdown.compute_total() == breakdown.compute_total(DEFAULT_SCORE_WEIGHTS)
+
     @given(
         reusability=score_strategy(),
         time_saved=score_strategy(),
@@ -300,6 +341,31 @@ class TestContextRefProperties:
         assert restored.file_path == file_path
         assert restored.max_bytes == max_bytes
 
+    @given(
+        start_line=st.integers(min_value=1, max_value=10_000),
+        end_line=st.integers(min_value=1, max_value=10_000),
+    )
+    def test_line_range_must_be_ordered(self, start_line: int, end_line: int) -> None:
+        """ContextRef accepts a line range only if it does not end before it starts."""
+        if start_line <= end_line:
+            ref = ContextRef(file_path="a.py", start_line=start_line, end_line=end_line)
+            assert (ref.start_line, ref.end_line) == (start_line, end_line)
+        else:
+            with pytest.raises(ValidationError, match="is after end_line"):
+                ContextRef(file_path="a.py", start_line=start_line, end_line=end_line)
+
+    @given(
+        max_bytes=st.integers(min_value=1, max_value=100000),
+        new_max_bytes=st.integers(min_value=1, max_value=100000),
+    )
+    def test_token_cost_follows_max_bytes(self, max_bytes: int, new_max_bytes: int) -> None:
+        """token_cost always reflects the current max_bytes, including after model_copy."""
+        ref = ContextRef(file_path="a.py", max_bytes=max_bytes)
+        copied = ref.model_copy(update={"max_bytes": new_max_bytes})
+
+        assert ref.token_cost == min(max_bytes, 4096) // 4
+        assert copied.token_cost == min(new_max_bytes, 4096) // 4
+
 
 # --- Signal Extractor Tests ---
 
@@ -377,3 +443,37 @@ class TestRedactionEntryProperties:
         assert entry.line_number >= 1
         assert entry.original_length >= 0
         assert 0 <= entry.confidence <= 1
+
+
+# --- Schema Version Tests ---
+
+class TestVersionCompatibilityProperties:
+    """Property-based tests for schema version checks."""
+
+    @given(
+        major=st.integers(min_value=0, max_value=50),
+        minor=st.integers(min_value=0, max_value=50),
+        patch=st.integers(min_value=0, max_value=50),
+    )
+    def test_compatibility_follows_major_and_minor(self, major: int, minor: int, patch: int) -> None:
+        """Only the major version decides compatibility; newer minors are flagged."""
+        version = f"{major}.{minor}.{patch}"
+        compatible, message = VersionedModel.check_version_compatibility(
+            {"schema_version": version}
+        )
+
+        assert compatible == (major == SCHEMA_VERSION_MAJOR)
+        if compatible and minor > SCHEMA_VERSION_MINOR:
+            assert "newer minor version" in message
+        elif compatible:
+            assert message == "Compatible"
+
+    @given(version=st.sampled_from(["", "x", "1.x", "a.1.0", ".1"]))
+    def test_invalid_versions_rejected(self, version: str) -> None:
+        """Versions without integer major/minor parts are rejected."""
+        compatible, message = VersionedModel.check_version_compatibility(
+            {"schema_version": version}
+        )
+
+        assert compatible is False
+        assert message == f"Invalid version format: {version}"
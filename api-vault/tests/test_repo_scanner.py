@@ -1,20 +1,28 @@
 """Tests for repository scanner."""
 
+import hashlib
+import subprocess
 import tempfile
 from pathlib import Path
 
 import pytest
+from pydantic import ValidationError
 
 from api_vault.repo_scanner import (
+    MMAP_MIN_BYTES,
+    compute_partial_sha256,
     compute_sha256,
     get_file_content,
     get_files_by_extension,
     get_files_by_pattern,
+    get_git_info,
     get_key_files,
     is_binary_file,
+    scan_file,
     scan_repository,
     should_exclude_file,
     should_exclude_path,
+    write_index,
 )
 from api_vault.schemas import FileEntry, RepoIndex, ScanConfig
 
@@ -81,6 +89,63 @@ class TestIsBinaryFile:
         binary_file.write_bytes(b"hello\x00world")
         assert is_binary_file(binary_file) is True
 
+    def test_binary_detection_with_control_bytes(self, temp_repo):
+        """Test that a high ratio of control bytes marks a file as binary."""
+        mostly_control = temp_repo / "control.dat"
+        mostly_control.write_bytes(b"\x01\x02\x03\x1b" * 10 + b"text\n\t\r")
+        assert is_binary_file(mostly_control) is True
+
+        mostly_text = temp_repo / "text.dat"
+        mostly_text.write_bytes(b"\x1b[0m" + b"plain text\n" * 10)
+        assert is_binary_file(mostly_text) is False
+
+
+class TestScanFile:
+    """Tests for the fused hash and binary detection pass."""
+
+    def test_matches_separate_helpers(self, temp_repo):
+        """Test that results agree with compute_sha256 and is_binary_file."""
+        binary_file = temp_repo / "test.bin"
+        binary_file.write_bytes(b"hello\x00world" * 2000)
+
+        for path in (temp_repo / "README.md", binary_file):
+            file_hash, is_binary, size = scan_file(path)
+            assert file_hash == compute_sha256(path)
+            assert is_binary == is_binary_file(path)
+            assert size == path.stat().st_size
+
+    def test_large_file_uses_mapping(self, temp_repo):
+        """Test that files above the mmap threshold hash identically."""
+        large = temp_repo / "large.txt"
+        data = b"line of text\n" * (MMAP_MIN_BYTES // 10)
+        large.write_bytes(data)
+
+        expected = hashlib.sha256(data).hexdigest()
+        assert compute_sha256(large) == expected
+        assert scan_file(large) == (expected, False, len(data))
+
+    def test_partial_hash_above_limit(self, temp_repo):
+        """Test that files over hash_max_size get a head/tail signature."""
+        large = temp_repo / "large.txt"
+        large.write_bytes(b"a" * 200_000 + b"b" * 200_000)
+
+        file_hash, is_binary, size = scan_file(large, hash_max_size=100_000)
+        assert file_hash == compute_partial_sha256(large, size)
+        assert file_hash != compute_sha256(large)
+        assert (is_binary, size) == (False, 400_000)
+
+    def test_partial_hash_small_file(self, temp_repo):
+        """Test that a file shorter than the head/tail window is still signed."""
+        path = temp_repo / "README.md"
+        data = path.read_bytes()
+        expected = hashlib.sha256(data + str(len(data)).encode() + data).hexdigest()
+
+        assert compute_partial_sha256(path, len(data)) == expected
+
+    def test_nonexistent_file(self):
+        """Test handling of nonexistent files."""
+        assert scan_file(Path("/nonexistent/file.txt")) == ("0" * 64, True, 0)
+
 
 class TestShouldExcludePath:
     """Tests for path exclusion."""
@@ -95,6 +160,13 @@ class TestShouldExcludePath:
         excluded = ["node_modules", ".git"]
         assert not should_exclude_path(temp_repo / "src" / "foo.ts", excluded, temp_repo)
 
+    def test_globs_match_single_components(self, temp_repo):
+        """Test that glob patterns match whole path components only."""
+        assert should_exclude_path(Path("src/pkg.egg-info/PKG-INFO"), ["*.egg-info"], temp_repo)
+        assert should_exclude_path(Path("a/[b]/c"), ["[[]b]"], temp_repo)
+        assert not should_exclude_path(Path("src/index.ts"), ["src*ts"], temp_repo)
+        assert not should_exclude_path(Path("my_node_modules/x.js"), ["node_modules"], temp_repo)
+
 
 class TestShouldExcludeFile:
     """Tests for file exclusion."""
@@ -110,6 +182,32 @@ class TestShouldExcludeFile:
         excluded = [".lock", ".pyc"]
         assert should_exclude_file(Path("index.ts"), excluded) is False
 
+    def test_accepts_extension_set(self):
+        """Test lookups against a frozenset of extensions."""
+        excluded = frozenset({".lock", ".pyc"})
+        assert should_exclude_file(Path("test.pyc"), excluded) is True
+        assert should_exclude_file(Path("index.ts"), excluded) is False
+
+
+class TestGetGitInfo:
+    """Tests for git metadata lookup."""
+
+    def test_not_a_repo(self, temp_repo):
+        """Test that a plain directory has no git info."""
+        assert get_git_info(temp_repo) == (None, None)
+
+    def test_reads_commit_and_branch(self, temp_repo):
+        """Test that commit hash and branch come from the repository."""
+        git = ["git", "-c", "user.name=t", "-c", "user.email=t@example.com"]
+        subprocess.run(git + ["init", "-q", "-b", "main"], cwd=temp_repo, check=True)
+        subprocess.run(git + ["add", "README.md"], cwd=temp_repo, check=True)
+        subprocess.run(git + ["commit", "-q", "-m", "init"], cwd=temp_repo, check=True)
+        head = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=temp_repo, capture_output=True, text=True
+        ).stdout.strip()
+
+        assert get_git_info(temp_repo) == (head, "main")
+
 
 class TestScanRepository:
     """Tests for repository scanning."""
@@ -123,6 +221,33 @@ class TestScanRepository:
         assert os.path.realpath(index.repo_path) == os.path.realpath(str(temp_repo))
         assert index.total_files > 0
 
+    def test_index_round_trips_through_validation(self, temp_repo):
+        """Test that an unvalidated scan result passes full validation."""
+        index = scan_repository(temp_repo)
+
+        loaded = RepoIndex.model_validate_json(index.model_dump_json())
+
+        assert loaded.model_dump() == index.model_dump()
+        assert loaded.extension_positions() == index.extension_positions()
+
+    def test_entries_match_model_construct(self, temp_repo):
+        """Test that scanned entries equal model_construct and validated entries."""
+        index = scan_repository(temp_repo)
+
+        for entry in index.files:
+            values = entry.model_dump()
+            assert entry == FileEntry.model_construct(**values)
+            assert entry == FileEntry.model_validate(values)
+            assert entry.model_fields_set == set(FileEntry.model_fields)
+
+    def test_extensions_are_shared_strings(self, temp_repo):
+        """Test that files with the same extension share one string object."""
+        index = scan_repository(temp_repo)
+
+        ts_extensions = [f.extension for f in index.files if f.extension == "ts"]
+        assert len(ts_extensions) > 1
+        assert all(ext is ts_extensions[0] for ext in ts_extensions)
+
     def test_excludes_node_modules(self, temp_repo):
         """Test that node_modules is excluded."""
         index = scan_repository(temp_repo)
@@ -131,6 +256,32 @@ class TestScanRepository:
         paths = [f.path for f in index.files]
         assert not any("node_modules" in p for p in paths)
 
+    def test_excludes_nested_glob_dirs(self, temp_repo):
+        """Test that glob patterns exclude matching directories at any depth."""
+        (temp_repo / "src" / "pkg.egg-info").mkdir()
+        (temp_repo / "src" / "pkg.egg-info" / "PKG-INFO").write_text("Name: pkg")
+        config = ScanConfig(excluded_dirs=["*.egg-info"], excluded_extensions=[".ts"])
+        index = scan_repository(temp_repo, config)
+
+        paths = [f.path for f in index.files]
+        assert not any("egg-info" in p for p in paths)
+        assert not any(p.endswith(".ts") for p in paths)
+        assert "README.md" in paths
+
+    def test_extension_changes_apply_to_later_scans(self, temp_repo):
+        """Test that copied or mutated configs use their current extension lists."""
+        config = ScanConfig(excluded_extensions=[".md"])
+        assert "README.md" not in [f.path for f in scan_repository(temp_repo, config).files]
+
+        copied = config.model_copy(update={"excluded_extensions": [".ts"]})
+        paths = [f.path for f in scan_repository(temp_repo, copied).files]
+        assert "README.md" in paths
+        assert not any(p.endswith(".ts") for p in paths)
+
+        config.excluded_extensions.append(".json")
+        paths = [f.path for f in scan_repository(temp_repo, config).files]
+        assert "package.json" not in paths
+
     def test_includes_source_files(self, temp_repo):
         """Test that source files are included."""
         index = scan_repository(temp_repo)
@@ -146,6 +297,151 @@ class TestScanRepository:
         # Small limit should exclude most files
         assert index.total_files < 5
 
+    def test_flags_partial_hashes(self, temp_repo):
+        """Test that entries hashed from their ends only are flagged."""
+        config = ScanConfig(hash_max_size_bytes=32)
+        entries = {f.path: f for f in scan_repository(temp_repo, config).files}
+
+        assert entries["package.json"].hash_partial
+        assert not entries["README.md"].hash_partial
+        assert entries["README.md"].sha256 == compute_sha256(temp_repo / "README.md")
+
+    def test_partial_hash_for_large_scanned_file(self, temp_repo):
+        """Test that a file between the hash and scan limits gets a partial hash."""
+        large = temp_repo / "data.log"
+        large.write_bytes(b"log line\n" * 40_000)
+        size = large.stat().st_size
+        config = ScanConfig(max_file_size_bytes=2 * size, hash_max_size_bytes=size // 2)
+        entries = {f.path: f for f in scan_repository(temp_repo, config).files}
+
+        assert entries["data.log"].hash_partial
+        assert entries["data.log"].sha256 == compute_partial_sha256(large, size)
+        assert not entries["README.md"].hash_partial
+
+        default_entries = {f.path: f for f in scan_repository(temp_repo).files}
+        assert not default_entries["data.log"].hash_partial
+        assert default_entries["data.log"].sha256 == compute_sha256(large)
+
+    def test_rejects_hash_limit_above_scan_limit(self):
+        """Test that a partial-hash threshold above the scan limit is rejected."""
+        with pytest.raises(ValidationError, match="hash_max_size_bytes"):
+            ScanConfig(max_file_size_bytes=1_000, hash_max_size_bytes=2_000)
+
+    def test_reports_progress_for_every_file(self, temp_repo):
+        """Test that the progress callback fires once per scanned file."""
+        calls = []
+        index = scan_repository(temp_repo, progress_callback=lambda i, n, p: calls.append((i, n)))
+
+        assert [i for i, _ in calls] == list(range(1, len(calls) + 1))
+        assert all(n == len(calls) for _, n in calls)
+        assert len(calls) == index.total_files
+
+    def test_does_not_follow_symlinked_dirs(self, temp_repo):
+        """Test that symlinked directories are not descended into."""
+        (temp_repo / "link").symlink_to(temp_repo / "src", target_is_directory=True)
+        index = scan_repository(temp_repo)
+
+        paths = [f.path for f in index.files]
+        assert not any(p.startswith("link") for p in paths)
+        sizes = {f.path: f.size_bytes for f in index.files}
+        assert sizes["README.md"] == (temp_repo / "README.md").stat().st_size
+
+    def test_parallel_scan_matches_serial(self, temp_repo):
+        """Test that walking subtrees concurrently gives the same index."""
+        (temp_repo / "src" / "nested").mkdir()
+        (temp_repo / "src" / "nested" / "deep.ts").write_text("export {};")
+        serial = scan_repository(temp_repo, ScanConfig(respect_gitignore=False))
+        parallel = scan_repository(
+            temp_repo, ScanConfig(respect_gitignore=False, parallel_scan=True)
+        )
+
+        assert [f.path for f in parallel.files] == [f.path for f in serial.files]
+
+    def test_scan_order_is_deterministic(self, temp_repo):
+        """Test that repeated scans list files in the same order."""
+        first = [f.path for f in scan_repository(temp_repo).files]
+        second = [f.path for f in scan_repository(temp_repo).files]
+
+        assert first == second
+
+
+class TestScanGitRepository:
+    """Tests for scanning git repositories."""
+
+    @pytest.fixture
+    def git_repo(self, temp_repo):
+        """Turn the temporary repository into a git repository."""
+        git = ["git", "-c", "user.name=t", "-c", "user.email=t@example.com"]
+        (temp_repo / ".env").write_text("SECRET=1")
+        (temp_repo / "vendor").mkdir()
+        (temp_repo / "vendor" / "lib.js").write_text("module.exports = {};")
+        subprocess.run(git + ["init", "-q"], cwd=temp_repo, check=True)
+        subprocess.run(git + ["add", "."], cwd=temp_repo, check=True)
+        subprocess.run(git + ["commit", "-q", "-m", "init"], cwd=temp_repo, check=True)
+        (temp_repo / "docs" / "untracked.md").write_text("# New")
+        return temp_repo
+
+    def test_skips_ignored_files(self, git_repo):
+        """Test that gitignored files are skipped and untracked files kept."""
+        paths = [f.path for f in scan_repository(git_repo).files]
+
+        assert ".env" not in paths
+        assert not any(p.startswith(".git/") for p in paths)
+        assert "docs/untracked.md" in paths
+        assert "src/index.ts" in paths
+
+    def test_excluded_dirs_apply_to_tracked_files(self, git_repo):
+        """Test that excluded directories are skipped even when tracked."""
+        paths = [f.path for f in scan_repository(git_repo).files]
+
+        assert "vendor/lib.js" not in paths
+
+    def test_can_ignore_gitignore(self, git_repo):
+        """Test that respect_gitignore=False walks the directory tree."""
+        config = ScanConfig(respect_gitignore=False)
+        paths = [f.path for f in scan_repository(git_repo, config).files]
+
+        assert ".env" in paths
+        assert not any(p.startswith(".git/") for p in paths)
+
+    def test_directory_ignored_by_outer_repo(self, tmp_path):
+        """Test that a project ignored by an enclosing repository is still walked."""
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+        (tmp_path / ".gitignore").write_text("proj/\n")
+        project = tmp_path / "proj"
+        (project / "src").mkdir(parents=True)
+        (project / "README.md").write_text("# Project")
+        (project / "src" / "main.py").write_text("print('hi')")
+
+        paths = sorted(f.path for f in scan_repository(project).files)
+
+        assert paths == ["README.md", "src/main.py"]
+
+
+class TestWriteIndex:
+    """Tests for streaming index output."""
+
+    def test_written_index_loads_back(self, temp_repo, tmp_path):
+        """Test that batched output is one JSON document matching the index."""
+        index = scan_repository(temp_repo)
+        assert len(index.files) > 2
+        path = tmp_path / "repo_index.json"
+
+        write_index(index, path, batch_size=2)
+
+        loaded = RepoIndex.model_validate_json(path.read_bytes())
+        assert loaded.model_dump() == index.model_dump()
+        assert not (tmp_path / "repo_index.json.tmp").exists()
+
+    def test_empty_index(self, tmp_path):
+        """Test that an index without files writes an empty files array."""
+        index = RepoIndex(repo_path="/repo", repo_name="repo", total_files=0, total_size_bytes=0)
+        path = tmp_path / "repo_index.json"
+
+        write_index(index, path)
+
+        assert RepoIndex.model_validate_json(path.read_bytes()) == index
+
 
 class TestGetFileContent:
     """Tests for file content retrieval."""
@@ -189,6 +485,39 @@ class TestGetFilesByExtension:
         rust_files = get_files_by_extension(index, ["rs"])
         assert len(rust_files) == 0
 
+    def test_multiple_extensions_keep_index_order(self, temp_repo):
+        """Test that files of several extensions come back in index order."""
+        index = scan_repository(temp_repo)
+
+        matched = get_files_by_extension(index, [".TS", "md", "ts"])
+        assert matched == [f for f in index.files if f.extension in ("ts", "md")]
+
+    def test_sees_files_added_after_first_call(self, temp_repo):
+        """Test that the extension lookup is rebuilt when files change."""
+        index = scan_repository(temp_repo)
+        assert get_files_by_extension(index, ["rs"]) == []
+
+        index.files.append(
+            FileEntry(path="src/lib.rs", size_bytes=1, sha256="0" * 64, extension="rs")
+        )
+        assert [f.path for f in get_files_by_extension(index, ["rs"])] == ["src/lib.rs"]
+
+    def test_sees_files_sorted_or_replaced_in_place(self, temp_repo):
+        """Test that in-place edits of the same length also rebuild the lookup."""
+        index = scan_repository(temp_repo)
+        assert get_files_by_extension(index, ["ts"])
+
+        index.files.sort(key=lambda f: f.path, reverse=True)
+        assert get_files_by_extension(index, ["ts"]) == [
+            f for f in index.files if f.extension == "ts"
+        ]
+
+        index.files[0] = FileEntry(path="src/lib.rs", size_bytes=1, sha256="0" * 64, extension="rs")
+        assert [f.path for f in get_files_by_extension(index, ["rs"])] == ["src/lib.rs"]
+        assert get_files_by_extension(index, ["ts"]) == [
+            f for f in index.files if f.extension == "ts"
+        ]
+
 
 class TestGetFilesByPattern:
     """Tests for filtering files by pattern."""
@@ -225,3 +554,13 @@ class TestGetKeyFiles:
         key_files = get_key_files(index)
 
         assert key_files["cargo_toml"] is None
+
+    def test_only_root_files_match(self, temp_repo):
+        """Test that nested files with key names are ignored."""
+        (temp_repo / "docs" / "SECURITY.md").write_text("# Security")
+        (temp_repo / "makefile").write_text("all:\n")
+        index = scan_repository(temp_repo)
+        key_files = get_key_files(index)
+
+        assert key_files["security"] is None
+        assert key_files["makefile"].path == "makefile"
@@ -1,15 +1,30 @@
 """Tests for runner with mocked Anthropic client."""
 
+import hashlib
+import json
+import os
 import tempfile
+import threading
+import time
+from datetime import timedelta
 from pathlib import Path
 
 import pytest
 
+from api_vault import runner as runner_module
 from api_vault.anthropic_client import MockAnthropicClient
 from api_vault.planner import create_plan
 from api_vault.repo_scanner import scan_repository
-from api_vault.runner import Runner
-from api_vault.schemas import ArtifactFamily
+from api_vault.runner import (
+    CONTEXT_HASH_ALGORITHM,
+    Runner,
+    compute_context_fingerprint,
+    compute_context_hash,
+    fingerprint_overlap,
+    load_report,
+    order_jobs_for_cache,
+)
+from api_vault.schemas import ArtifactFamily, ArtifactMeta, ContextRef
 from api_vault.signal_extractor import extract_signals
 
 
@@ -182,6 +197,112 @@ class TestRunner:
         # Second run should skip all
         assert report2.jobs_skipped == report2.total_jobs
 
+    def test_timestamps_are_utc_and_ordered(self, sample_repo, output_dir):
+        """Test that run and artifact timestamps are aware UTC and within the run."""
+        index = scan_repository(sample_repo)
+        signals = extract_signals(index, sample_repo)
+        plan = create_plan(
+            index=index,
+            signals=signals,
+            budget_tokens=50000,
+            budget_seconds=3600,
+            families=[ArtifactFamily.DOCS],
+        )
+        runner = Runner(
+            output_dir=output_dir,
+            client=MockAnthropicClient(),
+            repo_path=sample_repo,
+            index=index,
+            signals=signals,
+        )
+
+        report = runner.run(plan)
+
+        assert report.started_at.utcoffset() == timedelta(0)
+        assert report.started_at <= report.completed_at
+        for result in report.job_results:
+            meta = ArtifactMeta.model_validate_json(Path(result.meta_path).read_text())
+            assert report.started_at <= meta.generated_at <= report.completed_at
+
+    def test_signals_dict_is_read_only(self, sample_repo, output_dir):
+        """Test that the shared signals mapping cannot be mutated by callees."""
+        index = scan_repository(sample_repo)
+        signals = extract_signals(index, sample_repo)
+        runner = Runner(
+            output_dir=output_dir,
+            client=MockAnthropicClient(),
+            repo_path=sample_repo,
+            index=index,
+            signals=signals,
+        )
+
+        assert runner.signals_dict["primary_language"] == signals.primary_language
+        with pytest.raises(TypeError):
+            runner.signals_dict["primary_language"] = "COBOL"
+
+    def test_reads_each_meta_file_once_per_run(self, sample_repo, output_dir, monkeypatch):
+        """Test that the skip check uses metadata preloaded at run start."""
+        index = scan_repository(sample_repo)
+        signals = extract_signals(index, sample_repo)
+        plan = create_plan(
+            index=index,
+            signals=signals,
+            budget_tokens=50000,
+            budget_seconds=3600,
+            families=[ArtifactFamily.DOCS],
+        )
+        runner = Runner(
+            output_dir=output_dir,
+            client=MockAnthropicClient(),
+            repo_path=sample_repo,
+            index=index,
+            signals=signals,
+        )
+        runner.run(plan)
+
+        read_meta = runner_module._read_meta
+        reads = []
+
+        def counting_read_meta(meta_path):
+            reads.append(meta_path)
+            return read_meta(meta_path)
+
+        monkeypatch.setattr(runner_module, "_read_meta", counting_read_meta)
+        report = runner.run(plan)
+
+        assert report.jobs_skipped == report.total_jobs
+        assert len(reads) == len(set(reads)) == len(plan.jobs)
+        assert runner._meta_cache is None
+
+    def test_corrupt_meta_is_regenerated(self, sample_repo, output_dir):
+        """Test that unreadable metadata does not count as an existing artifact."""
+        index = scan_repository(sample_repo)
+        signals = extract_signals(index, sample_repo)
+        plan = create_plan(
+            index=index,
+            signals=signals,
+            budget_tokens=50000,
+            budget_seconds=3600,
+            families=[ArtifactFamily.DOCS],
+        )
+        runner = Runner(
+            output_dir=output_dir,
+            client=MockAnthropicClient(),
+            repo_path=sample_repo,
+            index=index,
+            signals=signals,
+        )
+        runner.run(plan)
+        runner._get_meta_path(plan.jobs[0]).write_text("{not json")
+
+        report = runner.run(plan)
+
+        assert report.job_results[0].status == "completed"
+        assert report.jobs_skipped == report.total_jobs - 1
+        assert report.jobs_completed == 1
+        assert report.total_input_tokens == report.job_results[0].input_tokens > 0
+        assert report.artifacts_generated == [report.job_results[0].artifact_path]
+
     def test_tracks_token_usage(self, sample_repo, output_dir):
         """Test that token usage is tracked."""
         index = scan_repository(sample_repo)
@@ -236,6 +357,104 @@ class TestRunner:
         report_path = output_dir / "report.json"
         assert report_path.exists()
 
+    def test_failed_stream_keeps_previous_artifact(self, sample_repo, output_dir):
+        """Test that a failed generation leaves the existing artifact in place."""
+
+        class FailingClient(MockAnthropicClient):
+            def stream_with_cached_context(self, *args, **kwargs):
+                result = yield from super().stream_with_cached_context(*args, **kwargs)
+                result.error = "connection dropped"
+                return result
+
+        index = scan_repository(sample_repo)
+        signals = extract_signals(index, sample_repo)
+        plan = create_plan(
+            index=index,
+            signals=signals,
+            budget_tokens=50000,
+            budget_seconds=3600,
+            families=[ArtifactFamily.DOCS],
+        )
+        runner = Runner(
+            output_dir=output_dir,
+            client=FailingClient(),
+            repo_path=sample_repo,
+            index=index,
+            signals=signals,
+        )
+        artifact_path = runner._get_artifact_path(plan.jobs[0])
+        artifact_path.parent.mkdir(parents=True)
+        artifact_path.write_text("previous")
+
+        report = runner.run(plan)
+
+        assert report.jobs_failed == len(plan.jobs)
+        assert artifact_path.read_text() == "previous"
+        assert not list(output_dir.rglob("*.tmp"))
+
+    def test_artifact_bytes_match_streamed_text(self, sample_repo, output_dir):
+        """Test that streamed chunks are written as exact UTF-8 bytes."""
+        text = "# Título\n\nLínea uno\r\nline two ✓\n"
+
+        class FixedTextClient(MockAnthropicClient):
+            def stream_with_cached_context(self, *args, **kwargs):
+                result = self.generate_with_cached_context(*args, **kwargs)
+                result.text = text
+                yield from (text[i:i + 3] for i in range(0, len(text), 3))
+                return result
+
+        index = scan_repository(sample_repo)
+        signals = extract_signals(index, sample_repo)
+        plan = create_plan(
+            index=index,
+            signals=signals,
+            budget_tokens=50000,
+            budget_seconds=3600,
+            families=[ArtifactFamily.DOCS],
+        )
+        runner = Runner(
+            output_dir=output_dir,
+            client=FixedTextClient(),
+            repo_path=sample_repo,
+            index=index,
+            signals=signals,
+        )
+
+        report = runner.run(plan)
+
+        for result in report.job_results:
+            assert Path(result.artifact_path).read_bytes() == text.encode("utf-8")
+
+    def test_report_and_metadata_validate_on_load(self, sample_repo, output_dir):
+        """Test that unvalidated results still load as valid models."""
+        index = scan_repository(sample_repo)
+        signals = extract_signals(index, sample_repo)
+        plan = create_plan(
+            index=index,
+            signals=signals,
+            budget_tokens=50000,
+            budget_seconds=3600,
+            families=[ArtifactFamily.DOCS],
+        )
+        runner = Runner(
+            output_dir=output_dir,
+            client=MockAnthropicClient(),
+            repo_path=sample_repo,
+            index=index,
+            signals=signals,
+        )
+
+        report = runner.run(plan)
+
+        loaded = load_report(output_dir / "report.json")
+        assert loaded.job_results == report.job_results
+        for result in loaded.job_results:
+            meta = ArtifactMeta.model_validate_json(Path(result.meta_path).read_text())
+            assert meta.job_id == result.job_id
+            assert len(meta.artifact_id) == 32
+            int(meta.artifact_id, 16)
+        assert len(loaded.report_id) == 8
+
     def test_handles_all_families(self, sample_repo, output_dir):
         """Test running with all artifact families."""
         index = scan_repository(sample_repo)
@@ -300,3 +519,412 @@ class TestRunner:
         runner.run(plan, callback)
 
         assert len(progress_messages) > 0
+
+    def test_context_hash_matches_full_context(self, sample_repo, output_dir):
+        """Test that the incremental context hash equals hashing the full context."""
+        index = scan_repository(sample_repo)
+        signals = extract_signals(index, sample_repo)
+        runner = Runner(
+            output_dir=output_dir,
+            client=MockAnthropicClient(),
+            repo_path=sample_repo,
+            index=index,
+            signals=signals,
+        )
+
+        excerpts = "### README.md\n```\n# Test Project\n```"
+        full = f"{runner.base_context}\n\n## Artifact-Specific Files\n\n{excerpts}"
+        assert runner._context_hash(excerpts) == compute_context_hash(full)
+        assert runner._context_hash("") == compute_context_hash(runner.base_context)
+
+    def test_packages_excerpts_once_per_job(self, sample_repo, output_dir, monkeypatch):
+        """Test that the skip check and generation share packaged excerpts."""
+        index = scan_repository(sample_repo)
+        signals = extract_signals(index, sample_repo)
+        plan = create_plan(
+            index=index,
+            signals=signals,
+            budget_tokens=50000,
+            budget_seconds=3600,
+            families=[ArtifactFamily.DOCS],
+        )
+        runner = Runner(
+            output_dir=output_dir,
+            client=MockAnthropicClient(),
+            repo_path=sample_repo,
+            index=index,
+            signals=signals,
+        )
+        report = runner.run(plan)
+
+        # Invalidate every artifact so the second run checks, then regenerates
+        for artifact_path in report.artifacts_generated:
+            meta_path = Path(artifact_path).with_suffix(".meta.json")
+            meta = json.loads(meta_path.read_text())
+            meta["context_hash"] = "stale"
+            del meta["excerpt_fingerprint"]
+            del meta["context_inputs_hash"]
+            meta_path.write_text(json.dumps(meta))
+
+        calls = []
+        original = runner_module.package_context
+        monkeypatch.setattr(
+            runner_module,
+            "package_context",
+            lambda *args, **kwargs: calls.append(args) or original(*args, **kwargs),
+        )
+        report = runner.run(plan)
+
+        assert report.jobs_completed == report.total_jobs
+        distinct_refs = {
+            tuple((r.file_path, r.max_bytes, r.start_line, r.end_line) for r in job.context_refs)
+            for job in plan.jobs
+        }
+        assert len(calls) == len(distinct_refs)
+
+    def test_regenerates_unknown_hash_algorithm(self, sample_repo, output_dir):
+        """Test that metadata hashed with an unavailable algorithm is not trusted."""
+        index = scan_repository(sample_repo)
+        signals = extract_signals(index, sample_repo)
+        plan = create_plan(
+            index=index,
+            signals=signals,
+            budget_tokens=50000,
+            budget_seconds=3600,
+            families=[ArtifactFamily.DOCS],
+        )
+        runner = Runner(
+            output_dir=output_dir,
+            client=MockAnthropicClient(),
+            repo_path=sample_repo,
+            index=index,
+            signals=signals,
+        )
+        report = runner.run(plan)
+
+        for artifact_path in report.artifacts_generated:
+            meta_path = Path(artifact_path).with_suffix(".meta.json")
+            meta = json.loads(meta_path.read_text())
+            assert meta["context_hash_algorithm"] == CONTEXT_HASH_ALGORITHM
+            meta["context_hash_algorithm"] = "md4"
+            del meta["excerpt_fingerprint"]
+            meta_path.write_text(json.dumps(meta))
+
+        report = runner.run(plan)
+        assert report.jobs_skipped == 0
+
+    def test_reuses_nearly_identical_context(self, sample_repo, output_dir):
+        """Test that artifacts are reused when most context chunks still match."""
+        index = scan_repository(sample_repo)
+        signals = extract_signals(index, sample_repo)
+        plan = create_plan(
+            index=index,
+            signals=signals,
+            budget_tokens=50000,
+            budget_seconds=3600,
+            families=[ArtifactFamily.DOCS],
+        )
+        runner = Runner(
+            output_dir=output_dir,
+            client=MockAnthropicClient(),
+            repo_path=sample_repo,
+            index=index,
+            signals=signals,
+        )
+        report = runner.run(plan)
+
+        for artifact_path in report.artifacts_generated:
+            meta_path = Path(artifact_path).with_suffix(".meta.json")
+            meta = json.loads(meta_path.read_text())
+            meta["context_hash"] = "stale"
+            del meta["context_inputs_hash"]
+            meta_path.write_text(json.dumps(meta))
+
+        assert runner.run(plan).jobs_skipped == report.total_jobs
+
+        runner.CONTEXT_REUSE_THRESHOLD = 1.01
+        assert runner.run(plan).jobs_skipped == 0
+
+    def test_replaced_excerpts_regenerate_under_large_base_context(self, sample_repo, output_dir):
+        """Test that a large shared base context cannot mask replaced job excerpts."""
+        notes = sample_repo / "src" / "notes.py"
+        notes.write_text("".join(f"FIRST = {i}  # original note\n" for i in range(40)))
+        index = scan_repository(sample_repo)
+        signals = extract_signals(index, sample_repo)
+        plan = create_plan(index=index, signals=signals, budget_tokens=100000, budget_seconds=3600)
+        job = plan.jobs[0].model_copy(update={"context_refs": [ContextRef(file_path="src/notes.py")]})
+        plan = plan.model_copy(update={"jobs": [job]})
+        runner = Runner(
+            output_dir=output_dir,
+            client=MockAnthropicClient(),
+            repo_path=sample_repo,
+            index=index,
+            signals=signals,
+        )
+        base = "".join(f"base context line {i}: shared repository summary\n" for i in range(4000))
+        runner._base_context = (base, len(base) // 4)
+        assert len(compute_context_fingerprint(base)) >= 20
+        assert runner.run(plan).jobs_completed == 1
+
+        notes.write_text("".join(f"def replaced_{i}(): return {i * 7}\n" for i in range(40)))
+        stat = notes.stat()
+        os.utime(notes, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        report = runner.run(plan)
+        assert report.jobs_skipped == 0
+        assert report.jobs_completed == 1
+
+    def test_unchanged_sources_skip_without_packaging(self, sample_repo, output_dir, monkeypatch):
+        """Test that unchanged inputs and mtimes skip without rebuilding context."""
+        index = scan_repository(sample_repo)
+        signals = extract_signals(index, sample_repo)
+        plan = create_plan(
+            index=index,
+            signals=signals,
+            budget_tokens=50000,
+            budget_seconds=3600,
+            families=[ArtifactFamily.DOCS],
+        )
+        runner = Runner(
+            output_dir=output_dir,
+            client=MockAnthropicClient(),
+            repo_path=sample_repo,
+            index=index,
+            signals=signals,
+        )
+        runner.run(plan)
+
+        calls = []
+        original = runner_module.package_context
+        monkeypatch.setattr(
+            runner_module,
+            "package_context",
+            lambda *args, **kwargs: calls.append(args) or original(*args, **kwargs),
+        )
+        report = runner.run(plan)
+
+        assert report.jobs_skipped == report.total_jobs
+        assert calls == []
+
+        # A fresh runner resuming the same plan never builds the base context
+        builds = []
+        build_base_context = runner_module.build_base_context
+        monkeypatch.setattr(
+            runner_module,
+            "build_base_context",
+            lambda *args, **kwargs: builds.append(args) or build_base_context(*args, **kwargs),
+        )
+        resumed = Runner(
+            output_dir=output_dir,
+            client=MockAnthropicClient(),
+            repo_path=sample_repo,
+            index=index,
+            signals=signals,
+        )
+        assert resumed.run(plan).jobs_skipped == report.total_jobs
+        assert builds == []
+
+        # A touched source file forces the full context comparison
+        readme = sample_repo / "README.md"
+        stat = readme.stat()
+        os.utime(readme, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        report = runner.run(plan)
+
+        assert report.jobs_skipped == report.total_jobs
+        assert calls
+
+
+    def test_metadata_written_in_batches(self, sample_repo, output_dir):
+        """Test that queued metadata is written on flush without temp files."""
+        index = scan_repository(sample_repo)
+        signals = extract_signals(index, sample_repo)
+        runner = Runner(
+            output_dir=output_dir,
+            client=MockAnthropicClient(),
+            repo_path=sample_repo,
+            index=index,
+            signals=signals,
+        )
+        meta_path = output_dir / "artifacts" / "A.meta.json"
+
+        runner._queue_meta(meta_path, {"job_id": "a"})
+        assert not meta_path.exists()
+
+        runner._flush_meta()
+        assert json.loads(meta_path.read_text()) == {"job_id": "a"}
+        assert not list(output_dir.rglob("*.tmp"))
+
+    def test_metadata_json_fallback(self, sample_repo, output_dir, monkeypatch):
+        """Test that metadata round-trips and skips without orjson installed."""
+        monkeypatch.setattr("api_vault.runner.orjson", None)
+        index = scan_repository(sample_repo)
+        signals = extract_signals(index, sample_repo)
+        plan = create_plan(
+            index=index,
+            signals=signals,
+            budget_tokens=50000,
+            budget_seconds=3600,
+            families=[ArtifactFamily.DOCS],
+        )
+        runner = Runner(
+            output_dir=output_dir,
+            client=MockAnthropicClient(),
+            repo_path=sample_repo,
+            index=index,
+            signals=signals,
+        )
+
+        runner.run(plan)
+        assert runner.run(plan).jobs_skipped == len(plan.jobs)
+
+
+class TestConcurrentRun:
+    """Tests for running jobs concurrently."""
+
+    class SlowClient(MockAnthropicClient):
+        """Mock client that records how many generations overlap."""
+
+        def __init__(self):
+            super().__init__()
+            self.in_flight = 0
+            self.max_in_flight = 0
+            self.lock = threading.Lock()
+
+        def generate_with_cached_context(self, *args, **kwargs):
+            with self.lock:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            time.sleep(0.05)
+            try:
+                return super().generate_with_cached_context(*args, **kwargs)
+            finally:
+                with self.lock:
+                    self.in_flight -= 1
+
+    def make_plan(self, sample_repo):
+        """Scan the sample repo and plan every family."""
+        index = scan_repository(sample_repo)
+        signals = extract_signals(index, sample_repo)
+        plan = create_plan(index=index, signals=signals, budget_tokens=100000, budget_seconds=3600)
+        return index, signals, plan
+
+    def test_jobs_overlap_and_keep_plan_order(self, sample_repo, output_dir):
+        """Test that jobs generate concurrently and results follow the plan."""
+        index, signals, plan = self.make_plan(sample_repo)
+        client = self.SlowClient()
+        runner = Runner(
+            output_dir=output_dir,
+            client=client,
+            repo_path=sample_repo,
+            index=index,
+            signals=signals,
+            max_concurrency=4,
+        )
+
+        report = runner.run(plan)
+
+        assert len(plan.jobs) > 2
+        assert client.max_in_flight > 1
+        assert [r.job_id for r in report.job_results] == [j.id for j in plan.jobs]
+        assert client.request_count == report.jobs_completed == len(plan.jobs)
+
+    def test_single_worker_runs_serially(self, sample_repo, output_dir):
+        """Test that max_concurrency=1 generates one artifact at a time."""
+        index, signals, plan = self.make_plan(sample_repo)
+        client = self.SlowClient()
+        runner = Runner(
+            output_dir=output_dir,
+            client=client,
+            repo_path=sample_repo,
+            index=index,
+            signals=signals,
+            max_concurrency=1,
+        )
+
+        runner.run(plan)
+
+        assert client.max_in_flight == 1
+
+
+class TestOrderJobsForCache:
+    """Tests for grouping jobs by shared context references."""
+
+    def make_jobs(self, sample_repo, ref_paths):
+        """Plan the sample repo and give its jobs the given context references."""
+        index = scan_repository(sample_repo)
+        signals = extract_signals(index, sample_repo)
+        plan = create_plan(index=index, signals=signals, budget_tokens=100000, budget_seconds=3600)
+        jobs = [
+            job.model_copy(update={"context_refs": [ContextRef(file_path=p) for p in paths]})
+            for job, paths in zip(plan.jobs, ref_paths, strict=False)
+        ]
+        assert len(jobs) == len(ref_paths)
+        return plan.model_copy(update={"jobs": jobs}), index, signals
+
+    def test_groups_shared_refs_stably(self, sample_repo):
+        """Test that jobs with equal references become adjacent in plan order."""
+        plan, _, _ = self.make_jobs(
+            sample_repo, [["src/main.py"], ["README.md"], ["src/main.py"], ["README.md"]]
+        )
+
+        assert order_jobs_for_cache(plan.jobs) == [1, 3, 0, 2]
+
+    def test_keeps_plan_order_with_dependencies(self, sample_repo):
+        """Test that plans declaring dependencies are not reordered."""
+        plan, _, _ = self.make_jobs(sample_repo, [["src/main.py"], ["README.md"]])
+        plan.jobs[1].dependencies = (plan.jobs[0].id,)
+
+        assert order_jobs_for_cache(plan.jobs) == [0, 1]
+
+    def test_run_reports_in_plan_order(self, sample_repo, output_dir):
+        """Test that grouped execution still reports results in plan order."""
+        plan, index, signals = self.make_jobs(
+            sample_repo, [["src/main.py"], ["README.md"], ["src/main.py"]]
+        )
+        client = MockAnthropicClient()
+        runner = Runner(
+            output_dir=output_dir,
+            client=client,
+            repo_path=sample_repo,
+            index=index,
+            signals=signals,
+            max_concurrency=1,
+        )
+
+        report = runner.run(plan)
+
+        excerpts = [request["artifact_excerpts"] for request in client.requests]
+        assert excerpts[1] == excerpts[2] != excerpts[0]
+        assert [r.job_id for r in report.job_results] == [j.id for j in plan.jobs]
+
+
+class TestComputeContextHash:
+    """Tests for context hashing."""
+
+    def test_streamed_hash_matches_encoded_hash(self):
+        """Test that hashing in slices equals hashing the full encoding."""
+        context = "héllo wörld 😀\n" * 20000
+        expected = hashlib.sha256(context.encode()).hexdigest()[:16]
+
+        assert compute_context_hash(context, "sha256") == expected
+
+
+class TestContextFingerprint:
+    """Tests for content-defined context fingerprints."""
+
+    def test_local_edit_changes_few_chunks(self):
+        """Test that editing one line only changes the chunks around it."""
+        lines = [f"line {i}: some repository content\n" for i in range(5000)]
+        original = compute_context_fingerprint("".join(lines))
+        lines[2500] = "line 2500: edited\n"
+        edited = compute_context_fingerprint("".join(lines))
+
+        assert len(original) > 20
+        assert fingerprint_overlap(original, edited) >= 0.95
+        assert original != edited
+
+    def test_round_trip_is_stable(self):
+        """Test that the same context always yields the same fingerprint."""
+        text = "a\n" * 1000
+        assert compute_context_fingerprint(text) == compute_context_fingerprint(text)
+        assert fingerprint_overlap([], []) == 1.0
@@ -0,0 +1,51 @@
+"""Tests for prompt templates."""
+
+import pytest
+
+from api_vault.templates import PROMPT_TEMPLATES, render_prompt
+from api_vault.templates.prompts import PromptTemplate
+
+
+class TestRenderPrompt:
+    """Tests for prompt rendering."""
+
+    @pytest.mark.parametrize("template_id", sorted(PROMPT_TEMPLATES))
+    def test_matches_str_format(self, template_id):
+        """Test that rendering matches str.format for every template."""
+        context = "### File: app.py\n```\nprint({'a': 1})\n```"
+        template = PROMPT_TEMPLATES[template_id]
+
+        system_prompt, user_prompt = render_prompt(template_id, context)
+
+        assert system_prompt == template.system_prompt
+        assert user_prompt == template.user_prompt_template.format(context=context)
+
+    def test_unknown_template(self):
+        """Test that unknown template IDs render to None."""
+        assert render_prompt("no-such-template", "context") is None
+
+    def test_other_fields_fall_back_to_format(self, monkeypatch):
+        """Test that templates with other fields keep str.format's behavior."""
+        monkeypatch.setitem(
+            PROMPT_TEMPLATES,
+            "custom",
+            PromptTemplate(
+                id="custom",
+                name="Custom",
+                system_prompt="system",
+                user_prompt_template="{context!r} and {{braces}}",
+            ),
+        )
+
+        assert render_prompt("custom", "ctx") == ("system", "'ctx' and {braces}")
+
+    def test_replaced_template_is_reparsed(self, monkeypatch):
+        """Test that replacing a template's text is picked up."""
+        template = PromptTemplate(
+            id="custom", name="Custom", system_prompt="system", user_prompt_template="A {context}"
+        )
+        monkeypatch.setitem(PROMPT_TEMPLATES, "custom", template)
+        assert render_prompt("custom", "x") == ("system", "A x")
+
+        template.user_prompt_template = "B {context} {context}"
+        assert render_prompt("custom", "x") == ("system", "B x x")